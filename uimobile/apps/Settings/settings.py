@@ -4,7 +4,13 @@ import os
 import time
 import subprocess
 from modules.top_bar import TopBarManager
-from modules.keyboard import run_keyboard
+from modules.keyboard import KeyboardOverlay, TEXT_DONE_EVENT
+from modules import app_host
+from modules import orchestrator
+from modules.frame_scheduler import FrameScheduler
+from modules.gestures import GestureInput
+from modules.scroll_list import ScrollList
+from modules import fonts
 
 def reset_password_files():
     base_path = os.path.dirname(os.path.abspath(__file__))
@@ -26,10 +32,14 @@ def reset_password_files():
     return "\n".join(messages)
 
 def launch_main_script():
+    # Under the boot owner process, reboot re-runs boot in place
+    if orchestrator.is_managed():
+        orchestrator.request_reboot()
+        return "Rebooting..."
     try:
         base_path = os.path.dirname(os.path.abspath(__file__))
         script_path = os.path.abspath(os.path.join(base_path, "../../main.py"))
-        subprocess.Popen(["python3", script_path])
+        subprocess.Popen(["python3", script_path], cwd=app_host.ROOT_DIR, env=app_host.subprocess_env())
         return "Launching main.py..."
     except Exception as e:
         return f"Launch failed: {e}"
@@ -47,12 +57,12 @@ def main():
     screen = pygame.display.set_mode((screen_width, screen_height))
     pygame.display.set_caption("Settings App")
 
-    font_small = pygame.font.SysFont("Arial", 18)
-    font_medium = pygame.font.SysFont("Arial", 22)
+    font_small = fonts.get_font(18)
+    font_medium = fonts.get_font(22)
 
     TOPBAR_HEIGHT = 50
     topbar = TopBarManager(screen_width, screen_height, font_small, font_medium, app_key="settings")
-    clock = pygame.time.Clock()
+    scheduler = FrameScheduler()
 
     settings = [
         "Wi-Fi", "Display", "Sound", "Reset Password", "Keyboard Test",
@@ -70,10 +80,19 @@ def main():
     hover_color = (90, 160, 220)
     text_color = (255, 255, 255)
 
-    scroll_offset = 0
-    is_dragging = False
-    drag_start_y = 0
-    scroll_start_offset = 0
+    def render_setting(index, width, height):
+        row = pygame.Surface((width, height), pygame.SRCALPHA)
+        rect = pygame.Rect(center_x, 0, button_width, height)
+        draw_button(row, rect, settings[index], font_medium, False, button_color, hover_color, text_color)
+        return row
+
+    def button_rect(index):
+        return pygame.Rect(center_x, setting_list.row_rect(index).y, button_width, button_height)
+
+    setting_list = ScrollList((0, TOPBAR_HEIGHT, screen_width, screen_height - TOPBAR_HEIGHT), button_height,
+                              render_setting, count=len(settings), spacing=spacing, padding=(start_y - TOPBAR_HEIGHT, 20))
+    gesture_input = GestureInput()
+    keyboard = KeyboardOverlay()
 
     show_dialog = False
     dialog_type = None
@@ -82,36 +101,31 @@ def main():
     feedback_timer = 0
 
     running = True
-    while running:
+    is_animating = lambda: gesture_input.is_active() or topbar.is_animating() or setting_list.is_animating()
+    for events in scheduler.frames(lambda: running, is_animating):
         mouse_pos = pygame.mouse.get_pos()
-        mouse_clicked = False
+        clicked_pos = None
 
-        for event in pygame.event.get():
+        unhandled = []  # left for the gesture recogniser
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
-            topbar.handle_event(event)
-
-            # Scroll with mouse wheel
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
-                    mouse_clicked = True
-                    is_dragging = True
-                    drag_start_y = event.pos[1]
-                    scroll_start_offset = scroll_offset
-                elif event.button == 4:
-                    scroll_offset = min(scroll_offset + 20, 0)
-                elif event.button == 5:
-                    scroll_offset -= 20
-
-            if event.type == pygame.MOUSEBUTTONUP:
-                if event.button == 1:
-                    is_dragging = False
-
-            if event.type == pygame.MOUSEMOTION and is_dragging:
-                dy = event.pos[1] - drag_start_y
-                scroll_offset = scroll_start_offset + dy
+
+            if keyboard.handle_event(event):
+                continue
+            if event.type == TEXT_DONE_EVENT and event.submitted:
+                feedback_message = f"Typed: {event.text}"
+                feedback_timer = time.time()
+            unhandled.append(event)
+
+        for g in gesture_input.process(unhandled):
+            if topbar.handle_gesture(g) or (not show_dialog and setting_list.handle_gesture(g)):
+                continue
+            if g.kind == "tap":
+                clicked_pos = g.pos
 
         topbar.update()
+        setting_list.update()
         screen.fill((70, 70, 70))
 
         if show_dialog:
@@ -137,60 +151,52 @@ def main():
                 hovered = rect.collidepoint(mouse_pos)
                 draw_button(screen, rect, label, font_small, hovered, button_color, hover_color, text_color)
 
-            if mouse_clicked:
-                if dialog_buttons["Yes"].collidepoint(mouse_pos):
+            if clicked_pos:
+                if dialog_buttons["Yes"].collidepoint(clicked_pos):
                     if dialog_type == "Reset Password":
                         feedback_message = reset_password_files()
                     elif dialog_type == "Reboot":
                         feedback_message = launch_main_script()
+                        if app_host.is_hosted():
+                            app_host.exit_app(shutdown=True)
                         pygame.quit()
                         sys.exit()
                     feedback_timer = time.time()
                     show_dialog = False
-                elif dialog_buttons["Cancel"].collidepoint(mouse_pos):
+                elif dialog_buttons["Cancel"].collidepoint(clicked_pos):
                     show_dialog = False
 
         else:
-            buttons = []
-            for i, label in enumerate(settings):
-                y = start_y + i * (button_height + spacing) + scroll_offset
-                rect = pygame.Rect(center_x, y, button_width, button_height)
-                buttons.append({"label": label, "rect": rect})
-
-            # Enforce scroll limits
-            total_height = start_y + len(settings) * (button_height + spacing)
-            min_scroll = screen_height - total_height - 20
-            scroll_offset = max(min_scroll, min(0, scroll_offset))
-
-            for button in buttons:
-                rect = button["rect"]
-                label = button["label"]
-                if rect.bottom < TOPBAR_HEIGHT or rect.top > screen_height:
-                    continue  # Skip drawing off-screen buttons
-
-                hovered = rect.collidepoint(mouse_pos)
-                draw_button(screen, rect, label, font_medium, hovered, button_color, hover_color, text_color)
-
-                if hovered and mouse_clicked:
-                    if label == "Keyboard Test":
-                        run_keyboard()
-                    elif label == "Reset Password":
-                        dialog_type = "Reset Password"
-                        show_dialog = True
-                    elif label == "Reboot":
-                        dialog_type = "Reboot"
-                        show_dialog = True
-                    else:
-                        print(f"{label} settings clicked (not yet implemented)")
+            setting_list.draw(screen)
+            hovered = setting_list.index_at(mouse_pos)
+            if hovered is not None and button_rect(hovered).collidepoint(mouse_pos):
+                screen.set_clip(setting_list.rect)
+                draw_button(screen, button_rect(hovered), settings[hovered], font_medium, True, button_color, hover_color, text_color)
+                screen.set_clip(None)
+
+            clicked = setting_list.index_at(clicked_pos) if clicked_pos else None
+            if clicked is not None and button_rect(clicked).collidepoint(clicked_pos):
+                label = settings[clicked]
+                if label == "Keyboard Test":
+                    keyboard.open()
+                elif label == "Reset Password":
+                    dialog_type = "Reset Password"
+                    show_dialog = True
+                elif label == "Reboot":
+                    dialog_type = "Reboot"
+                    show_dialog = True
+                else:
+                    print(f"{label} settings clicked (not yet implemented)")
 
         if feedback_message and time.time() - feedback_timer < 3:
             feedback_surf = font_small.render(feedback_message, True, (255, 255, 0))
             feedback_rect = feedback_surf.get_rect(center=(screen_width // 2, 40))
             screen.blit(feedback_surf, feedback_rect)
 
+        keyboard.draw(screen)
         topbar.draw(screen)
         pygame.display.flip()
-        clock.tick(60)
+        gesture_input.presented()
 
     pygame.quit()
     sys.exit()
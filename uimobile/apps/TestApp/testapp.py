@@ -1,7 +1,10 @@
 import pygame
 import sys
 from modules.top_bar import TopBarManager
-from modules.keyboard import run_keyboard
+from modules.keyboard import KeyboardOverlay, TEXT_EDIT_EVENT
+from modules.frame_scheduler import FrameScheduler
+from modules.gestures import GestureInput
+from modules import fonts
 
 def main():
     pygame.init()
@@ -9,13 +12,13 @@ def main():
     screen = pygame.display.set_mode((screen_width, screen_height))
     pygame.display.set_caption("Test App")
 
-    font_small = pygame.font.SysFont("Arial", 18)
-    font_medium = pygame.font.SysFont("Arial", 22)
-    font_instructions = pygame.font.SysFont("Arial", 16)
+    font_small = fonts.get_font(18)
+    font_medium = fonts.get_font(22)
+    font_instructions = fonts.get_font(16)
 
     topbar = TopBarManager(screen_width, screen_height, font_small, font_medium, app_key="testapp")
 
-    clock = pygame.time.Clock()
+    scheduler = FrameScheduler()
 
     # Button properties
     button_width = 160
@@ -26,27 +29,37 @@ def main():
     button_color = (70, 130, 180)  # Steel Blue
     button_hover_color = (100, 160, 210)
     button_text = "Open Keyboard"
-    button_font = pygame.font.SysFont("Arial", 20)
+    button_font = fonts.get_font(20)
 
     # Text output from keyboard
     keyboard_output = ""
+    keyboard = KeyboardOverlay()
+    gesture_input = GestureInput()
 
     # Instruction text about top bar usage
     instruction_text = "Use the top bar to close teh app. Pull it down from top of screen"
 
     running = True
-    while running:
+    for events in scheduler.frames(lambda: running, topbar.is_animating):
         mouse_pos = pygame.mouse.get_pos()
-        mouse_clicked = False
+        clicked_pos = None
 
-        for event in pygame.event.get():
+        unhandled = []  # left for the gesture recogniser
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
 
-            topbar.handle_event(event)
+            if keyboard.handle_event(event):
+                continue
+            if event.type == TEXT_EDIT_EVENT:
+                keyboard_output = event.text
+            unhandled.append(event)
 
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                mouse_clicked = True
+        for g in gesture_input.process(unhandled):
+            if topbar.handle_gesture(g):
+                continue
+            if g.kind == "tap":
+                clicked_pos = g.pos
 
         topbar.update()
 
@@ -60,9 +73,9 @@ def main():
         # Draw button (hover effect)
         if button_rect.collidepoint(mouse_pos):
             pygame.draw.rect(screen, button_hover_color, button_rect, border_radius=6)
-            if mouse_clicked:
-                # Launch keyboard on button click
-                keyboard_output = run_keyboard()
+            if clicked_pos and button_rect.collidepoint(clicked_pos):
+                # Open the keyboard over the app on button click
+                keyboard.open(keyboard_output)
         else:
             pygame.draw.rect(screen, button_color, button_rect, border_radius=6)
 
@@ -78,11 +91,13 @@ def main():
         output_surf = font_small.render(keyboard_output, True, (230, 230, 230))
         screen.blit(output_surf, (button_x, button_y + button_height + 30))
 
+        keyboard.draw(screen)
+
         # Draw top bar on top
         topbar.draw(screen)
 
         pygame.display.flip()
-        clock.tick(60)
+        gesture_input.presented()
 
     pygame.quit()
     sys.exit()
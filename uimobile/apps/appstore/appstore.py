@@ -6,6 +6,10 @@ import io
 import os
 import json
 from modules.top_bar import TopBarManager
+from modules.frame_scheduler import FrameScheduler
+from modules.gestures import GestureInput
+from modules.scroll_list import ScrollList
+from modules import fonts
 
 # Constants
 GITHUB_BASE = "https://raw.githubusercontent.com/OpenMobile-Official/OpenMobile_OS/appstore"
@@ -15,9 +19,8 @@ SCREEN_WIDTH, SCREEN_HEIGHT = 480, 320
 
 # Globals
 status_message = ""
-scroll_offset = 0
-scroll_speed = 0
-touch_start_y = None
+gesture_input = GestureInput()
+ROW_HEIGHT = 100
 
 def fetch_app_list():
     url = f"{GITHUB_BASE}/appstore.json"
@@ -109,69 +112,67 @@ def is_installed(app_name):
     return os.path.exists(os.path.join(LOCAL_APPS_DIR, app_name))
 
 def main():
-    global scroll_offset, scroll_speed, touch_start_y, status_message
+    global status_message
     pygame.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("App Store")
 
-    font_small = pygame.font.SysFont("Arial", 16)
-    font_medium = pygame.font.SysFont("Arial", 20)
+    font_small = fonts.get_font(16)
+    font_medium = fonts.get_font(20)
     topbar = TopBarManager(SCREEN_WIDTH, SCREEN_HEIGHT, font_small, font_medium, app_key="appstore")
-    clock = pygame.time.Clock()
+    scheduler = FrameScheduler()
 
     apps = fetch_app_list()
     icons = [load_icon(app) for app in apps]
 
-    running = True
-    while running:
-        mouse_pos = pygame.mouse.get_pos()
-        mouse_clicked = False
+    def render_app(index, width, height):
+        """One catalog entry with its install state, rendered when it scrolls into view"""
+        app = apps[index]
+        app_name = app["App:"].strip()
+        row = pygame.Surface((width, height), pygame.SRCALPHA)
+        if icons[index]:
+            row.blit(icons[index], (20, 0))
+        row.blit(font_medium.render(app_name, True, (255, 255, 255)), (100, 0))
+        row.blit(font_small.render(app["Desc:"], True, (200, 200, 200)), (100, 25))
+
+        button_rect = pygame.Rect(100, 55, 100, 30)
+        if is_installed(app_name):
+            color, label = (180, 70, 70), "Uninstall"
+        else:
+            color, label = (70, 130, 180), "Install"
+        pygame.draw.rect(row, color, button_rect, border_radius=6)
+        label_surf = font_small.render(label, True, (255, 255, 255))
+        row.blit(label_surf, label_surf.get_rect(center=button_rect.center))
+        return row
+
+    app_list = ScrollList((0, 0, SCREEN_WIDTH, SCREEN_HEIGHT), ROW_HEIGHT, render_app, count=len(apps), padding=(70, 40))
 
-        for event in pygame.event.get():
+    running = True
+    is_animating = lambda: gesture_input.is_active() or topbar.is_animating() or app_list.is_animating()
+    for events in scheduler.frames(lambda: running, is_animating):
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
-            topbar.handle_event(event)
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_clicked = True
-                touch_start_y = event.pos[1]
-            elif event.type == pygame.MOUSEBUTTONUP:
-                touch_start_y = None
-                scroll_speed = 0
-            elif event.type == pygame.MOUSEMOTION and touch_start_y is not None:
-                dy = event.pos[1] - touch_start_y
-                scroll_offset += dy
-                touch_start_y = event.pos[1]
-
-        topbar.update()
-        screen.fill((50, 50, 50))
-
-        y_offset = 70 + scroll_offset
-        for i, app in enumerate(apps):
-            app_name = app["App:"].strip()
-            icon = icons[i]
-            y = y_offset + i * 100
-            if y > -100 and y < SCREEN_HEIGHT:
-                if icon:
-                    screen.blit(icon, (20, y))
-                name = font_medium.render(app_name, True, (255, 255, 255))
-                desc = font_small.render(app["Desc:"], True, (200, 200, 200))
-                screen.blit(name, (100, y))
-                screen.blit(desc, (100, y + 25))
 
+        for g in gesture_input.process(events):
+            if topbar.handle_gesture(g) or app_list.handle_gesture(g):
+                continue
+            index = app_list.index_at(g.pos) if g.kind == "tap" else None
+            if index is None:
+                continue
+            row = app_list.row_rect(index)
+            if pygame.Rect(row.x + 100, row.y + 55, 100, 30).collidepoint(g.pos):
+                app_name = apps[index]["App:"].strip()
                 if is_installed(app_name):
-                    uninstall_rect = pygame.Rect(100, y + 55, 100, 30)
-                    pygame.draw.rect(screen, (180, 70, 70), uninstall_rect, border_radius=6)
-                    uninstall_label = font_small.render("Uninstall", True, (255, 255, 255))
-                    screen.blit(uninstall_label, uninstall_label.get_rect(center=uninstall_rect.center))
-                    if uninstall_rect.collidepoint(mouse_pos) and mouse_clicked:
-                        uninstall_app(app_name)
+                    uninstall_app(app_name)
                 else:
-                    install_rect = pygame.Rect(100, y + 55, 100, 30)
-                    pygame.draw.rect(screen, (70, 130, 180), install_rect, border_radius=6)
-                    install_label = font_small.render("Install", True, (255, 255, 255))
-                    screen.blit(install_label, install_label.get_rect(center=install_rect.center))
-                    if install_rect.collidepoint(mouse_pos) and mouse_clicked:
-                        download_and_install(app)
+                    download_and_install(apps[index])
+                app_list.refresh(index)  # the button flips
+
+        topbar.update()
+        app_list.update()
+        screen.fill((50, 50, 50))
+        app_list.draw(screen)
 
         if status_message:
             status_surf = font_small.render(status_message, True, (255, 255, 0))
@@ -179,7 +180,7 @@ def main():
 
         topbar.draw(screen)
         pygame.display.flip()
-        clock.tick(60)
+        gesture_input.presented()
 
     pygame.quit()
     sys.exit()
@@ -1,10 +1,13 @@
 import pygame
 import sys
 import os
-import json
 import subprocess
 from modules.top_bar import TopBarManager
 from modules.file_previewer import FilePreviewer
+from modules.frame_scheduler import FrameScheduler
+from modules.gestures import GestureInput
+from modules import config_service
+from modules import fonts
 
 # Styling constants
 BG_COLOR = (30, 30, 30)
@@ -18,7 +21,7 @@ class FileIcon:
         self.name = name
         self.path = path
         self.rect = pygame.Rect(0, 0, cfg["icon_width"], cfg["icon_height"])
-        self.font = pygame.font.SysFont(None, 16)
+        self.font = fonts.get_font(16, family=None)
         self.is_dir = os.path.isdir(path)
 
     def draw(self, surface):
@@ -27,10 +30,12 @@ class FileIcon:
         label = self.font.render(self.name[:12], True, (255, 255, 255))
         surface.blit(label, label.get_rect(center=self.rect.center))
 
-    def handle_event(self, event, callback=None):
-        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            if self.rect.collidepoint(event.pos) and callback:
+    def handle_gesture(self, g, callback=None):
+        if g.kind == "tap" and self.rect.collidepoint(g.pos):
+            if callback:
                 callback(self)
+            return True
+        return False
 
 # FileGrid class
 class FileGrid:
@@ -39,7 +44,7 @@ class FileGrid:
         self.cols = cfg["columns"]
         self.icons_per_page = cfg["icons_per_page"]
         self.padding = cfg["icon_padding"]
-        self.font = pygame.font.SysFont(None, 20)
+        self.font = fonts.get_font(20, family=None)
         self.on_file_click = on_file_click
 
         self.base_path = os.path.abspath(base_path)
@@ -74,11 +79,20 @@ class FileGrid:
             )
             icon.draw(surface)
 
-    def handle_event(self, event):
+    def handle_gesture(self, g):
+        """Taps open icons, horizontal swipes turn the page"""
         if not self.pages:
-            return
+            return False
+        if g.kind == "swipe":
+            if g.direction == "left":
+                self.next_page()
+            elif g.direction == "right":
+                self.prev_page()
+            return True
         for icon in self.pages[self.page]:
-            icon.handle_event(event, callback=self.on_file_click)
+            if icon.handle_gesture(g, callback=self.on_file_click):
+                return True
+        return False
 
     def next_page(self):
         self.page = min(self.page + 1, len(self.pages) - 1)
@@ -148,11 +162,10 @@ class BreadcrumbBar:
                 self.rects.append((rect, i))
                 x += rect.width + 15
 
-    def handle_event(self, event, file_grid):
-        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            pos = event.pos
+    def handle_gesture(self, g, file_grid):
+        if g.kind == "tap":
             for rect, idx in self.rects:
-                if rect.collidepoint(pos):
+                if rect.collidepoint(g.pos):
                     if idx == -1:  # Home button
                         file_grid.current_path = file_grid.base_path
                         file_grid.load_files()
@@ -164,25 +177,10 @@ class BreadcrumbBar:
 
 # Load config helper
 def load_config():
-    base = os.path.dirname(os.path.abspath(__file__))
-    p = os.path.join(base, "..", "..", "config", "config.json")
-    try:
-        with open(p, "r") as f:
-            cfg = json.load(f)
-    except FileNotFoundError:
-        cfg = {}
-    return {
-        "resolution": cfg.get("resolution", [800, 600]),
-        "background": cfg.get("background", ""),
-        "time_format": cfg.get("time_format", "%H:%M"),
-        "battery_display": cfg.get("battery_display", "🔋 80%"),
-        "icon_width": cfg.get("icon_width", 80),
-        "icon_height": cfg.get("icon_height", 80),
-        "icon_padding": cfg.get("icon_padding", 20),
-        "icons_per_page": cfg.get("icons_per_page", 12),
-        "columns": cfg.get("columns", 4),
-        "breadcrumb_height": cfg.get("breadcrumb_height", 30),
-    }
+    """Shared config snapshot plus the file manager's own breadcrumb_height"""
+    cfg = dict(config_service.load_config())
+    cfg.setdefault("breadcrumb_height", 30)
+    return cfg
 
 def main():
     pygame.init()
@@ -191,9 +189,9 @@ def main():
     screen = pygame.display.set_mode((w, h))
     pygame.display.set_caption("Modern File Manager")
 
-    font_small = pygame.font.SysFont(None, 18)
-    font_medium = pygame.font.SysFont(None, 22)
-    font_breadcrumb = pygame.font.SysFont(None, 20)
+    font_small = fonts.get_font(18, family=None)
+    font_medium = fonts.get_font(22, family=None)
+    font_breadcrumb = fonts.get_font(20, family=None)
 
     topbar = TopBarManager(w, h, font_small, font_medium, app_key="filemanager")
     file_previewer = FilePreviewer(screen, font_medium, w, h)
@@ -223,29 +221,30 @@ def main():
     breadcrumb = BreadcrumbBar(font_breadcrumb, cfg["breadcrumb_height"], w, base_dir)
     breadcrumb.update_path(fg.current_path)
 
-    clock = pygame.time.Clock()
+    scheduler = FrameScheduler()
     running = True
 
-    while running:
-        for event in pygame.event.get():
+    gesture_input = GestureInput()
+
+    for events in scheduler.frames(lambda: running, lambda: gesture_input.is_active() or topbar.is_animating()):
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
 
-            if file_previewer.active:
-                file_previewer.handle_event(event)
-            else:
-                topbar.handle_event(event)
-                breadcrumb.handle_event(event, fg)
+            if not file_previewer.active and event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_RIGHT:
+                    fg.next_page()
+                elif event.key == pygame.K_LEFT:
+                    fg.prev_page()
+                elif event.key == pygame.K_BACKSPACE:
+                    fg.navigate_up(breadcrumb)
 
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_RIGHT:
-                        fg.next_page()
-                    elif event.key == pygame.K_LEFT:
-                        fg.prev_page()
-                    elif event.key == pygame.K_BACKSPACE:
-                        fg.navigate_up(breadcrumb)
-
-                fg.handle_event(event)
+        for g in gesture_input.process(events):
+            if file_previewer.active:
+                file_previewer.handle_gesture(g)
+            elif not topbar.handle_gesture(g):
+                breadcrumb.handle_gesture(g, fg)
+                fg.handle_gesture(g)
 
         topbar.update()
 
@@ -261,7 +260,7 @@ def main():
             topbar.draw(screen)
 
         pygame.display.flip()
-        clock.tick(60)
+        gesture_input.presented()
 
     pygame.quit()
     sys.exit()
@@ -19,8 +19,6 @@ class FilePreviewer:
         self.scroll_offset = 0
         self.max_scroll = 0
         self.dragging = False
-        self.drag_start_y = 0
-        self.scroll_start_offset = 0
         self.is_image = False
         self.is_audio = False
         self.is_pdf = False
@@ -105,39 +103,32 @@ class FilePreviewer:
             pygame.mixer.music.stop()
             self.audio_playing = False
 
-    def handle_event(self, event):
+    def handle_gesture(self, g):
+        """Taps work the buttons, dragging inside the panel or the wheel scrolls"""
         if not self.active:
-            return
-
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            if event.button == 1:  # Left click
-                if self.close_rect.collidepoint(event.pos):
-                    self.close()
-                elif self.is_audio:
-                    if self.play_rect.collidepoint(event.pos) and self.audio_file:
-                        pygame.mixer.music.load(self.audio_file)
-                        pygame.mixer.music.play()
-                        self.audio_playing = True
-                    elif self.stop_rect.collidepoint(event.pos):
-                        pygame.mixer.music.stop()
-                        self.audio_playing = False
-                elif self.rect.collidepoint(event.pos):
-                    self.dragging = True
-                    self.drag_start_y = event.pos[1]
-                    self.scroll_start_offset = self.scroll_offset
-
-            elif event.button == 4:  # Scroll up
-                self.scroll_offset = max(0, self.scroll_offset - 30)
-            elif event.button == 5:  # Scroll down
-                self.scroll_offset = min(self.max_scroll, self.scroll_offset + 30)
-
-        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            return False
+
+        if g.kind == "down":
+            self.dragging = self.rect.collidepoint(g.pos)
+
+        elif g.kind == "tap":
+            if self.close_rect.collidepoint(g.pos):
+                self.close()
+            elif self.is_audio:
+                if self.play_rect.collidepoint(g.pos) and self.audio_file:
+                    pygame.mixer.music.load(self.audio_file)
+                    pygame.mixer.music.play()
+                    self.audio_playing = True
+                elif self.stop_rect.collidepoint(g.pos):
+                    pygame.mixer.music.stop()
+                    self.audio_playing = False
+
+        elif (g.kind == "drag" and self.dragging) or g.kind == "scroll":
+            self.scroll_offset = max(0, min(self.scroll_offset - g.rel[1], self.max_scroll))
+
+        elif g.kind == "up":
             self.dragging = False
-
-        elif event.type == pygame.MOUSEMOTION and self.dragging:
-            dy = event.pos[1] - self.drag_start_y
-            self.scroll_offset = self.scroll_start_offset - dy
-            self.scroll_offset = max(0, min(self.scroll_offset, self.max_scroll))
+        return True
 
     def draw(self):
         if not self.active:
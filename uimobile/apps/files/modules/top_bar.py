@@ -1,9 +1,13 @@
 import pygame
 import subprocess
-import json
 import time
 import os
 import sys
+from modules import config_service
+from modules import orchestrator
+from modules.tween import get_animator, ease_out_cubic
+
+SLIDE_MS = 100  # time to slide fully in or out
 
 class TopBarManager:
     def __init__(self, screen_width, screen_height, font_small, font_medium, app_key, config_path=None):
@@ -11,7 +15,6 @@ class TopBarManager:
         self.target_height = 30
         self.current_height = 0
         self.dragging = False
-        self.drag_start_y = None
         self.SCREEN_WIDTH = screen_width
         self.SCREEN_HEIGHT = screen_height
         self.font_small = font_small
@@ -19,105 +22,81 @@ class TopBarManager:
         self.app_key = app_key
         self.open_time = None
 
-        # Determine config path if not provided
-        if config_path is None:
-            config_path = os.path.join(
-                os.path.dirname(__file__),  # current file (modules/)
-                "..",  # one up
-                "..",  # two up
-                "..",  # three up
-                "config",
-                "config.json"
-            )
-            config_path = os.path.normpath(config_path)
-
-        self.config_path = config_path  # store for later use
-
-        # Load config.json
-        try:
-            with open(config_path, "r") as f:
-                self.config = json.load(f)
-        except FileNotFoundError:
-            print(f"Warning: Config file not found at {config_path}. Using empty config.")
-            self.config = {}
-
-        # Load app name from apps.json one folder up from modules/
-        try:
-            apps_path = os.path.join(os.path.dirname(__file__), "..", "apps.json")
-            apps_path = os.path.normpath(apps_path)
-            with open(apps_path, "r") as f:
-                app_list = json.load(f)
-                app = next((a for a in app_list if a.get("name") == app_key or a.get("command") == app_key), None)
-                if app:
-                    self.app_name = app.get("name", app_key)
-                else:
-                    self.app_name = app_key
-        except FileNotFoundError:
-            print("Warning: apps.json not found.")
-            self.app_name = app_key
+        # Shared config snapshot (fallback UI) and this app's display name
+        self.config_path = config_path or config_service.CONFIG_PATH
+        self.config = config_service.load_config()
+        app = config_service.find_app(app_key)
+        self.app_name = app["name"] if app else app_key
 
     def toggle(self):
         self.visible = not self.visible
         self.open_time = time.time() if self.visible else None
+        self.slide()
 
-    def update(self):
-        speed = 10
-
-        if self.visible and self.current_height < self.target_height:
-            self.current_height = min(self.current_height + speed, self.target_height)
-            if self.current_height == self.target_height and self.open_time is None:
-                self.open_time = time.time()
-
-        elif not self.visible and self.current_height > 0:
-            self.current_height = max(self.current_height - speed, 0)
-            if self.current_height == 0:
-                self.open_time = None
+    def slide(self):
+        """Slides towards the height for visible"""
+        target = self.target_height if self.visible else 0
+        get_animator().animate(self, "current_height", target, SLIDE_MS, ease=ease_out_cubic)
 
+    def update(self):
         # Auto-close after 5 seconds
         if self.visible and self.open_time is not None:
             if time.time() - self.open_time > 5:
                 self.visible = False
+                self.open_time = None
+                self.slide()
 
-    def handle_event(self, event):
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            if event.pos[1] < 20:
-                self.dragging = True
-                self.drag_start_y = event.pos[1]
-
-            if self.current_height == self.target_height:
-                close_rect = pygame.Rect(self.SCREEN_WIDTH - 40, 5, 30, 20)
-                if close_rect.collidepoint(event.pos):
-                    print(f"[TopBar] Closing current app: {self.app_name}")
-
-                    # Launch fallback UI if specified
-                    fallback = self.config.get("UI")
-                    if fallback:
-                        config_dir = os.path.dirname(self.config_path)
-
-                        # fallback_path is one directory above config_dir + fallback filename
-                        fallback_path = os.path.normpath(os.path.join(config_dir, "..", fallback))
-                        print(f"Launching fallback UI at: {fallback_path}")
-
-                        resolution = self.config.get("resolution", [480, 320])
-
-                        try:
-                            subprocess.Popen(
-                                [sys.executable, fallback_path, str(resolution[0]), str(resolution[1])]
-                            )
-                        except Exception as e:
-                            print(f"Failed to launch fallback UI: {e}")
+    def is_animating(self):
+        """True while the bar is sliding in or out"""
+        target = self.target_height if self.visible else 0
+        return self.current_height != target
 
-                    pygame.quit()
-                    sys.exit()
+    def handle_gesture(self, g):
+        """Pulling down from the top edge shows the bar, tapping X closes the app.
+        Returns True if the gesture was the bar's."""
+        if g.kind == "down":
+            self.dragging = g.edge == "top"
 
-        elif event.type == pygame.MOUSEMOTION and self.dragging:
-            if event.pos[1] - self.drag_start_y > 20:
+        elif g.kind == "pull" and self.dragging:
+            if g.dy > 20:
                 self.toggle()
                 self.dragging = False
+            return True
 
-        elif event.type == pygame.MOUSEBUTTONUP:
+        elif g.kind == "up":
             self.dragging = False
 
+        elif g.kind == "tap" and self.current_height == self.target_height:
+            close_rect = pygame.Rect(self.SCREEN_WIDTH - 40, 5, 30, 20)
+            if close_rect.collidepoint(g.pos):
+                print(f"[TopBar] Closing current app: {self.app_name}")
+
+                # Launch the fallback UI, unless the boot owner process brings it back itself
+                fallback = self.config.get("UI")
+                if orchestrator.is_owned():
+                    fallback = None
+                if fallback:
+                    config_dir = os.path.dirname(self.config_path)
+
+                    # fallback_path is one directory above config_dir + fallback filename
+                    fallback_path = os.path.normpath(os.path.join(config_dir, "..", fallback))
+                    print(f"Launching fallback UI at: {fallback_path}")
+
+                    resolution = self.config.get("resolution", [480, 320])
+
+                    try:
+                        from modules import app_host
+                        subprocess.Popen(
+                            [sys.executable, fallback_path, str(resolution[0]), str(resolution[1])],
+                            env=app_host.subprocess_env()
+                        )
+                    except Exception as e:
+                        print(f"Failed to launch fallback UI: {e}")
+
+                pygame.quit()
+                sys.exit()
+        return False
+
     def draw(self, surface):
         if self.current_height <= 0:
             return
@@ -5,6 +5,9 @@ import os
 import json
 import subprocess
 
+from modules import fonts
+from modules import app_host
+
 pygame.init()
 
 # --- Load configuration --- 
@@ -27,8 +30,8 @@ ICONS_PER_PAGE = config["icons_per_page"]
 COLUMNS = config["columns"]
 
 # Fonts (scale with resolution)
-font_small = pygame.font.SysFont("Arial", max(12, SCREEN_HEIGHT // 25))
-font_medium = pygame.font.SysFont("Arial", max(16, SCREEN_HEIGHT // 20))
+font_small = fonts.get_font(max(12, SCREEN_HEIGHT // 25))
+font_medium = fonts.get_font(max(16, SCREEN_HEIGHT // 20))
 
 # Background
 background_img = pygame.image.load(BACKGROUND_PATH)
@@ -137,7 +140,7 @@ class AppIcon:
         if self.rect.collidepoint(mouse_pos):
             print(f"Launching: {self.command}")
             try:
-                subprocess.Popen(self.command.split())
+                subprocess.Popen(self.command.split(), env=app_host.subprocess_env())
                 pygame.quit()
             except Exception as e:
                 print(f"Failed to launch '{self.command}': {e}")
@@ -2,6 +2,12 @@ import pygame
 import sys
 from kit_module import kit  # Your bot module
 from modules.top_bar import TopBarManager
+from modules.frame_scheduler import FrameScheduler
+from modules.gestures import GestureInput
+from modules import fonts
+from modules.key_layer import KeyLayer
+from modules.scroll_list import ScrollList
+from modules.text_buffer import TextBuffer, TextLine
 
 pygame.init()
 
@@ -12,8 +18,10 @@ INPUT_BG_COLOR = (60, 60, 70)
 TEXT_COLOR = (230, 230, 230)
 BOT_COLOR = (100, 180, 255)
 USER_COLOR = (180, 255, 180)
-FONT = pygame.font.SysFont("Arial", 18)
+FONT = fonts.get_font(18)
 INPUT_HEIGHT = 30
+LINE_HEIGHT = 20
+CHAT_TOP = 40
 KEY_HEIGHT = 35
 PADDING = 3
 
@@ -21,10 +29,13 @@ PADDING = 3
 is_shift = False
 is_symbols = False
 conversation_history = []
-user_input = ""
+chat_lines = []  # each message wrapped to the screen width, see add_message()
+user_input = TextBuffer()
+input_line = TextLine(FONT, TEXT_COLOR)  # user_input laid out, redone only after edits
+input_scroll = 0
 cursor_visible = True
 cursor_timer = 0
-scroll_offset = 0
+pressed_key = None  # (key, rect) under the finger
 
 # --- Keyboard layouts ---
 keys_layout_lower = [
@@ -48,36 +59,57 @@ keys_layout_symbols = [
     [("ABC",2),("SPACE",5),("ENTER",2)]
 ]
 
-# --- Initialize screen ---
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Kit AI Touch Chat")
-clock = pygame.time.Clock()
-topbar = TopBarManager(SCREEN_WIDTH, SCREEN_HEIGHT, FONT, FONT, app_key="kitchat")
+# Each layout pre-rendered once, see build_keyboard_layers()
+keyboard_layers = {}
 
 # --- Bot ---
 bot = kit()
 
+# --- Screen (created in main so the module can be loaded once and re-entered) ---
+screen = None
+topbar = None
+
 # --- Helper Functions ---
+def keyboard_start_y(layout):
+    return SCREEN_HEIGHT - (len(layout) * (KEY_HEIGHT + PADDING)) - INPUT_HEIGHT - PADDING
+
 def create_keyboard_buttons(layout):
-    buttons = []
-    keyboard_start_y = SCREEN_HEIGHT - (len(layout) * (KEY_HEIGHT + PADDING)) - INPUT_HEIGHT - PADDING
+    """Rows of (key, rect) for a layout"""
+    rows = []
+    start_y = keyboard_start_y(layout)
     for row_index, row in enumerate(layout):
         total_units = sum([w for _, w in row])
         key_width_unit = (SCREEN_WIDTH - (len(row)+1)*PADDING) / total_units
         x_offset = PADDING
-        y = keyboard_start_y + row_index*(KEY_HEIGHT + PADDING)
+        y = start_y + row_index*(KEY_HEIGHT + PADDING)
+        rows.append([])
         for key, width_mult in row:
             width = key_width_unit * width_mult
             rect = pygame.Rect(x_offset, y, width, KEY_HEIGHT)
-            buttons.append((key, rect))
+            rows[-1].append((key, rect))
             x_offset += width + PADDING
-    return buttons
+    return rows
+
+def render_key(surface, key, rect):
+    # Draw key surface
+    pygame.draw.rect(surface, INPUT_BG_COLOR, rect, border_radius=5)
 
-def get_current_layout():
+    # Draw key label
+    display_key = " " if key == "SPACE" else key
+    surf = FONT.render(display_key, True, TEXT_COLOR)
+    surf_rect = surf.get_rect(center=rect.center)
+    surface.blit(surf, surf_rect)
+
+def build_keyboard_layers():
+    """Renders every layout once; needs the display to be set up"""
+    for name, layout in (("lower", keys_layout_lower), ("upper", keys_layout_upper), ("symbols", keys_layout_symbols)):
+        area = pygame.Rect(0, keyboard_start_y(layout) - PADDING, SCREEN_WIDTH, len(layout) * (KEY_HEIGHT + PADDING) + PADDING)
+        keyboard_layers[name] = KeyLayer(area, create_keyboard_buttons(layout), render_key, background=BG_COLOR)
+
+def get_current_layer():
     if is_symbols:
-        return keys_layout_symbols
-    else:
-        return keys_layout_upper if is_shift else keys_layout_lower
+        return keyboard_layers["symbols"]
+    return keyboard_layers["upper" if is_shift else "lower"]
 
 def wrap_text(text, font, max_width):
     words = text.split(" ")
@@ -94,42 +126,66 @@ def wrap_text(text, font, max_width):
         lines.append(current_line)
     return lines
 
-def scroll_to_bottom():
-    global scroll_offset
-    total_lines = sum(len(wrap_text(msg, FONT, SCREEN_WIDTH - 20)) for _, msg in conversation_history)
-    scroll_offset = -max(0, total_lines * 20 - (SCREEN_HEIGHT - INPUT_HEIGHT - len(get_current_layout())*(KEY_HEIGHT + PADDING) - 70))
+def message_height(index):
+    return len(chat_lines[index]) * LINE_HEIGHT
+
+def render_message(index, width, height):
+    speaker, _ = conversation_history[index]
+    color = BOT_COLOR if speaker=="Kit" else USER_COLOR
+    row = pygame.Surface((width, height), pygame.SRCALPHA)
+    for i, line in enumerate(chat_lines[index]):
+        row.blit(FONT.render(f"{speaker}: {line}", True, color), (PADDING, i * LINE_HEIGHT))
+    return row
+
+# Messages between the top bar and the keyboard; each is wrapped and rendered once
+chat_list = ScrollList((0, CHAT_TOP, SCREEN_WIDTH, keyboard_start_y(keys_layout_lower) - PADDING - CHAT_TOP),
+                       message_height, render_message)
+
+def add_message(speaker, msg):
+    conversation_history.append((speaker, msg))
+    chat_lines.append(wrap_text(msg, FONT, SCREEN_WIDTH-20))
+    chat_list.set_count(len(conversation_history))
 
 def draw_chat():
-    y_offset = 60 + scroll_offset
-    max_height = SCREEN_HEIGHT - INPUT_HEIGHT - len(get_current_layout())*(KEY_HEIGHT + PADDING) - 70
-    for speaker, msg in conversation_history:
-        color = BOT_COLOR if speaker=="Kit" else USER_COLOR
-        lines = wrap_text(msg, FONT, SCREEN_WIDTH-20)
-        for line in lines:
-            surf = FONT.render(f"{speaker}: {line}", True, color)
-            screen.blit(surf, (PADDING, y_offset))
-            y_offset += 20
-            if y_offset > max_height:
-                break
+    chat_list.update()
+    chat_list.draw(screen)
 
 def draw_keyboard():
-    layout = get_current_layout()
-    for key, rect in create_keyboard_buttons(layout):
-        # Draw solid backing
-        backing_rect = pygame.Rect(rect.x - 2, rect.y - 2, rect.width + 4, rect.height + 4)
-        pygame.draw.rect(screen, BG_COLOR, backing_rect)  # Darker base layer
+    # The layer's background is the darker base under the keys
+    get_current_layer().draw(screen, pressed_key)
+
+def send_input():
+    text = user_input.text
+    if text.strip():
+        add_message("You", text)
+        add_message("Kit", bot.respond(text))
+        user_input.set_text("")
+        chat_list.scroll_to_end()
+        return True
+    return False
+
+def draw_input():
+    global input_scroll
+    input_rect = pygame.Rect(PADDING, SCREEN_HEIGHT-INPUT_HEIGHT-PADDING, SCREEN_WIDTH-2*PADDING, INPUT_HEIGHT)
+    pygame.draw.rect(screen, INPUT_BG_COLOR, input_rect, border_radius=5)
+    input_line.set_text(user_input.text)
 
-        # Draw key surface
-        pygame.draw.rect(screen, INPUT_BG_COLOR, rect, border_radius=5)
+    # Keep the cursor in view on long inputs
+    visible_w = input_rect.width - 10
+    cursor_x = input_line.x_of(user_input.cursor)
+    if cursor_x - input_scroll > visible_w:
+        input_scroll = cursor_x - visible_w
+    elif cursor_x < input_scroll:
+        input_scroll = cursor_x
 
-        # Draw key label
-        display_key = " " if key == "SPACE" else key
-        surf = FONT.render(display_key, True, TEXT_COLOR)
-        surf_rect = surf.get_rect(center=rect.center)
-        screen.blit(surf, surf_rect)
+    text_x = input_rect.x + 5 - input_scroll
+    input_line.draw(screen, text_x, input_rect.y + 5, input_rect.x + 5, input_rect.right - 5)
+    if cursor_visible:
+        pygame.draw.line(screen, TEXT_COLOR, (text_x + cursor_x, input_rect.y + 5),
+                         (text_x + cursor_x, input_rect.y + 5 + FONT.get_height()), 1)
 
 def handle_key_press(key_label):
-    global is_shift, is_symbols, user_input
+    global is_shift, is_symbols
     if key_label=="SHIFT":
         is_shift = not is_shift
     elif key_label=="123":
@@ -139,89 +195,86 @@ def handle_key_press(key_label):
         is_symbols = False
         is_shift = False
     elif key_label=="BACK":
-        user_input = user_input[:-1]
+        user_input.backspace()
     elif key_label=="ENTER":
-        if user_input.strip():
-            conversation_history.append(("You", user_input))
-            response = bot.respond(user_input)
-            conversation_history.append(("Kit", response))
-            user_input = ""
+        if send_input():
             is_shift = False
-            scroll_to_bottom()
     elif key_label=="SPACE":
-        user_input += " "
+        user_input.insert(" ")
     else:
-        user_input += key_label.upper() if is_shift and not is_symbols else key_label.lower()
+        user_input.insert(key_label.upper() if is_shift and not is_symbols else key_label.lower())
         if is_shift and not is_symbols:
             is_shift = False
 
 # --- Main Loop ---
-running = True
-scroll_dragging = False
-last_drag_y = 0
-
-while running:
-    screen.fill(BG_COLOR)
-    mouse_pos = pygame.mouse.get_pos()
-    mouse_clicked = False
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-        topbar.handle_event(event)
-
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_BACKSPACE:
-                user_input = user_input[:-1]
-            elif event.key == pygame.K_RETURN:
-                if user_input.strip():
-                    conversation_history.append(("You", user_input))
-                    response = bot.respond(user_input)
-                    conversation_history.append(("Kit", response))
-                    user_input = ""
-                    scroll_to_bottom()
-            else:
-                user_input += event.unicode
-
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            if event.button == 1:
-                mouse_clicked = True
-                last_drag_y = event.pos[1]
-                for key, rect in create_keyboard_buttons(get_current_layout()):
-                    if rect.collidepoint(event.pos):
-                        handle_key_press(key)
-            elif event.button == 4:
-                scroll_offset += 20
-            elif event.button == 5:
-                scroll_offset -= 20
-
-        if event.type == pygame.MOUSEMOTION:
-            if event.buttons[0]:
-                dy = event.pos[1]-last_drag_y
-                scroll_offset += dy
-                last_drag_y = event.pos[1]
-
-    draw_chat()
+def main():
+    global screen, topbar, cursor_visible, cursor_timer, pressed_key
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    if not keyboard_layers:
+        build_keyboard_layers()
+    pygame.display.set_caption("Kit AI Touch Chat")
+    # Wake every 500 ms while idle so the cursor keeps blinking
+    scheduler = FrameScheduler(idle_timeout_ms=500)
+    topbar = TopBarManager(SCREEN_WIDTH, SCREEN_HEIGHT, FONT, FONT, app_key="kitchat")
 
-    input_rect = pygame.Rect(PADDING, SCREEN_HEIGHT-INPUT_HEIGHT-PADDING, SCREEN_WIDTH-2*PADDING, INPUT_HEIGHT)
-    pygame.draw.rect(screen, INPUT_BG_COLOR, input_rect, border_radius=5)
-    display_text = user_input + ("|" if cursor_visible else "")
-    input_surf = FONT.render(display_text, True, TEXT_COLOR)
-    screen.blit(input_surf, (input_rect.x+5, input_rect.y+5))
+    running = True
+    gesture_input = GestureInput()
+
+    try:
+        for events in scheduler.frames(lambda: running, lambda: topbar.is_animating() or chat_list.is_animating()):
+            screen.fill(BG_COLOR)
+
+            for event in events:
+                if event.type == pygame.QUIT:
+                    running = False
+
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_BACKSPACE:
+                        user_input.backspace()
+                    elif event.key == pygame.K_DELETE:
+                        user_input.delete()
+                    elif event.key == pygame.K_LEFT:
+                        user_input.move(-1)
+                    elif event.key == pygame.K_RIGHT:
+                        user_input.move(1)
+                    elif event.key == pygame.K_RETURN:
+                        send_input()
+                    else:
+                        user_input.insert(event.unicode)
+
+            for g in gesture_input.process(events):
+                if topbar.handle_gesture(g) or chat_list.handle_gesture(g):
+                    continue
+                if g.kind == "down":
+                    # Keys go down on touch, not on release
+                    pressed_key = get_current_layer().key_at(g.pos)
+                    if pressed_key:
+                        handle_key_press(pressed_key[0])
+                elif g.kind == "up":
+                    pressed_key = None
+
+            draw_chat()
+
+            draw_input()
+
+            draw_keyboard()
+            topbar.update()
+            topbar.draw(screen)
 
-    draw_keyboard()
-    topbar.update()
-    topbar.draw(screen)
+            cursor_timer += scheduler.clock.get_time()
+            if cursor_timer>=500:
+                cursor_visible = not cursor_visible
+                cursor_timer=0
 
-    cursor_timer += clock.get_time()
-    if cursor_timer>=500:
-        cursor_visible = not cursor_visible
-        cursor_timer=0
+            pygame.display.flip()
+            gesture_input.presented()
+    finally:
+        # Also runs when the top bar hands control back to the shell
+        bot.save_memory()
 
-    pygame.display.flip()
-    clock.tick(60)
+    pygame.quit()
+    sys.exit()
 
-bot.save_memory()
-pygame.quit()
-sys.exit()
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import pygame
 import time
 import os
+from modules import fonts
 
 class Notification:
     def __init__(self, text, duration=3, is_dialogue=False):
@@ -16,7 +17,7 @@ class NotificationManager:
     def __init__(self, screen):
         self.screen = screen
         self.notifications = []
-        self.font = pygame.font.SysFont("Arial", 18)
+        self.font = fonts.get_font(18)
         self.last_read_time = 0
         self.read_interval = 2  # seconds between file checks
         self.notify_path = self.get_notify_path()
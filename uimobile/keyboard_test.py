@@ -1,6 +1,6 @@
 import pygame
 import sys
-from modules.keyboard import run_keyboard  # ✅ Correct import
+from modules.keyboard import KeyboardOverlay, TEXT_EDIT_EVENT  # ✅ Correct import
 
 
 
@@ -18,6 +18,7 @@ def main():
     BLUE = (0, 120, 215)
 
     input_text = ""
+    keyboard = KeyboardOverlay()
     button_rect = pygame.Rect(140, 120, 200, 60)
 
     running = True
@@ -33,15 +34,22 @@ def main():
         input_surface = FONT.render("Typed: " + input_text, True, WHITE)
         screen.blit(input_surface, (20, 220))
 
+        keyboard.draw(screen)
         pygame.display.flip()
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
 
+            elif keyboard.handle_event(event):
+                continue
+
+            elif event.type == TEXT_EDIT_EVENT:
+                input_text = event.text
+
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if button_rect.collidepoint(event.pos):
-                    input_text = run_keyboard()  # Call from imported function
+                    keyboard.open(input_text)  # drawn over this scene
 
     pygame.quit()
     sys.exit()
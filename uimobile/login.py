@@ -2,38 +2,41 @@ import pygame
 import sys
 import os
 import subprocess
-import json
 from datetime import datetime
-from modules import pass_keyboard
+from modules.keyboard_overlay import KeyboardOverlay, TEXT_EDIT_EVENT, TEXT_DONE_EVENT
 from modules.encryption import decrypt_string
+from modules.frame_scheduler import FrameScheduler
+from modules.gestures import GestureInput
+from modules.tween import get_animator, linear
+from modules.status_bar import ClockText
+from modules.assets import get_loader
+from modules import orchestrator
+from modules import app_host
+from modules import config_service
+from modules import fonts
 
 # --- Paths ---
 CONFIG_DIR = "config"
-CONFIG_PATH = os.path.join(CONFIG_DIR, "config.json")
 USER_ENC_PATH = os.path.join(CONFIG_DIR, "user.enc")
 IMAGES_DIR = "images"
 
 # --- Load Config ---
-default_resolution = (480, 320)
-main_app = "main.py"
-
-try:
-    with open(CONFIG_PATH, 'r') as f:
-        config = json.load(f)
-        resolution = tuple(config.get("resolution", default_resolution))
-        main_app = config.get("UI", main_app)
-except Exception as e:
-    print(f"Error loading config: {e}")
-    resolution = default_resolution
+config = config_service.load_config()
+resolution = config["resolution"]
+main_app = config["UI"]
 
 # --- Pygame Setup ---
 pygame.init()
 screen = pygame.display.set_mode(resolution)
 pygame.display.set_caption("Lock Screen")
-font = pygame.font.SysFont("Arial", 72, bold=True)
-small_font = pygame.font.SysFont("Arial", 24)  # smaller top-right time
-tiny_font = pygame.font.SysFont("Arial", 20)
-clock = pygame.time.Clock()
+font = fonts.get_font(72, bold=True)
+drag_clock = fonts.ScaledText(72, bold=True)  # clock shrinking while dragging
+small_font = fonts.get_font(24)  # smaller top-right time
+tiny_font = fonts.get_font(20)
+scheduler = FrameScheduler()
+center_clock = ClockText(font, (0, 0, 0), "%H:%M:%S")
+corner_clock = ClockText(small_font, (0, 0, 0), "%H:%M:%S")
+time_box_cache = {}  # box size -> translucent rounded box
 SCREEN_WIDTH, SCREEN_HEIGHT = resolution
 
 # --- UI Elements ---
@@ -50,18 +53,18 @@ except Exception as e:
     stored_password = None
 
 # --- Load Background Images ---
+assets = get_loader()
+
 def load_background_images():
+    """Queues the lock screen images for background decoding. Each handle
+    shows plain white until its image is ready."""
     images = []
     for i in range(1, 6):
         img_path = os.path.join(IMAGES_DIR, f"{i}.jpg")
         if os.path.exists(img_path):
-            img = pygame.image.load(img_path).convert()
-            img = pygame.transform.scale(img, (SCREEN_WIDTH, SCREEN_HEIGHT))
-            images.append(img)
+            images.append(assets.image(img_path, (SCREEN_WIDTH, SCREEN_HEIGHT)))
     if not images:
-        surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        surf.fill((255, 255, 255))
-        images.append(surf)
+        images.append(assets.solid((SCREEN_WIDTH, SCREEN_HEIGHT), (255, 255, 255)))
     return images
 
 background_images = load_background_images()
@@ -75,14 +78,16 @@ ARROW_WIDTH, ARROW_HEIGHT = 40, 30
 arrow_base_y = SCREEN_HEIGHT - 60
 arrow_x = SCREEN_WIDTH // 2
 arrow_y = arrow_base_y
-arrow_pulse_direction = 1
-arrow_pulse_speed = 0.5
+arrow_pulse_speed = 30  # pixels per second: 0.5 per frame at the old fixed 60 fps
 arrow_pulse_range = 10
+arrow_pulse_ms = 2 * arrow_pulse_range * 1000 // arrow_pulse_speed  # one sweep, top to bottom
+arrow_pulse = None  # tween of arrow_y while locked
 
 # --- State Flags ---
 unlocked = False
 input_password = ""
 error_message = ""
+keyboard = KeyboardOverlay(masked=True)
 
 # --- Background Indices ---
 bg_index = 0
@@ -92,8 +97,8 @@ fading = False
 fade_start_time = 0
 
 # --- Dragging ---
+gesture_input = GestureInput()
 dragging = False
-drag_start_y = None
 drag_offset = 0
 unlock_threshold = SCREEN_HEIGHT // 3
 
@@ -104,46 +109,44 @@ def draw_pulsing_arrow(surface, x, y, alpha=255):
     pygame.draw.polygon(arrow_surf, color, points)
     surface.blit(arrow_surf, (x - ARROW_WIDTH // 2, y))
 
-def blend_images(img1, img2, alpha):
-    blended = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert_alpha()
-    img1_copy = img1.copy()
-    img2_copy = img2.copy()
-    img1_copy.set_alpha(255 - int(alpha * 255))
-    img2_copy.set_alpha(int(alpha * 255))
-    blended.blit(img1_copy, (0, 0))
-    blended.blit(img2_copy, (0, 0))
-    return blended
+def draw_crossfade(surface, img1, img2, alpha):
+    """Blends img2 over img1 straight into surface (the back buffer). The
+    wallpapers are opaque and already in display format, so per-surface
+    alpha does the blend in one SDL blit with nothing allocated."""
+    surface.blit(img1, (0, 0))
+    level = int(alpha * 255)
+    if level > 0:
+        img2.set_alpha(level)
+        surface.blit(img2, (0, 0))
+        img2.set_alpha(None)
 
 def draw_center_time_with_box():
     """Draws the time in the center with a translucent rounded white background and soft blur."""
-    now = datetime.now()
-    time_str = now.strftime("%H:%M:%S")
-    time_surf = font.render(time_str, True, (0, 0, 0))
+    center_clock.update()
 
     padding = 25
-    box_rect = time_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+    box_rect = center_clock.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
     box_rect.inflate_ip(padding * 2, padding)
 
-    # Create transparent surface for the blur box
-    blur_surf = pygame.Surface(box_rect.size, pygame.SRCALPHA)
-
-    # Draw semi-transparent rounded rectangle
-    pygame.draw.rect(blur_surf, (255, 255, 255, 75), blur_surf.get_rect(), border_radius=20)
+    # Transparent rounded box, built once per size
+    blur_surf = time_box_cache.get(box_rect.size)
+    if blur_surf is None:
+        blur_surf = pygame.Surface(box_rect.size, pygame.SRCALPHA)
+        pygame.draw.rect(blur_surf, (255, 255, 255, 75), blur_surf.get_rect(), border_radius=20)
+        time_box_cache[box_rect.size] = blur_surf
 
     # Fake soft blur by drawing slightly offset multiple times
     for dx, dy in [(-1, -1), (1, -1), (-1, 1), (1, 1), (0, 0)]:
         screen.blit(blur_surf, (box_rect.x + dx, box_rect.y + dy))
 
     # Draw the text on top
-    screen.blit(time_surf, time_surf.get_rect(center=box_rect.center))
+    center_clock.draw(screen, center_clock.get_rect(center=box_rect.center))
 
 
 def draw_top_right_time_small():
     """Draws smaller time at the top right (login screen)."""
-    now = datetime.now()
-    time_str = now.strftime("%H:%M:%S")
-    time_surf = small_font.render(time_str, True, (0, 0, 0))
-    screen.blit(time_surf, (SCREEN_WIDTH - time_surf.get_width() - 10, 10))
+    corner_clock.update()
+    corner_clock.draw(screen, (SCREEN_WIDTH - corner_clock.surface.get_width() - 10, 10))
 
 def draw_drag_transition():
     """Interpolates time position/size while dragging."""
@@ -159,11 +162,10 @@ def draw_drag_transition():
     start_size = 72
     end_size = 24
     font_size = int(start_size - (start_size - end_size) * progress)
-    interp_font = pygame.font.SysFont("Arial", font_size, bold=True)
 
     now = datetime.now()
     time_str = now.strftime("%H:%M:%S")
-    time_surf = interp_font.render(time_str, True, (0, 0, 0))
+    time_surf = drag_clock.render(time_str, font_size, (0, 0, 0))
     time_rect = time_surf.get_rect(center=(interp_x, interp_y))
 
     # Rounded background box for visibility at start of drag
@@ -204,16 +206,21 @@ def check_login():
 
 def lock_screen():
     global bg_index, next_bg_index, last_switch_time, fading, fade_start_time
-    global dragging, drag_start_y, drag_offset, unlocked
-    global arrow_y, arrow_pulse_direction, input_password, error_message
+    global dragging, drag_offset, unlocked
+    global arrow_y, arrow_pulse, input_password, error_message
 
-    while True:
+    arrow_pulse = get_animator().tween(arrow_base_y - arrow_pulse_range, arrow_base_y + arrow_pulse_range, arrow_pulse_ms,
+                                       ease=linear, repeat=True, yoyo=True)
+
+    # The lock screen animates (crossfade, arrow pulse); the login form is static
+    for events in scheduler.frames(is_active=lambda: not unlocked or dragging):
+        assets.poll()
         current_time = pygame.time.get_ticks()
         elapsed = current_time - last_switch_time
 
         # Background crossfade
         if not unlocked:
-            if not fading and elapsed >= BG_DISPLAY_TIME:
+            if not fading and elapsed >= BG_DISPLAY_TIME and background_images[next_bg_index].ready:
                 fading = True
                 fade_start_time = current_time
 
@@ -228,19 +235,15 @@ def lock_screen():
                     next_bg_index = (next_bg_index + 1) % len(background_images)
 
             if len(background_images) == 1:
-                screen.blit(background_images[0], (0, 0))
+                screen.blit(background_images[0].surface, (0, 0))
             else:
-                screen.blit(blend_images(background_images[bg_index], background_images[next_bg_index], alpha), (0, 0))
+                draw_crossfade(screen, background_images[bg_index].surface, background_images[next_bg_index].surface, alpha)
         else:
             screen.fill((255, 255, 255))
 
         # Arrow animation
         if not unlocked:
-            arrow_y += arrow_pulse_direction * arrow_pulse_speed
-            if arrow_y > arrow_base_y + arrow_pulse_range:
-                arrow_pulse_direction = -1
-            elif arrow_y < arrow_base_y - arrow_pulse_range:
-                arrow_pulse_direction = 1
+            arrow_y = arrow_pulse.value
 
         # Time & Login UI
         if not unlocked and not dragging:
@@ -252,52 +255,67 @@ def lock_screen():
         elif unlocked:
             draw_top_right_time_small()
             draw_login_ui()
+            keyboard.draw(screen)
 
         pygame.display.flip()
+        gesture_input.presented()
 
-        for event in pygame.event.get():
+        unhandled = []  # left for the gesture recogniser
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
 
-            elif not unlocked:
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if abs(event.pos[0] - arrow_x) < 40 and abs(event.pos[1] - arrow_y) < 40:
-                        dragging = True
-                        drag_start_y = event.pos[1]
-                elif event.type == pygame.MOUSEMOTION and dragging:
-                    drag_offset = max(0, drag_start_y - event.pos[1])
+            elif keyboard.handle_event(event):
+                continue
+
+            elif event.type == TEXT_EDIT_EVENT:
+                input_password = event.text
+                error_message = ""
+            elif event.type == TEXT_DONE_EVENT:
+                input_password = event.text
+                if event.submitted and check_login():
+                    return True
+
+            elif unlocked and event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_BACKSPACE:
+                    input_password = input_password[:-1]
+                elif event.key == pygame.K_RETURN:
+                    if check_login():
+                        return True
+
+            else:
+                unhandled.append(event)
+
+        for g in gesture_input.process(unhandled):
+            if not unlocked:
+                if g.kind == "down":
+                    dragging = abs(g.pos[0] - arrow_x) < 40 and abs(g.pos[1] - arrow_y) < 40
+                elif g.kind == "drag" and dragging:
+                    drag_offset = max(0, -g.dy)
                     if drag_offset > unlock_threshold:
                         unlocked = True
                         dragging = False
+                        arrow_pulse.cancel()  # the login form is static
                         input_password = ""
                         error_message = ""
-                elif event.type == pygame.MOUSEBUTTONUP:
+                elif g.kind == "up":
                     dragging = False
 
-            else:  # Unlocked → Login screen
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if input_box.collidepoint(event.pos):
-                        typed = pass_keyboard.run_keyboard()
-                        if typed is not None:
-                            input_password = typed
-                    elif login_button.collidepoint(event.pos):
-                        if check_login():
-                            return True
-
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_BACKSPACE:
-                        input_password = input_password[:-1]
-                    elif event.key == pygame.K_RETURN:
-                        if check_login():
-                            return True
-
-        clock.tick(60)
+            elif g.kind == "tap":  # Unlocked → Login screen
+                if input_box.collidepoint(g.pos):
+                    keyboard.open(input_password)
+                elif login_button.collidepoint(g.pos):
+                    if check_login():
+                        return True
 
 if __name__ == "__main__":
-    if lock_screen():
+    # Under the boot orchestrator the launcher follows in this process,
+    # on the same display; standalone, start it and get out of the way
+    if lock_screen() and not orchestrator.is_managed():
         try:
-            subprocess.Popen(["python3", main_app])
+            subprocess.Popen(["python3", main_app], env=app_host.subprocess_env())
         except Exception as e:
             print(f"Failed to launch app '{main_app}': {e}")
-    pygame.quit()
+    if not orchestrator.is_managed():
+        pygame.quit()
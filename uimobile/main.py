@@ -1,59 +1,40 @@
 import pygame
 import sys
 import os
-import time
-import json
-import subprocess
+import runpy
+import compileall
+from modules.boot_timeline import BootTimeline
+from modules.assets import get_loader
+from modules.frame_scheduler import FrameScheduler
+from modules.notification_bus import NotificationBus
+from modules.orchestrator import Orchestrator
+from modules import zygote
+from modules import config_service
+from modules import fonts
+
+timeline = BootTimeline()
 
 # --- Paths ---
 CONFIG_FOLDER = 'config'
-TO_JSON = os.path.join(CONFIG_FOLDER, 'boot.json')
-CONFIG_JSON = os.path.join(CONFIG_FOLDER, 'config.json')
 KEY_FILE = os.path.join(CONFIG_FOLDER, 'user.enc')  # Encrypted key file
 LOGO_PATH = 'logo.png'
-NOTIFICATIONS_LOG = os.path.join(CONFIG_FOLDER, 'notifications_log.txt')
-
-# --- Auto-clear notification history ---
-try:
-    if os.path.exists(NOTIFICATIONS_LOG):
-        with open(NOTIFICATIONS_LOG, "w", encoding="utf-8") as f:
-            f.write("=== Notification Log Cleared on Boot ===\n")
-        print("🧹 Cleared notification history.")
-    else:
-        # Ensure config folder exists and create an empty log
-        os.makedirs(CONFIG_FOLDER, exist_ok=True)
-        with open(NOTIFICATIONS_LOG, "w", encoding="utf-8") as f:
-            f.write("=== Notification Log Initialized ===\n")
-        print("🧾 Notification log initialized.")
-except Exception as e:
-    print(f"⚠️ Failed to clear notification history: {e}")
 
 # --- Load configuration ---
-try:
-    with open(CONFIG_JSON, 'r') as f:
-        config = json.load(f)
-        resolution = tuple(config.get("resolution", [800, 600]))
-        background_path = config.get("background", None)
-except Exception as e:
-    print(f"Failed to load config.json: {e}")
-    resolution = (800, 600)
-    background_path = None
+config = config_service.load_config()
+boot_config = config_service.load_boot()
+resolution = config["resolution"]
+
+# Optional: keep the splash up for at least this long, never longer than the timeout
+SPLASH_MIN_MS = boot_config["splash_min_ms"]
+SPLASH_TIMEOUT_MS = boot_config["splash_timeout_ms"]
 
 # --- Initialize Pygame ---
-pygame.init()
-screen = pygame.display.set_mode(resolution)
-pygame.display.set_caption("Boot Screen")
-font = pygame.font.SysFont('Arial', 24)
-
-# --- Load background ---
-background = None
-if background_path and os.path.exists(background_path):
-    try:
-        background = pygame.image.load(background_path)
-        background = pygame.transform.scale(background, resolution)
-    except Exception as e:
-        print(f"Failed to load background: {e}")
-        background = None
+with timeline.phase("pygame_init"):
+    pygame.init()
+    screen = pygame.display.set_mode(resolution)
+    pygame.display.set_caption("Boot Screen")
+    # pygame's built-in font: a system font could need a font scan before the first frame
+    font = fonts.get_font(30, family=None)
 
 # --- Load and scale logo to fit window ---
 try:
@@ -73,14 +54,58 @@ except Exception as e:
     pygame.quit()
     sys.exit()
 
-# --- Boot screen loop ---
-start_time = time.time()
-booting = True
-while booting:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
+# --- Decide what to launch ---
+if not os.path.exists(KEY_FILE):
+    # No user.enc found, launch OOBE
+    print("No user key found, next stage is OOBE (first-time setup)")
+    next_stage = "oobe.py"
+else:
+    # user.enc exists, launch what boot.json specifies (default desktop)
+    next_stage = boot_config.get("launch")
+    if not next_stage:
+        print("No 'launch' key in boot.json")
+
+
+# --- Boot tasks (run while the splash is shown) ---
+def validate_config():
+    """Reports config problems now rather than as a crash later on"""
+    problems = config_service.validate()
+    if next_stage and not os.path.exists(next_stage):
+        problems.append(f"File to launch not found: {next_stage}")
+    for problem in problems:
+        print(f"⚠️ {problem}")
+
+def warm_fonts():
+    # Resolves font files now (a system scan only if nothing is bundled or cached)
+    fonts.warm()
+
+def compile_bytecode():
+    compileall.compile_dir("modules", quiet=1)
+    compileall.compile_dir("apps", quiet=1)
+    for name in os.listdir("."):
+        if name.endswith(".py"):
+            compileall.compile_file(name, quiet=1)
+
+def start_notification_bus():
+    # Up during the lock screen already, so nothing sent meanwhile is lost
+    bus = NotificationBus()
+    bus.start()
+    return bus
+
+
+# --- Splash ---
+SPLASH_WAITS_FOR = ["config", "fonts", "bytecode"]
+
+def run_splash():
+    # Lock screen wallpapers, decoded now and handed to login.py in this process
+    assets = get_loader()
+    wallpapers_started = timeline.now_ms()
+    wallpapers = []
+    if next_stage == "login.py":
+        for i in range(1, 6):
+            img_path = os.path.join("images", f"{i}.jpg")
+            if os.path.exists(img_path):
+                wallpapers.append(assets.image(img_path, resolution))
 
     screen.fill((255, 255, 255))
     screen.blit(logo, logo_rect)
@@ -91,37 +116,69 @@ while booting:
     screen.blit(text_surface, text_rect)
 
     pygame.display.flip()
+    timeline.mark("splash_first_frame")
 
-    # Wait 5 seconds
-    if time.time() - start_time >= 5:
-        booting = False
+    # Nothing animates: sleep until the work is done, checking the minimum time
+    splash_start = timeline.now_ms()
+    scheduler = FrameScheduler(idle_timeout_ms=100)
+    for events in scheduler.frames():
+        for event in events:
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
 
-pygame.quit()
+        assets.poll()
+        if wallpapers and all(a.ready or a.failed for a in wallpapers):
+            timeline.record("wallpapers", wallpapers_started)
+            wallpapers = []
 
-# --- Decide what to launch ---
-if not os.path.exists(KEY_FILE):
-    # No user.enc found, launch OOBE
-    oobe_path = os.path.abspath('oobe.py')
-    if os.path.exists(oobe_path):
-        print("Launching OOBE (first-time setup)...")
-        subprocess.Popen([sys.executable, oobe_path])
+        shown_ms = timeline.now_ms() - splash_start
+        ready = boot.is_done(*SPLASH_WAITS_FOR) and not wallpapers
+        if (ready and shown_ms >= SPLASH_MIN_MS) or shown_ms >= SPLASH_TIMEOUT_MS:
+            if not ready:
+                print("⚠️ Boot tasks still running, continuing anyway")
+            return
+
+
+def run_stage(script):
+    """Runs a stage script in this process, on the display it inherits"""
+    def start():
+        launch_path = os.path.abspath(script)
+        print(f"Launching {script}...")
+        sys.argv = [launch_path]
+        runpy.run_path(launch_path, run_name="__main__")
+    return start
+
+
+# --- Boot graph ---
+# Everything runs in this one owner process. Background units start as soon
+# as their requirements are met; foreground units take the display in order.
+boot = Orchestrator(timeline)
+boot.add("config", validate_config)
+boot.add("fonts", warm_fonts)
+boot.add("bytecode", compile_bytecode)
+boot.add("zygote", zygote.ensure_running)
+boot.add("notification_bus", start_notification_bus, stop=lambda bus: bus.stop())
+boot.add("splash", run_splash, foreground=True)
+
+stages = [next_stage] if next_stage and os.path.exists(next_stage) else []
+if next_stage == "login.py":
+    stages.append(config["UI"])
+previous = "splash"
+for stage in stages:
+    name = os.path.splitext(os.path.basename(stage))[0]
+    requires = [previous]
+    if stage == config["UI"]:
+        # The launcher needs its services; supervised, since nothing else would restart it
+        requires += ["notification_bus", "zygote"]
+        boot.add(name, run_stage(stage), requires, foreground=True, restart=True)
     else:
-        print("OOBE script not found!")
-else:
-    # user.enc exists, launch what boot.json specifies (default desktop)
-    try:
-        with open(TO_JSON, 'r') as f:
-            to_config = json.load(f)
-            file_to_launch = to_config.get("launch")
-
-            if file_to_launch:
-                launch_path = os.path.abspath(file_to_launch)
-                if os.path.exists(launch_path):
-                    print(f"Launching {file_to_launch}...")
-                    subprocess.Popen([sys.executable, launch_path])
-                else:
-                    print(f"File to launch not found: {launch_path}")
-            else:
-                print("No 'launch' key in boot.json")
-    except Exception as e:
-        print(f"Error reading boot.json: {e}")
+        boot.add(name, run_stage(stage), requires, foreground=True)
+    previous = name
+
+# The timeline is complete once the splash and all background units are
+boot.add("timeline", lambda: timeline.save(next=next_stage),
+         requires=SPLASH_WAITS_FOR + ["splash", "zygote", "notification_bus"])
+
+boot.run()
+pygame.quit()
@@ -0,0 +1,197 @@
+import pygame
+import os
+import sys
+import subprocess
+import importlib.util
+import time
+
+# Shared modules every hosted app binds to. Importing them here (before any
+# app directory is put on sys.path) makes sure `modules.top_bar` and friends
+# resolve to the shell's copies instead of an app's bundled duplicate.
+import modules.top_bar  # noqa: F401
+import modules.keyboard  # noqa: F401
+from modules import zygote
+from modules import orchestrator
+from modules.launch_log import watch_first_frame
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_active_host = None
+
+
+class AppExit(Exception):
+    """Raised inside a hosted app to hand control back to the shell."""
+    def __init__(self, shutdown=False):
+        super().__init__("app exit")
+        self.shutdown = shutdown
+
+
+def is_hosted():
+    return _active_host is not None and _active_host.current_app is not None
+
+
+def exit_app(shutdown=False):
+    """Leave the running app. With shutdown=True the shell exits as well."""
+    raise AppExit(shutdown)
+
+
+def resolve_script(command):
+    """Returns the absolute path of the .py entry point in an apps.json command."""
+    for part in command.split():
+        if part.endswith(".py"):
+            path = part if os.path.isabs(part) else os.path.join(ROOT_DIR, part)
+            if os.path.exists(path):
+                return os.path.abspath(path)
+    return None
+
+
+def subprocess_env():
+    """Environment for app subprocesses: the OS root goes on PYTHONPATH so
+    shared modules resolve after the app's own bundled modules/ copies."""
+    env = dict(os.environ)
+    paths = [ROOT_DIR] + [p for p in env.get("PYTHONPATH", "").split(os.pathsep) if p]
+    env["PYTHONPATH"] = os.pathsep.join(paths)
+    env.update(orchestrator.owner_env())
+    return env
+
+
+class AppHost:
+    def __init__(self, screen):
+        global _active_host
+        self.screen = screen
+        self.current_app = None
+        self.modules = {}  # script path -> (mtime, module)
+        _active_host = self
+
+    # ------------------------
+    # LAUNCH
+    # ------------------------
+    def launch(self, name, command, trusted=False, tap_time=None):
+        """Runs an app. Trusted apps run in-process and this returns once they
+        exit; everything else falls back to a separate process."""
+        tap_time = tap_time or time.time()
+        script_path = resolve_script(command)
+        if trusted and script_path:
+            self.run_in_process(name, script_path, tap_time)
+            return True
+
+        self.run_subprocess(name, command, script_path, tap_time)
+        return False
+
+    def run_subprocess(self, name, command, script_path, tap_time):
+        """Subprocess fallback for untrusted apps. Python apps are forked
+        from the warm zygote when it is running.
+
+        Under the boot orchestrator the shell hands the display over and the
+        owner process restarts it once the app exits. Standalone, the app
+        owns the display and relaunches the UI through its top bar, so the
+        shell exits."""
+        def start():
+            pid = zygote.spawn(script_path, name, tap_time, orchestrator.owner_env()) if script_path else None
+            if pid:
+                print(f"[AppHost] Forked {name} from zygote (pid {pid})")
+                return pid
+            print(f"[AppHost] Launching in subprocess: {command}")
+            return subprocess.Popen(command.split(), cwd=ROOT_DIR, env=subprocess_env())
+
+        if orchestrator.is_managed():
+            orchestrator.hand_off(start)  # leaves this call; the owner runs start()
+        else:
+            start()
+            pygame.quit()
+            sys.exit()
+
+    def run_in_process(self, name, script_path, tap_time):
+        print(f"[AppHost] Entering {name} in-process")
+        caption = pygame.display.get_caption()
+        size = self.screen.get_size()
+        start = time.time()
+        self.current_app = name
+        shutdown = False
+        unwatch = watch_first_frame(name, "in-process", tap_time)
+        try:
+            with _HostedContext(self, script_path):
+                module = self.load_module(script_path)
+                if hasattr(module, "main"):
+                    module.main()
+        except AppExit as e:
+            shutdown = e.shutdown
+        except SystemExit:
+            pass
+        except Exception as e:
+            print(f"[AppHost] {name} crashed: {e}")
+        finally:
+            unwatch()
+            self.current_app = None
+
+        print(f"[AppHost] Left {name} after {time.time() - start:.1f}s")
+        if shutdown:
+            pygame.quit()
+            sys.exit()
+
+        # Back to the shell scene: restore display state and drop stale input
+        if self.screen.get_size() != size:
+            self.screen = pygame.display.set_mode(size)
+        if caption:
+            pygame.display.set_caption(caption[0])
+        pygame.event.clear((pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION,
+                            pygame.FINGERDOWN, pygame.FINGERUP, pygame.FINGERMOTION,
+                            pygame.KEYDOWN, pygame.KEYUP))
+
+    def load_module(self, script_path):
+        """Imports an app once and keeps it loaded between launches. Apps
+        without a main() are plain scripts: importing runs them in full, so
+        they are not cached and run again on the next launch."""
+        mtime = os.path.getmtime(script_path)
+        cached = self.modules.get(script_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        mod_name = "app_" + os.path.splitext(os.path.relpath(script_path, ROOT_DIR))[0].replace(os.sep, "_")
+        spec = importlib.util.spec_from_file_location(mod_name, script_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        if hasattr(module, "main"):
+            self.modules[script_path] = (mtime, module)
+        return module
+
+
+class _HostedContext:
+    """Shares the shell's display with an in-process app: pygame.quit() becomes
+    an app exit and set_mode() hands back the existing screen."""
+    def __init__(self, host, script_path):
+        self.host = host
+        self.script_path = script_path
+        self.app_dir = os.path.dirname(script_path)
+
+    def __enter__(self):
+        self.saved_path = list(sys.path)
+        self.saved_argv = sys.argv
+        self.saved_cwd = os.getcwd()
+        self.real_quit = pygame.quit
+        self.real_set_mode = pygame.display.set_mode
+
+        sys.path.insert(0, self.app_dir)
+        sys.argv = [self.script_path]
+        os.chdir(ROOT_DIR)
+        pygame.quit = self.quit
+        pygame.display.set_mode = self.set_mode
+        return self
+
+    def __exit__(self, *exc):
+        pygame.quit = self.real_quit
+        pygame.display.set_mode = self.real_set_mode
+        sys.path[:] = self.saved_path
+        sys.argv = self.saved_argv
+        os.chdir(self.saved_cwd)
+        return False
+
+    def quit(self):
+        raise AppExit()
+
+    def set_mode(self, size=(0, 0), flags=0, *args, **kwargs):
+        size = tuple(size)
+        if size == (0, 0) or size == self.host.screen.get_size():
+            return self.host.screen
+        self.host.screen = self.real_set_mode(size, flags, *args, **kwargs)
+        return self.host.screen
@@ -0,0 +1,163 @@
+import pygame
+import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Posted (without payload) whenever a background load finishes, so loops
+# sleeping in pygame.event.wait() wake up and call poll()
+ASSET_EVENT = pygame.event.custom_type()
+
+
+class Asset:
+    """Handle returned immediately by AssetLoader. Holds a placeholder until
+    the real asset has been decoded and swapped in by AssetLoader.poll()."""
+    def __init__(self, path):
+        self.path = path
+        self.ready = False
+        self.failed = False
+        self.load_ms = None
+        self.callbacks = []
+
+    def on_ready(self, callback):
+        """Calls callback(asset) on the main thread once loaded (or now)."""
+        if self.ready:
+            callback(self)
+        else:
+            self.callbacks.append(callback)
+
+
+class ImageAsset(Asset):
+    def __init__(self, path, size, placeholder_color, alpha):
+        super().__init__(path)
+        self.size = size
+        self.alpha = alpha
+        self.surface = None
+        if size:
+            self.surface = pygame.Surface(size, pygame.SRCALPHA if alpha else 0)
+            self.surface.fill(placeholder_color)
+
+    def decode(self):
+        """Worker thread: disk read, decode and scale. No display access."""
+        img = pygame.image.load(self.path)
+        if self.size and img.get_size() != tuple(self.size):
+            img = pygame.transform.scale(img, self.size)
+        return img
+
+    def finish(self, img):
+        """Main thread: convert to the display format and swap in."""
+        self.surface = img.convert_alpha() if self.alpha else img.convert()
+
+
+class SoundAsset(Asset):
+    def __init__(self, path):
+        super().__init__(path)
+        self.sound = None
+
+    def decode(self):
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        return pygame.mixer.Sound(self.path)
+
+    def finish(self, sound):
+        self.sound = sound
+
+    def play(self, *args):
+        """Silently does nothing until the sound has loaded."""
+        if self.sound and pygame.mixer.get_init():
+            self.sound.play(*args)
+
+
+class AssetLoader:
+    """Loads images and sounds on worker threads so disk reads, JPEG decodes
+    and mixer start-up never block a frame. Requests return a handle with a
+    placeholder right away; call poll() once per frame to swap finished
+    assets in (surfaces must be converted on the main thread)."""
+    def __init__(self, workers=2):
+        self.workers = workers
+        self.executor = None  # created on first request, never at import
+        self.done = queue.Queue()
+        self.pending = 0
+        self.lock = threading.Lock()
+        self.timings = {}  # path -> load time in ms
+        self.handles = {}  # request key -> Asset, so repeat requests share one load
+
+    def image(self, path, size=None, placeholder_color=(255, 255, 255), alpha=False):
+        key = ("image", path, tuple(size) if size else None, alpha)
+        return self.request(key, lambda: ImageAsset(path, size, placeholder_color, alpha))
+
+    def sound(self, path):
+        key = ("sound", path)
+        if key in self.handles and self.handles[key].ready and not pygame.mixer.get_init():
+            del self.handles[key]  # the mixer was shut down since; load again
+        return self.request(key, lambda: SoundAsset(path))
+
+    def request(self, key, make):
+        asset = self.handles.get(key)
+        if asset is None or asset.failed:
+            asset = self.handles[key] = self.submit(make())
+        return asset
+
+    def solid(self, size, color):
+        """An already-ready plain image, for when there is nothing to load"""
+        asset = ImageAsset(None, size, color, False)
+        asset.ready = True
+        return asset
+
+    def submit(self, asset):
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix="assets")
+        with self.lock:
+            self.pending += 1
+        self.executor.submit(self.work, asset, time.perf_counter())
+        return asset
+
+    def work(self, asset, queued_at):
+        try:
+            result, error = asset.decode(), None
+        except Exception as e:
+            result, error = None, e
+        self.done.put((asset, result, error, queued_at))
+        try:
+            pygame.event.post(pygame.event.Event(ASSET_EVENT))
+        except pygame.error:
+            pass  # no display yet; picked up by the next poll()
+
+    def poll(self):
+        """Swaps in finished assets and runs their callbacks. Returns the
+        assets that became ready, so callers can repaint what uses them."""
+        ready = []
+        while True:
+            try:
+                asset, result, error, queued_at = self.done.get_nowait()
+            except queue.Empty:
+                break
+            with self.lock:
+                self.pending -= 1
+            if error is not None:
+                asset.failed = True
+                print(f"❌ Failed to load {asset.path}: {error}")
+                continue
+            asset.finish(result)
+            asset.ready = True
+            asset.load_ms = (time.perf_counter() - queued_at) * 1000
+            self.timings[asset.path] = asset.load_ms
+            print(f"[Assets] {asset.path} ready in {asset.load_ms:.1f} ms")
+            for callback in asset.callbacks:
+                callback(asset)
+            asset.callbacks.clear()
+            ready.append(asset)
+        return ready
+
+    def is_busy(self):
+        return self.pending > 0
+
+
+_loader = None
+
+def get_loader():
+    """The process-wide loader shared by the shell, lock screen and apps"""
+    global _loader
+    if _loader is None:
+        _loader = AssetLoader()
+    return _loader
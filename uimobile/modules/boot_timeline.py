@@ -0,0 +1,58 @@
+import os
+import time
+import json
+import threading
+from contextlib import contextmanager
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOG_PATH = os.path.join(ROOT_DIR, "config", "boot_timeline.log")
+
+
+class BootTimeline:
+    """Times boot phases (from any thread) relative to the start of boot.
+    save() appends the whole boot as one JSON line to
+    config/boot_timeline.log so boot times can be compared across releases."""
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+        self.phases = []
+        self.lock = threading.Lock()
+
+    def now_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def record(self, name, start_ms, end_ms=None):
+        end_ms = self.now_ms() if end_ms is None else end_ms
+        with self.lock:
+            self.phases.append({
+                "phase": name,
+                "start_ms": round(start_ms, 1),
+                "duration_ms": round(end_ms - start_ms, 1),
+            })
+
+    def mark(self, name):
+        """An instant event, e.g. the first splash frame"""
+        self.record(name, self.now_ms(), self.now_ms())
+
+    @contextmanager
+    def phase(self, name):
+        start_ms = self.now_ms()
+        try:
+            yield
+        finally:
+            self.record(name, start_ms)
+
+    def save(self, **extra):
+        entry = {
+            "boot": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started_at)),
+            "total_ms": round(self.now_ms(), 1),
+            "phases": sorted(self.phases, key=lambda p: p["start_ms"]),
+        }
+        entry.update(extra)
+        try:
+            os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
+            with open(LOG_PATH, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            print(f"⏱️ Boot finished in {entry['total_ms']:.0f} ms")
+        except Exception as e:
+            print(f"❌ Failed to write boot timeline: {e}")
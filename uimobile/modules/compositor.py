@@ -0,0 +1,66 @@
+import pygame
+
+
+class Compositor:
+    """Retained-mode frame presenter. Callers report damaged regions; render()
+    repaints only inside them and pushes just those rects to the display.
+    When nothing was damaged a frame costs nothing."""
+    def __init__(self, screen, full_redraw_ratio=0.6):
+        self.screen = screen
+        self.screen_rect = screen.get_rect()
+        self.full_redraw_ratio = full_redraw_ratio
+        self.dirty = []
+        self.full = True  # first frame paints everything
+
+    def damage(self, rect):
+        if self.full or rect is None:
+            return
+        rect = pygame.Rect(rect).clip(self.screen_rect)
+        if rect.width and rect.height:
+            self.dirty.append(rect)
+
+    def damage_all(self):
+        self.full = True
+        self.dirty.clear()
+
+    def is_dirty(self):
+        return self.full or bool(self.dirty)
+
+    def collect(self):
+        """Merges overlapping damage. Falls back to one full-screen rect when
+        the damaged area gets close to the whole screen anyway."""
+        if self.full:
+            return [self.screen_rect.copy()]
+
+        merged = []
+        for rect in self.dirty:
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect = rect.union(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+
+        area = sum(r.width * r.height for r in merged)
+        if area >= self.screen_rect.width * self.screen_rect.height * self.full_redraw_ratio:
+            return [self.screen_rect.copy()]
+        return merged
+
+    def render(self, draw):
+        """Calls draw(clip_rect) once with drawing clipped to the damaged
+        bounds, then updates only the damaged rects. Returns False if the
+        frame was skipped because nothing changed."""
+        if not self.is_dirty():
+            return False
+
+        rects = self.collect()
+        clip = rects[0].unionall(rects[1:])
+        self.screen.set_clip(clip)
+        try:
+            draw(clip)
+        finally:
+            self.screen.set_clip(None)
+
+        pygame.display.update(rects)
+        self.dirty.clear()
+        self.full = False
+        return True
@@ -0,0 +1,175 @@
+import os
+import json
+import time
+from types import MappingProxyType
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_DIR = os.path.join(ROOT_DIR, "config")
+CONFIG_PATH = os.path.join(CONFIG_DIR, "config.json")
+APPS_PATH = os.path.join(CONFIG_DIR, "apps.json")
+BOOT_PATH = os.path.join(CONFIG_DIR, "boot.json")
+
+# The one place config defaults live. Keys missing from config.json get these.
+CONFIG_DEFAULTS = {
+    "resolution": [480, 320],
+    "background": "bck2.jpg",
+    "time_format": "%H:%M",
+    "battery_display": "🔋 80%",
+    "icon_width": 64,
+    "icon_height": 64,
+    "icon_padding": 25,
+    "icons_per_page": 10,
+    "columns": 5,
+    "UI": "ui.py",
+}
+
+BOOT_DEFAULTS = {
+    "launch": "login.py",
+    "splash_min_ms": 0,
+    "splash_timeout_ms": 10000,
+}
+
+
+def freeze(value):
+    """Read-only copy: dicts become mappingproxies, lists become tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+class ConfigFile:
+    """One JSON file, parsed once per process. get() hands out an immutable
+    snapshot and re-reads the file only when its mtime changes (checked at
+    most every check_interval seconds). Subscribers are called with
+    (new, old) snapshots from whichever thread notices the change, normally
+    the UI loop calling poll()."""
+    def __init__(self, path, defaults=None, check_interval=1.0):
+        self.path = path
+        self.defaults = defaults
+        self.check_interval = check_interval
+        self.snapshot = None
+        self.mtime = None
+        self.last_check = 0
+        self.subscribers = []
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = None
+        except Exception as e:
+            print(f"❌ Failed to load {self.path}: {e}")
+            return self.snapshot  # keep the last good one
+        if isinstance(self.defaults, dict):
+            merged = dict(self.defaults)
+            merged.update(data if isinstance(data, dict) else {})
+            data = merged
+        elif data is None:
+            data = []
+        return freeze(data)
+
+    def current_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def get(self):
+        if self.snapshot is None:
+            self.mtime = self.current_mtime()
+            self.snapshot = self.load()
+            self.last_check = time.monotonic()
+        else:
+            self.poll()
+        return self.snapshot
+
+    def poll(self):
+        """Re-reads the file if it changed. Returns True if it did."""
+        now = time.monotonic()
+        if self.snapshot is None or now - self.last_check < self.check_interval:
+            return False
+        self.last_check = now
+        mtime = self.current_mtime()
+        if mtime == self.mtime:
+            return False
+        self.mtime = mtime
+        old, self.snapshot = self.snapshot, self.load()
+        if self.snapshot == old:
+            return False
+        print(f"🔄 Reloaded {os.path.relpath(self.path, ROOT_DIR)}")
+        for callback in list(self.subscribers):
+            try:
+                callback(self.snapshot, old)
+            except Exception as e:
+                print(f"❌ Config subscriber failed: {e}")
+        return True
+
+    def subscribe(self, callback):
+        """Calls callback(new, old) after each change. Returns an unsubscribe function."""
+        self.get()
+        self.subscribers.append(callback)
+        return lambda: self.subscribers.remove(callback) if callback in self.subscribers else None
+
+
+config_file = ConfigFile(CONFIG_PATH, CONFIG_DEFAULTS)
+apps_file = ConfigFile(APPS_PATH)
+boot_file = ConfigFile(BOOT_PATH, BOOT_DEFAULTS)
+
+
+def load_config():
+    """config/config.json with defaults applied (read-only)"""
+    return config_file.get()
+
+
+def load_apps():
+    """config/apps.json as a tuple of read-only entries"""
+    return apps_file.get()
+
+
+def load_boot():
+    return boot_file.get()
+
+
+def find_app(key):
+    """apps.json entry whose name or command is key, or None"""
+    return next((a for a in load_apps() if a.get("name") == key or a.get("command") == key), None)
+
+
+def validate():
+    """Returns a list of problems with config.json and apps.json"""
+    problems = []
+    config = load_config()
+    for key, default in CONFIG_DEFAULTS.items():
+        value = config[key]
+        if isinstance(default, list):
+            if not isinstance(value, tuple) or len(value) != len(default):
+                problems.append(f"config.json '{key}' should be a list like {default}")
+        elif not isinstance(value, type(default)):
+            problems.append(f"config.json '{key}' should be a {type(default).__name__}")
+    width, height = config["resolution"] if len(config["resolution"]) == 2 else (0, 0)
+    if not (isinstance(width, int) and isinstance(height, int) and width > 0 and height > 0):
+        problems.append(f"config.json 'resolution' is not a valid size: {config['resolution']}")
+    if config["background"] and not os.path.exists(os.path.join(ROOT_DIR, config["background"])):
+        problems.append(f"Wallpaper not found: {config['background']}")
+
+    for app in load_apps():
+        if not hasattr(app, "get"):
+            problems.append(f"apps.json entry is not an object: {app}")
+            continue
+        script = next((p for p in app.get("command", "").split() if p.endswith(".py")), None)
+        if not app.get("name") or not script:
+            problems.append(f"apps.json entry is incomplete: {dict(app)}")
+        elif not os.path.exists(os.path.join(ROOT_DIR, script)):
+            problems.append(f"App script not found: {script}")
+    return problems
+
+
+def poll():
+    """Checks every file for changes; call once per frame from UI loops."""
+    changed = False
+    for f in (config_file, apps_file, boot_file):
+        changed = f.poll() or changed
+    return changed
@@ -0,0 +1,152 @@
+import os
+import json
+import threading
+import pygame
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Bundled fonts: fonts/<family>.ttf, <family>-bold.ttf, <family>-italic.ttf,
+# <family>-bolditalic.ttf (family lowercase, no spaces). Used before any system lookup.
+FONTS_DIR = os.path.join(ROOT_DIR, "fonts")
+# System font paths resolved on earlier boots, so fontconfig is scanned once, not every boot
+PATHS_CACHE = os.path.join(ROOT_DIR, "config", "font_paths.json")
+
+DEFAULT_FAMILY = "Arial"
+
+_fonts = {}  # (family, size, bold, italic) -> pygame Font
+_paths = None  # "family|bold|italic" -> [path, fake_bold, fake_italic]
+_lock = threading.Lock()
+
+
+def _simple_name(family):
+    return "".join(family.lower().split())
+
+
+def _style_suffix(bold, italic):
+    return ("-bold" if bold else "") + ("italic" if italic and bold else "-italic" if italic else "")
+
+
+def _load_paths():
+    global _paths
+    if _paths is None:
+        try:
+            with open(PATHS_CACHE, "r", encoding="utf-8") as f:
+                _paths = json.load(f)
+        except Exception:
+            _paths = {}
+    return _paths
+
+
+def _save_paths():
+    try:
+        os.makedirs(os.path.dirname(PATHS_CACHE), exist_ok=True)
+        with open(PATHS_CACHE, "w", encoding="utf-8") as f:
+            json.dump(_paths, f, indent=2)
+    except Exception as e:
+        print(f"⚠️ [Fonts] Failed to save {PATHS_CACHE}: {e}")
+
+
+def resolve(family, bold=False, italic=False):
+    """Returns (path, fake_bold, fake_italic) for a family and style.
+    path is None for pygame's built-in font. Styles the file lacks are faked
+    by pygame, the same as SysFont does."""
+    if not family:
+        return None, bold, italic
+    name = _simple_name(family)
+
+    # 1. Bundled with the OS: no lookup at all
+    for want_bold, want_italic in ((bold, italic), (False, False)):
+        path = os.path.join(FONTS_DIR, name + _style_suffix(want_bold, want_italic) + ".ttf")
+        if os.path.exists(path):
+            return path, bold and not want_bold, italic and not want_italic
+
+    # 2. Resolved on an earlier boot
+    with _lock:
+        paths = _load_paths()
+        key = f"{name}|{int(bold)}|{int(italic)}"
+        cached = paths.get(key)
+        if cached and (cached[0] is None or os.path.exists(cached[0])):
+            return tuple(cached)
+
+    # 3. System lookup (the first call scans the installed fonts), done outside
+    # the lock so a slow scan in the warm thread never stalls the UI thread
+    path = pygame.font.match_font(family, bold, italic)
+    if path:
+        plain = pygame.font.match_font(family) if (bold or italic) else path
+        styled = path != plain
+        entry = [path, bold and not styled, italic and not styled]
+    else:
+        if not (bold or italic):
+            print(f"⚠️ [Fonts] No font found for '{family}', using the default")
+        entry = [None, bold, italic]
+    with _lock:
+        # Another thread may have resolved the same key meanwhile; keep its entry
+        # (the stale one seen in step 2, if any, is replaced)
+        current = _paths.get(key)
+        if current is not None and current is not cached:
+            return tuple(current)
+        _paths[key] = entry
+        _save_paths()
+    return tuple(entry)
+
+
+def get_font(size, family=DEFAULT_FAMILY, bold=False, italic=False):
+    """A shared Font for this family, size and style, created on first use.
+    Use instead of pygame.font.SysFont; family=None is pygame's built-in font."""
+    size = max(1, int(size))
+    key = (family and _simple_name(family), size, bool(bold), bool(italic))
+    font = _fonts.get(key)
+    if font is None:
+        path, fake_bold, fake_italic = resolve(family, bold, italic)
+        try:
+            font = pygame.font.Font(path, size)
+        except Exception as e:
+            print(f"⚠️ [Fonts] Failed to load {path}: {e}")
+            font = pygame.font.Font(None, size)
+            fake_bold, fake_italic = bold, italic
+        font.set_bold(fake_bold)
+        font.set_italic(fake_italic)
+        _fonts[key] = font
+    return font
+
+
+def warm(families=(DEFAULT_FAMILY,)):
+    """Resolves the usual families and styles ahead of time (safe off the main thread)"""
+    for family in families:
+        for bold in (False, True):
+            for italic in (False, True):
+                resolve(family, bold, italic)
+
+
+def clear():
+    """Drops cached Font objects; needed after pygame.font.quit()"""
+    _fonts.clear()
+
+
+class ScaledText:
+    """Text drawn at an animated size. The text is rasterised once at
+    max_size and scaled down from there, so changing the size every frame
+    never builds a Font. Scaled copies are kept per integer size until the
+    text or colour changes."""
+    def __init__(self, max_size, family=DEFAULT_FAMILY, bold=False, italic=False):
+        self.font = get_font(max_size, family, bold, italic)
+        self.max_size = max(1, int(max_size))
+        self.key = None
+        self.surface = None
+        self.scaled = {}
+
+    def render(self, text, size, color):
+        key = (text, tuple(color))
+        if key != self.key:
+            self.key = key
+            self.surface = self.font.render(text, True, color)
+            self.scaled.clear()
+        size = max(1, min(int(size), self.max_size))
+        if size == self.max_size:
+            return self.surface
+        surface = self.scaled.get(size)
+        if surface is None:
+            scale = size / self.max_size
+            w, h = self.surface.get_size()
+            surface = pygame.transform.smoothscale(self.surface, (max(1, round(w * scale)), max(1, round(h * scale))))
+            self.scaled[size] = surface
+        return surface
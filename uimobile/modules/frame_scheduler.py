@@ -0,0 +1,99 @@
+import pygame
+from modules.tween import get_animator
+
+INPUT_EVENTS = (
+    pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION, pygame.MOUSEWHEEL,
+    pygame.FINGERDOWN, pygame.FINGERUP, pygame.FINGERMOTION,
+    pygame.KEYDOWN, pygame.KEYUP, pygame.TEXTINPUT,
+)
+
+
+POINTER_BOUNDARIES = (
+    pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.FINGERDOWN, pygame.FINGERUP,
+)
+
+
+def coalesce_motion(events):
+    """Merges each run of motion events (per finger for touches) into its
+    last event, summing rel, so a flood of motion costs one handler call
+    per frame. Runs end at button and finger presses and releases, which
+    keep their order."""
+    out = []
+    last = {}  # (type, finger) -> index in out of the pending motion
+    for e in events:
+        if e.type in (pygame.MOUSEMOTION, pygame.FINGERMOTION):
+            key = (e.type, getattr(e, "finger_id", None))
+            if key in last:
+                prev = out[last[key]]
+                out[last[key]] = None
+                if e.type == pygame.MOUSEMOTION:
+                    e = pygame.event.Event(e.type, dict(e.__dict__, rel=(prev.rel[0] + e.rel[0], prev.rel[1] + e.rel[1])))
+                else:
+                    e = pygame.event.Event(e.type, dict(e.__dict__, dx=prev.dx + e.dx, dy=prev.dy + e.dy))
+            last[key] = len(out)
+        elif e.type in POINTER_BOUNDARIES:
+            last.clear()
+        out.append(e)
+    return [e for e in out if e is not None]
+
+
+class FrameScheduler:
+    """Paces a pygame loop. While something is animating, or shortly after
+    input, frames run at full rate. Otherwise the loop sleeps in
+    pygame.event.wait() and wakes on the next event or after idle_timeout_ms
+    (1 Hz by default, enough for a clock).
+
+    Tweens (modules.tween) are advanced at the start of every frame and
+    count as animating, so loops using them need no is_active for them."""
+    def __init__(self, fps=60, idle_timeout_ms=1000, linger_ms=300):
+        self.clock = pygame.time.Clock()
+        self.fps = fps
+        self.idle_timeout_ms = idle_timeout_ms
+        self.linger_ms = linger_ms
+        self.awake_until = 0
+        self.animator = get_animator()
+
+    def keep_awake(self, duration_ms=0):
+        """Requests full-rate frames for at least duration_ms from now."""
+        self.awake_until = max(self.awake_until, pygame.time.get_ticks() + duration_ms)
+
+    def is_awake(self):
+        return pygame.time.get_ticks() < self.awake_until
+
+    def get_events(self, active=False):
+        """Waits for the next frame and returns its events."""
+        if active or self.is_awake() or self.animator.is_active():
+            self.clock.tick(self.fps)
+            events = pygame.event.get()
+        else:
+            timeout = self.idle_timeout_ms
+            wait = self.animator.ms_until_next()
+            if wait is not None:
+                timeout = max(1, min(timeout, wait))  # up in time for a delayed tween
+            first = pygame.event.wait(timeout)
+            events = pygame.event.get()
+            if first.type != pygame.NOEVENT:
+                events.insert(0, first)
+            self.clock.tick()  # so get_time() covers the time spent asleep
+
+        if any(e.type in INPUT_EVENTS for e in events):
+            self.keep_awake(self.linger_ms)
+        self.animator.update()
+        return coalesce_motion(events)
+
+    def frames(self, keep_running=None, is_active=None):
+        """The common run loop. Yields each frame's events until
+        keep_running() returns False; is_active() keeps the rate up while
+        the caller is animating.
+
+            for events in scheduler.frames(lambda: running, topbar.is_animating):
+                ...
+        """
+        self.keep_awake(self.linger_ms)  # first frames go out immediately
+        while keep_running is None or keep_running():
+            yield self.get_events(bool(is_active and is_active()))
+
+
+def run_loop(keep_running=None, is_active=None, **kwargs):
+    """Shortcut for FrameScheduler(**kwargs).frames(keep_running, is_active)"""
+    return FrameScheduler(**kwargs).frames(keep_running, is_active)
@@ -0,0 +1,217 @@
+import pygame
+from collections import deque
+
+# Gesture kinds, in the order a press can produce them:
+#   "down"        pointer pressed
+#   "long_press"  held still for long_press_ms
+#   "drag"        moved past tap_slop; once per frame with the frame's movement
+#   "pull"        like drag, for presses that started on the top edge
+#   "drag_end" / "pull_end"  released after dragging, with the release velocity
+#   "swipe"       released after moving swipe_distance, within swipe_max_ms if set (direction set)
+#   "tap"         released without moving or long-pressing
+#   "up"          pointer released, always last
+# plus "scroll" for the mouse wheel (rel is the wheel movement in pixels).
+
+
+class Gesture:
+    def __init__(self, kind, pos, start_pos, time_ms, start_ms, rel=(0, 0), velocity=(0.0, 0.0), edge=None):
+        self.kind = kind
+        self.pos = pos
+        self.start_pos = start_pos
+        self.time = time_ms  # pygame ticks when the input was seen
+        self.start_time = start_ms  # when the press started
+        self.rel = rel  # movement since the previous gesture of this press
+        self.velocity = velocity  # px/s at release
+        self.edge = edge  # "top" for presses that began on the top edge
+        self.direction = None  # for swipes: "left", "right", "up" or "down"
+
+    @property
+    def dx(self):
+        return self.pos[0] - self.start_pos[0]
+
+    @property
+    def dy(self):
+        return self.pos[1] - self.start_pos[1]
+
+    @property
+    def duration(self):
+        return self.time - self.start_time
+
+    def __repr__(self):
+        return f"<Gesture {self.kind} {self.pos} d=({self.dx},{self.dy})>"
+
+
+class GestureInput:
+    """Turns a frame's raw events into gestures, once, for every widget.
+
+    Mouse and touch are treated alike: FINGER* events are scaled to pixels
+    and the mouse events SDL synthesises from touches are dropped, so a tap
+    is seen once. Motion is coalesced, however many motion events a frame
+    holds, each press yields at most one drag per frame. Only the first
+    finger down is tracked.
+
+    Call process(events) every frame, pass the gestures to widgets
+    (dispatch() helps) and presented() after flipping: it records the
+    input-to-display latency of every frame that handled a gesture."""
+    def __init__(self, tap_slop=10, long_press_ms=500, swipe_distance=30, swipe_max_ms=None,
+                 edge_size=20, wheel_step=20):
+        self.tap_slop = tap_slop
+        self.long_press_ms = long_press_ms
+        self.swipe_distance = swipe_distance
+        self.swipe_max_ms = swipe_max_ms
+        self.edge_size = edge_size
+        self.wheel_step = wheel_step
+        self.latencies = deque(maxlen=120)  # ms, most recent frames with input
+        self.first_input_ms = None
+        self.reset()
+
+    def reset(self):
+        self.down = False
+        self.finger = None
+        self.start_pos = self.pos = self.last_pos = None
+        self.start_ms = 0
+        self.moved = False
+        self.long_pressed = False
+        self.edge = None
+        self.history = deque(maxlen=6)  # (ms, pos) for the release velocity
+
+    def is_active(self):
+        """True while a press is in progress (keeps frames coming for long-press)"""
+        return self.down
+
+    # ------------------------
+    # RAW EVENTS
+    # ------------------------
+    def pointer(self, event):
+        """(action, pos) for a pointer event, or None for anything else"""
+        if event.type in (pygame.FINGERDOWN, pygame.FINGERMOTION, pygame.FINGERUP):
+            if self.finger is not None and event.finger_id != self.finger:
+                return None
+            surface = pygame.display.get_surface()
+            w, h = surface.get_size() if surface else (1, 1)
+            pos = (int(event.x * w), int(event.y * h))
+            action = {pygame.FINGERDOWN: "down", pygame.FINGERMOTION: "move", pygame.FINGERUP: "up"}[event.type]
+            return action, pos
+
+        if getattr(event, "touch", False):
+            return None  # already seen as a FINGER event
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            return "down", event.pos
+        if event.type == pygame.MOUSEMOTION:
+            return "move", event.pos
+        if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            return "up", event.pos
+        return None
+
+    def process(self, events):
+        now = pygame.time.get_ticks()
+        gestures = []
+        moved_to = None
+
+        def emit(kind, pos, **kwargs):
+            g = Gesture(kind, pos, self.start_pos or pos, now, self.start_ms if self.down else now, edge=self.edge, **kwargs)
+            gestures.append(g)
+            return g
+
+        for event in events:
+            if event.type == pygame.MOUSEWHEEL:
+                emit("scroll", pygame.mouse.get_pos(), rel=(event.x * self.wheel_step, event.y * self.wheel_step))
+                continue
+            pointer = self.pointer(event)
+            if pointer is None:
+                continue
+            action, pos = pointer
+
+            if action == "down":
+                if self.down:  # its release went elsewhere (an app we launched, another window)
+                    emit("up", self.pos)
+                    moved_to = None
+                self.reset()
+                self.down = True
+                self.start_pos = self.pos = self.last_pos = pos
+                self.start_ms = now
+                self.finger = getattr(event, "finger_id", None)
+                self.edge = "top" if pos[1] < self.edge_size else None
+                self.history.append((now, pos))
+                emit("down", pos)
+            elif action == "move" and self.down:
+                moved_to = pos  # only the frame's last position matters
+            elif action == "up" and self.down:
+                if moved_to:
+                    self.move(moved_to, now, emit)
+                    moved_to = None
+                self.release(pos, now, emit)
+
+        if moved_to:
+            self.move(moved_to, now, emit)
+
+        if self.down and not self.moved and not self.long_pressed and now - self.start_ms >= self.long_press_ms:
+            self.long_pressed = True
+            emit("long_press", self.pos)
+
+        if gestures and self.first_input_ms is None:
+            self.first_input_ms = now
+        return gestures
+
+    def move(self, pos, now, emit):
+        self.pos = pos
+        self.history.append((now, pos))
+        if not self.moved:
+            dx, dy = pos[0] - self.start_pos[0], pos[1] - self.start_pos[1]
+            if dx * dx + dy * dy < self.tap_slop * self.tap_slop:
+                return
+            self.moved = True
+        rel = (pos[0] - self.last_pos[0], pos[1] - self.last_pos[1])
+        self.last_pos = pos
+        emit("pull" if self.edge else "drag", pos, rel=rel)
+
+    def release(self, pos, now, emit):
+        if pos != self.pos:
+            self.move(pos, now, emit)
+        velocity = self.velocity(now)
+        if self.moved:
+            emit("pull_end" if self.edge else "drag_end", pos, velocity=velocity)
+            dx, dy = pos[0] - self.start_pos[0], pos[1] - self.start_pos[1]
+            quick = self.swipe_max_ms is None or now - self.start_ms <= self.swipe_max_ms
+            if max(abs(dx), abs(dy)) >= self.swipe_distance and quick:
+                swipe = emit("swipe", pos, velocity=velocity)
+                if abs(dx) >= abs(dy):
+                    swipe.direction = "left" if dx < 0 else "right"
+                else:
+                    swipe.direction = "up" if dy < 0 else "down"
+        elif not self.long_pressed:
+            emit("tap", pos)
+        emit("up", pos, velocity=velocity)
+        self.reset()
+
+    def velocity(self, now):
+        """px/s over the last ~100 ms of movement"""
+        recent = [(t, p) for t, p in self.history if now - t <= 100]
+        if len(recent) < 2:
+            return (0.0, 0.0)
+        (t0, p0), (t1, p1) = recent[0], recent[-1]
+        dt = max(1, t1 - t0) / 1000
+        return ((p1[0] - p0[0]) / dt, (p1[1] - p0[1]) / dt)
+
+    # ------------------------
+    # LATENCY
+    # ------------------------
+    def presented(self):
+        """Call after the frame is on screen"""
+        if self.first_input_ms is not None:
+            self.latencies.append(pygame.time.get_ticks() - self.first_input_ms)
+            self.first_input_ms = None
+
+    def latency_summary(self):
+        """(average, worst) input-to-display ms over the recent frames, or None"""
+        if not self.latencies:
+            return None
+        return sum(self.latencies) / len(self.latencies), max(self.latencies)
+
+
+def dispatch(gesture, *widgets):
+    """Offers a gesture to widgets in order until one's handle_gesture() returns True"""
+    for widget in widgets:
+        if widget is not None and widget.handle_gesture(gesture):
+            return widget
+    return None
@@ -0,0 +1,105 @@
+import pygame
+import os
+import hashlib
+from collections import OrderedDict
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(ROOT_DIR, "config", "icon_cache")
+ICON_NAMES = ["icon.jpg", "icon.png"]
+
+_tobytes = getattr(pygame.image, "tobytes", None) or pygame.image.tostring
+
+
+def find_icon(command):
+    """Icon file next to the first existing .py script in an app command"""
+    for part in command.split():
+        if part.endswith(".py") and os.path.exists(part):
+            app_dir = os.path.dirname(part)
+            for name in ICON_NAMES:
+                icon_path = os.path.join(app_dir, name)
+                if os.path.exists(icon_path):
+                    return icon_path
+            return None
+    return None
+
+
+class IconCache:
+    """Pre-scaled icon surfaces keyed by (path, mtime, size).
+
+    Lookups hit an in-memory LRU first, then raw RGBA blobs under
+    config/icon_cache, which load with a single frombuffer() instead of a
+    JPEG/PNG decode plus smoothscale. Editing an icon changes its mtime, so
+    stale entries are never used and are removed when replaced."""
+    def __init__(self, capacity=64, cache_dir=CACHE_DIR):
+        self.capacity = capacity
+        self.cache_dir = cache_dir
+        self.surfaces = OrderedDict()
+
+    def get(self, path, size):
+        """Returns the icon at path scaled to size, or None if it can't be loaded."""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        key = (os.path.abspath(path), mtime, tuple(size))
+
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.surfaces.move_to_end(key)
+            return surf
+
+        surf = self.load_blob(key)
+        if surf is None:
+            surf = self.decode(key)
+        if surf is not None:
+            self.surfaces[key] = surf
+            if len(self.surfaces) > self.capacity:
+                self.surfaces.popitem(last=False)
+        return surf
+
+    # --- Disk store ---
+    def blob_prefix(self, path):
+        return hashlib.sha1(path.encode("utf-8")).hexdigest()[:16]
+
+    def blob_path(self, key):
+        path, mtime, (w, h) = key
+        return os.path.join(self.cache_dir, f"{self.blob_prefix(path)}-{mtime}-{w}x{h}.rgba")
+
+    def load_blob(self, key):
+        blob_path = self.blob_path(key)
+        w, h = key[2]
+        try:
+            with open(blob_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) != w * h * 4:
+            return None
+        return pygame.image.frombuffer(data, (w, h), "RGBA").convert_alpha()
+
+    def decode(self, key):
+        path, _, size = key
+        try:
+            img = pygame.image.load(path)
+            surf = pygame.transform.smoothscale(img.convert_alpha(), size)
+        except Exception as e:
+            print(f"❌ Failed to load icon {path}: {e}")
+            return None
+        self.store_blob(key, surf)
+        return surf
+
+    def store_blob(self, key, surf):
+        blob_path = self.blob_path(key)
+        prefix = self.blob_prefix(key[0]) + "-"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Older versions of this icon (other mtime or size) are now stale
+            for name in os.listdir(self.cache_dir):
+                if name.startswith(prefix):
+                    os.remove(os.path.join(self.cache_dir, name))
+            tmp_path = blob_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(_tobytes(surf, "RGBA"))
+            os.replace(tmp_path, blob_path)
+        except OSError as e:
+            print(f"⚠️ Could not write icon cache: {e}")
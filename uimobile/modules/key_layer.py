@@ -0,0 +1,63 @@
+import pygame
+
+NO_KEY = 255
+
+
+class KeyLayer:
+    """One keyboard layout (lower, upper, numbers...) rendered once.
+
+    All key caps and labels go onto a single surface, so drawing the
+    keyboard is one blit and switching layout is blitting another layer.
+    Hit-testing goes through two lookup tables: pixel row -> key row and,
+    per key row, pixel column -> key. Finding the key under a point costs
+    the same however many keys there are.
+
+    rows is a list of rows of (key, rect) in screen coordinates.
+    render_key(surface, key, rect) draws one key onto the layer surface.
+    """
+    def __init__(self, rect, rows, render_key, background=None):
+        self.rect = pygame.Rect(rect)
+        if background is None:
+            self.surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        else:
+            self.surface = pygame.Surface(self.rect.size).convert()
+            self.surface.fill(background)
+
+        self.rows = []  # (keys, column table) per row
+        self.row_of_y = bytearray([NO_KEY]) * self.rect.height
+        for row_index, row in enumerate(rows):
+            keys = []
+            columns = bytearray([NO_KEY]) * self.rect.width
+            for key, key_rect in row:
+                local = pygame.Rect(key_rect).move(-self.rect.x, -self.rect.y).clip(self.surface.get_rect())
+                render_key(self.surface, key, local)
+                columns[local.left:local.right] = bytes([len(keys)]) * local.width
+                self.row_of_y[local.top:local.bottom] = bytes([row_index]) * local.height
+                keys.append((key, pygame.Rect(key_rect)))
+            self.rows.append((keys, columns))
+        self.highlights = {}  # key size -> translucent press highlight
+
+    def key_at(self, pos):
+        """(key, rect) under a screen position, or None for gaps and outside"""
+        x, y = pos[0] - self.rect.x, pos[1] - self.rect.y
+        if not (0 <= x < self.rect.width and 0 <= y < self.rect.height):
+            return None
+        row = self.row_of_y[y]
+        if row == NO_KEY:
+            return None
+        keys, columns = self.rows[row]
+        index = columns[x]
+        return None if index == NO_KEY else keys[index]
+
+    def draw(self, surface, pressed=None):
+        """Blits the layer, plus a highlight over the pressed (key, rect) if any"""
+        surface.blit(self.surface, self.rect)
+        if pressed:
+            rect = pressed[1]
+            highlight = self.highlights.get(rect.size)
+            if highlight is None:
+                highlight = pygame.Surface(rect.size, pygame.SRCALPHA)
+                pygame.draw.rect(highlight, (255, 255, 255, 90), highlight.get_rect(), border_radius=6)
+                self.highlights[rect.size] = highlight
+            surface.blit(highlight, rect)
+        return self.rect
@@ -0,0 +1,295 @@
+import pygame
+import os
+from modules.assets import get_loader
+from modules import fonts
+from modules.key_layer import KeyLayer
+from modules.text_buffer import TextBuffer, TextLine
+
+base_path = os.path.dirname(os.path.abspath(__file__))
+sound_path = os.path.join(base_path, "type.mp3")
+
+# Posted after every edit (text, cursor) and when the keyboard closes (text, submitted)
+TEXT_EDIT_EVENT = pygame.event.custom_type()
+TEXT_DONE_EVENT = pygame.event.custom_type()
+
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+GRAY = (180, 180, 180)
+DARK = (50, 50, 50)
+PANEL = (20, 20, 20)
+SELECTION = (70, 130, 180)
+
+QWERTY = [
+    list("QWERTYUIOP"),
+    list("ASDFGHJKL"),
+    list("ZXCVBNM"),
+    ["SHIFT", "SPACE", "123", "←", "→", "BKSP", "ENTER"]
+]
+
+NUMBERS = [
+    list("1234567890"),
+    list("!@#$%^&*()"),
+    list("-_=+[]{}"),
+    ["ABC", "SPACE", ".", "←", "→", "BKSP", "ENTER"]
+]
+
+
+class KeyboardOverlay:
+    """On-screen keyboard drawn over the host app's frame. The host passes
+    it its events (handle_event() returns True for the ones it used) and
+    calls draw() after drawing everything else; the display is never
+    re-created. Edits are posted as TEXT_EDIT_EVENT, Enter or a tap outside
+    the panel closes it with a TEXT_DONE_EVENT."""
+    _layers = {}  # (screen size, layer name) -> KeyLayer, shared by every overlay
+
+    def __init__(self, masked=False):
+        self.masked = masked
+        self.visible = False
+        self.submitted = False
+        self.buffer = TextBuffer()
+        self.line = None  # laid-out input text, see draw_input()
+        self.line_version = None
+        self.scroll_offset = 0
+        self.is_shift = False
+        self.is_number = False
+        self.size = None
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.pressed = None  # (key, rect) under the finger, highlighted
+        self.sound = None
+
+    def open(self, text="", masked=None):
+        if masked is not None:
+            self.masked = masked
+        self.buffer.set_text(text)
+        self.scroll_offset = 0
+        self.is_shift = False
+        self.is_number = False
+        self.submitted = False
+        self.pressed = None
+        self.visible = True
+        self.sound = get_loader().sound(sound_path)  # shared handle; reloads if the mixer restarted
+
+    @property
+    def text(self):
+        return self.buffer.text
+
+    @property
+    def cursor(self):
+        return self.buffer.cursor
+
+    def close(self, submitted=False):
+        if self.visible:
+            self.visible = False
+            self.submitted = submitted
+            pygame.event.post(pygame.event.Event(TEXT_DONE_EVENT, text=self.text, submitted=submitted))
+
+    # ------------------------
+    # LAYOUT
+    # ------------------------
+    def layout(self, size):
+        """Sizes the panel for a screen size; keys stay where they are until it changes"""
+        width, height = size
+        self.size = size
+        self.padding = int(width * 0.012)
+        self.key_w = int(width * 0.08)
+        self.key_h = int(height * 0.1)
+        self.font_key = fonts.get_font(int(self.key_h * 0.4))
+        self.font_label = fonts.get_font(int(self.key_h * 0.3))
+        self.font_input = fonts.get_font(int(height * 0.08))
+        self.line = TextLine(self.font_input, WHITE)
+        self.line_version = None
+
+        rows_h = len(QWERTY) * (self.key_h + self.padding)
+        input_h = self.font_input.get_height() + 2 * self.padding
+        panel_h = input_h + rows_h + 2 * self.padding
+        self.rect = pygame.Rect(0, height - panel_h, width, panel_h)
+        self.input_rect = pygame.Rect(self.padding, self.rect.y + self.padding, width - 2 * self.padding, input_h)
+        keys_top = self.input_rect.bottom + self.padding
+        self.keys_rect = pygame.Rect(0, keys_top, width, self.rect.bottom - keys_top)
+
+    def layer_name(self):
+        if self.is_number:
+            return "numbers"
+        return "upper" if self.is_shift else "lower"
+
+    def layer(self):
+        """The current layout, rendered the first time it is shown at this size"""
+        cache_key = (self.size, self.layer_name())
+        layer = KeyboardOverlay._layers.get(cache_key)
+        if layer is None:
+            rows = []
+            y = self.keys_rect.y
+            for row in NUMBERS if self.is_number else QWERTY:
+                row_w = len(row) * (self.key_w + self.padding) - self.padding
+                x = (self.size[0] - row_w) // 2
+                rows.append([])
+                for key in row:
+                    rows[-1].append((key, pygame.Rect(x, y, self.key_w, self.key_h)))
+                    x += self.key_w + self.padding
+                y += self.key_h + self.padding
+            layer = KeyLayer(self.keys_rect, rows, self.render_key, background=PANEL)
+            KeyboardOverlay._layers[cache_key] = layer
+        return layer
+
+    def render_key(self, surface, key, rect):
+        pygame.draw.rect(surface, GRAY, rect, border_radius=6)
+        if len(key) == 1 and not self.is_number:
+            label = key.upper() if self.is_shift else key.lower()
+        else:
+            label = key
+        font = self.font_key if len(key) == 1 else self.font_label
+        surf = font.render(label, True, BLACK)
+        surface.blit(surf, surf.get_rect(center=rect.center))
+
+    # ------------------------
+    # EDITING
+    # ------------------------
+    def edited(self):
+        pygame.event.post(pygame.event.Event(TEXT_EDIT_EVENT, text=self.text, cursor=self.cursor))
+
+    def insert(self, ch):
+        if len(ch) == 1 and not self.is_number:
+            ch = ch.upper() if self.is_shift else ch.lower()
+        self.buffer.insert(ch)
+        self.edited()
+
+    def backspace(self, forward=False):
+        version = self.buffer.version
+        if forward:
+            self.buffer.delete()
+        else:
+            self.buffer.backspace()
+        if self.buffer.version != version:
+            self.edited()
+
+    def move(self, delta):
+        # With shift held the arrows extend the selection
+        self.buffer.move(delta, select=self.is_shift)
+
+    def set_numbers(self, is_number):
+        self.is_number = is_number
+        self.pressed = None  # that key is not on the new layer
+
+    def press(self, key):
+        if key == "SPACE":
+            self.insert(" ")
+        elif key == "SHIFT":
+            self.is_shift = not self.is_shift
+        elif key == "123":
+            self.set_numbers(True)
+        elif key == "ABC":
+            self.set_numbers(False)
+        elif key == "←":
+            self.move(-1)
+        elif key == "→":
+            self.move(1)
+        elif key == "BKSP":
+            self.backspace()
+        elif key == "ENTER":
+            self.close(submitted=True)
+        else:
+            self.insert(key)
+
+    # ------------------------
+    # EVENTS
+    # ------------------------
+    def handle_event(self, ev):
+        """Handles one host event. While open, all pointer and key input is ours."""
+        if not self.visible:
+            return False
+        if self.size is None:
+            self.layout(pygame.display.get_surface().get_size())
+
+        if ev.type == pygame.FINGERDOWN or (ev.type == pygame.MOUSEBUTTONDOWN and not getattr(ev, "touch", False)):
+            if ev.type == pygame.FINGERDOWN:
+                pos = (int(ev.x * self.size[0]), int(ev.y * self.size[1]))
+            else:
+                pos = ev.pos
+            if not self.rect.collidepoint(pos):
+                self.close(submitted=False)
+                return True
+            self.sound.play()
+            self.pressed = self.layer().key_at(pos)
+            if self.pressed:
+                self.press(self.pressed[0])
+            return True
+
+        if ev.type in (pygame.MOUSEBUTTONUP, pygame.FINGERUP):
+            self.pressed = None
+            return True
+
+        if ev.type == pygame.KEYDOWN:
+            self.sound.play()
+            if ev.key == pygame.K_BACKSPACE:
+                self.backspace()
+            elif ev.key == pygame.K_DELETE:
+                self.backspace(forward=True)
+            elif ev.key == pygame.K_a and ev.mod & pygame.KMOD_CTRL:
+                self.buffer.select_all()
+            elif ev.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+                self.close(submitted=True)
+            elif ev.key == pygame.K_ESCAPE:
+                self.close(submitted=False)
+            elif ev.key == pygame.K_LEFT:
+                self.move(-1)
+            elif ev.key == pygame.K_RIGHT:
+                self.move(1)
+            elif ev.key in (pygame.K_LSHIFT, pygame.K_RSHIFT):
+                self.is_shift = True
+            elif ev.key == pygame.K_TAB:
+                self.set_numbers(not self.is_number)
+            elif ev.unicode:
+                self.insert(ev.unicode)
+            return True
+
+        if ev.type == pygame.KEYUP:
+            if ev.key in (pygame.K_LSHIFT, pygame.K_RSHIFT):
+                self.is_shift = False
+            return True
+
+        return ev.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION,
+                           pygame.FINGERUP, pygame.FINGERMOTION, pygame.MOUSEWHEEL, pygame.TEXTINPUT)
+
+    # ------------------------
+    # DRAW
+    # ------------------------
+    def draw(self, surface):
+        """Draws the panel over the host's frame. Returns the rect it covers."""
+        if not self.visible:
+            return None
+        if surface.get_size() != self.size:
+            self.layout(surface.get_size())
+
+        surface.fill(PANEL, self.input_rect.inflate(2 * self.padding, 2 * self.padding))
+        self.draw_input(surface)
+        self.layer().draw(surface, self.pressed)
+        return self.rect
+
+    def draw_input(self, surface):
+        box = self.input_rect
+        pygame.draw.rect(surface, DARK, box, border_radius=8)
+        if self.line_version != self.buffer.version:
+            self.line.set_text("*" * len(self.buffer) if self.masked else self.buffer.text)
+            self.line_version = self.buffer.version
+        cursor_x = self.line.x_of(self.cursor)
+        visible_w = box.width - 2 * self.padding
+
+        if cursor_x - self.scroll_offset > visible_w:
+            self.scroll_offset = cursor_x - visible_w + 20
+        if cursor_x - self.scroll_offset < 0:
+            self.scroll_offset = max(0, cursor_x - 20)
+
+        clip = surface.get_clip()
+        surface.set_clip(box)
+        text_x = box.x + self.padding - self.scroll_offset
+        span = self.buffer.selection()
+        if span:
+            start_x, end_x = self.line.x_of(span[0]), self.line.x_of(span[1])
+            surface.fill(SELECTION, (text_x + start_x, box.y + self.padding, end_x - start_x, self.font_input.get_height()))
+        self.line.draw(surface, text_x, box.y + self.padding, box.left, box.right)
+        cursor_draw_x = text_x + cursor_x
+        pygame.draw.line(surface, WHITE,
+                         (cursor_draw_x, box.y + self.padding),
+                         (cursor_draw_x, box.y + self.padding + self.font_input.get_height()), 2)
+        surface.set_clip(clip)
+
@@ -0,0 +1,52 @@
+import pygame
+import os
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOG_PATH = os.path.join(ROOT_DIR, "config", "launch_latency.log")
+
+
+def log_launch(app_name, mode, latency_ms):
+    """Appends one tap-to-first-frame measurement to config/launch_latency.log"""
+    timestamp = time.strftime("[%Y-%m-%d %H:%M:%S]", time.localtime())
+    line = f"{timestamp} {app_name} mode={mode} tap_to_first_frame={latency_ms:.1f}ms\n"
+    try:
+        with open(LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(line)
+        print(f"⏱️ {app_name} ({mode}) first frame after {latency_ms:.1f} ms")
+    except Exception as e:
+        print(f"❌ Failed to log launch latency: {e}")
+
+
+def watch_first_frame(app_name, mode, tap_time):
+    """Wraps pygame.display.flip/update until the app presents its first frame,
+    then logs the latency since tap_time (a time.time() value).
+    Returns a function that removes the hooks if no frame was ever drawn."""
+    real_flip = pygame.display.flip
+    real_update = pygame.display.update
+    done = False
+
+    def restore():
+        nonlocal done
+        done = True
+        if pygame.display.flip is flip:
+            pygame.display.flip = real_flip
+        if pygame.display.update is update:
+            pygame.display.update = real_update
+
+    def first_frame():
+        if not done:
+            restore()
+            log_launch(app_name, mode, (time.time() - tap_time) * 1000)
+
+    def flip():
+        real_flip()
+        first_frame()
+
+    def update(*args, **kwargs):
+        real_update(*args, **kwargs)
+        first_frame()
+
+    pygame.display.flip = flip
+    pygame.display.update = update
+    return restore
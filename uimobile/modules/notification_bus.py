@@ -0,0 +1,181 @@
+import pygame
+import os
+import sys
+import time
+import socket
+import threading
+import queue
+import json
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOCKET_PATH = os.path.join(ROOT_DIR, "config", "notify.sock")
+LEGACY_NOTIFY_PATH = os.path.join(ROOT_DIR, "config", "notify.txt")
+MAX_MESSAGE_SIZE = 64 * 1024
+LEGACY_POLL_INTERVAL = 2.0  # seconds between checks of notify.txt for old writers
+
+# Posted (without payload) to wake the shell loop when messages arrive
+NOTIFY_EVENT = pygame.event.custom_type()
+
+
+# ------------------------
+# CLIENT
+# ------------------------
+def encode(text, app=None):
+    """(payload, datagram) for a message. Text too long for one datagram is
+    shortened before it is serialised, so the payload stays valid JSON;
+    raises ValueError if even an empty text does not fit."""
+    def payload_for(text):
+        payload = json.dumps({"app": app, "text": text}) if app else text
+        return payload, payload.encode("utf-8")
+
+    text = str(text)
+    payload, data = payload_for(text)
+    if len(data) <= MAX_MESSAGE_SIZE:
+        return payload, data
+    if len(payload_for("")[1]) > MAX_MESSAGE_SIZE:
+        raise ValueError("notification does not fit in a message")
+    # Longest prefix that fits; escapes make bytes per character uneven
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if len(payload_for(text[:mid])[1]) <= MAX_MESSAGE_SIZE:
+            low = mid
+        else:
+            high = mid - 1
+    print(f"⚠️ Notification cut to {low} of {len(text)} characters to fit a message")
+    return payload_for(text[:low])
+
+
+def send(text, app=None):
+    """Sends a notification to the shell. Accepts the same strings as
+    NotificationManager.push, including dialogue="..." and message="...".
+    app names the sender, so its history can be looked up later.
+    Text over MAX_MESSAGE_SIZE is cut short (with a warning), never dropped.
+    When no shell is listening the text is queued in config/notify.txt and
+    picked up within LEGACY_POLL_INTERVAL, or on the next start. Returns
+    True if delivered directly."""
+    payload, data = encode(text, app)
+    if hasattr(socket, "AF_UNIX"):
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as s:
+                s.sendto(data, SOCKET_PATH)
+            return True
+        except OSError:
+            pass
+
+    try:
+        with open(LEGACY_NOTIFY_PATH, "a", encoding="utf-8") as f:
+            f.write(payload.replace("\n", " ") + "\n")
+    except Exception as e:
+        print(f"❌ Failed to queue notification: {e}")
+    return False
+
+
+def parse(payload):
+    """(text, app) from a received payload: plain text, or JSON from send(text, app)"""
+    if payload.startswith("{"):
+        try:
+            message = json.loads(payload)
+            return str(message["text"]), message.get("app")
+        except (ValueError, KeyError, TypeError):
+            pass
+    return payload, None
+
+
+# ------------------------
+# SERVER (owned by the shell)
+# ------------------------
+class NotificationBus:
+    """Receives notifications on a Unix datagram socket. A blocking reader
+    thread queues each message in arrival order and wakes the pygame loop
+    with NOTIFY_EVENT, so the loop never polls. Between datagrams the reader
+    looks at notify.txt every LEGACY_POLL_INTERVAL for old-style writers."""
+    def __init__(self, path=SOCKET_PATH):
+        self.path = path
+        self.messages = queue.Queue()
+        self.sock = None
+        self.thread = None
+
+    def start(self):
+        self.load_legacy_file()
+        if not hasattr(socket, "AF_UNIX"):
+            print("⚠️ Notification bus unavailable: no Unix socket support")
+            return
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sock.bind(self.path)
+        self.sock.settimeout(LEGACY_POLL_INTERVAL)
+        self.thread = threading.Thread(target=self.reader, name="notification-bus", daemon=True)
+        self.thread.start()
+        print(f"📡 Notification bus listening on {self.path}")
+
+    def stop(self):
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def load_legacy_file(self):
+        """Compatibility shim: picks up anything appended to config/notify.txt,
+        one message per line. The file is moved aside before it is read, so a
+        line written meanwhile goes to a new file and waits for the next check."""
+        try:
+            if os.path.getsize(LEGACY_NOTIFY_PATH) == 0:
+                return
+            draining = LEGACY_NOTIFY_PATH + ".draining"
+            os.replace(LEGACY_NOTIFY_PATH, draining)
+            with open(draining, "r", encoding="utf-8") as f:
+                lines = [line.strip() for line in f if line.strip()]
+            os.remove(draining)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"❌ Failed to read {LEGACY_NOTIFY_PATH}: {e}")
+            return
+        for line in lines:
+            self.deliver(line)
+
+    def deliver(self, payload):
+        self.messages.put(parse(payload))
+        try:
+            pygame.event.post(pygame.event.Event(NOTIFY_EVENT))
+        except pygame.error:
+            pass  # display not up yet; the queue is drained on the next frame
+
+    def reader(self):
+        next_legacy_check = time.monotonic() + LEGACY_POLL_INTERVAL
+        while self.sock:
+            try:
+                data = self.sock.recv(MAX_MESSAGE_SIZE)
+            except socket.timeout:
+                data = b""
+            except OSError:
+                break
+            text = data.decode("utf-8", errors="replace").strip()
+            if text:
+                self.deliver(text)
+            if time.monotonic() >= next_legacy_check:
+                next_legacy_check = time.monotonic() + LEGACY_POLL_INTERVAL
+                self.load_legacy_file()
+
+    def drain(self):
+        """Returns all (text, app) messages received since the last call,
+        oldest first. app is None when the sender did not give one."""
+        pending = []
+        while True:
+            try:
+                pending.append(self.messages.get_nowait())
+            except queue.Empty:
+                return pending
+
+
+if __name__ == "__main__":
+    # Command-line client: python3 modules/notification_bus.py 'message="Hi"'
+    if len(sys.argv) < 2:
+        print('Usage: notification_bus.py <text | dialogue="..." | message="...">')
+        sys.exit(1)
+    send(" ".join(sys.argv[1:]))
@@ -1,5 +1,29 @@
 import pygame
-import os
+from modules import fonts
+from modules.scroll_list import ScrollList
+from modules.notification_journal import get_journal, JournalReader, LAUNCH_CATEGORY
+from modules.notification_store import get_store
+from modules.keyboard_overlay import KeyboardOverlay, TEXT_EDIT_EVENT, TEXT_DONE_EVENT
+
+HIDDEN_CATEGORIES = {LAUNCH_CATEGORY}
+ROW_HEIGHT = 30
+ROW_CACHE = 200  # rendered rows kept, by record id; the newest are rendered as they arrive
+REFRESH_MS = 250  # while open, how often the journal is checked for new records
+
+KEY = (255, 0, 255)  # transparent corners of the panel and rows; colorkeyed surfaces blit fastest
+_dim_layers = {}  # screen size -> black surface, shown at any alpha
+
+
+def dim_layer(size, alpha):
+    """A black layer to blit over a frame at alpha, made once per screen size"""
+    layer = _dim_layers.get(size)
+    if layer is None:
+        layer = pygame.Surface(size)
+        layer.fill((0, 0, 0))
+        _dim_layers[size] = layer
+    layer.set_alpha(alpha)
+    return layer
+
 
 class NotificationCenter:
     def __init__(self, screen, width=None, height=None):
@@ -7,112 +31,250 @@ class NotificationCenter:
         self.width = width or screen.get_width()
         self.height = height or screen.get_height()
         self.offset_y = 0
-        self.scroll_y = 0
         self.is_open = False
-        self.scroll_speed = 20
-        self.font = pygame.font.SysFont("Arial", max(16, self.width // 30))
-        self.log_path = "config/notifications_log.txt"
-        self.notify_path = "config/notify.txt"
-        self.notifications = []
+        self.font = fonts.get_font(max(16, self.width // 30))
+        self.records = []  # journal records, oldest first
+        self.last_id = 0  # newest record seen, shown or not
+        self.refreshed_at = 0  # ticks of the last journal check while open
+        self.rows = {}  # record id -> rendered row
+        self.journal = get_journal()
+        self.reader = JournalReader(self.journal)
 
-        self.close_button_rect = None
+        # Views from the notification store: ("app", name) or ("search", text); None shows everything
+        self.store = get_store()
+        self.filter = None
+        self.view = None  # store rows matching the filter, oldest first
+        self.query_token = 0  # answers to older queries are ignored
+        self.apps = []  # apps with notifications, most recent first
+        self.chips = []  # (label, filter, rect) along the top of the panel
+        self.chip_font = fonts.get_font(max(12, self.width // 40))
+        self.keyboard = KeyboardOverlay()  # search entry, drawn over the panel
+        self.filter_before_search = None  # restored if the search is dismissed
+        self.keyboard_press = False  # a press the keyboard saw; its gestures are not ours
+        self.search_text = None  # opens the keyboard with this on the next update()
+
+        panel_height = min(self.height * 0.8, self.height - 40)
+        self.panel_rect = pygame.Rect(30, 30, self.width - 60, panel_height)
+        self.close_button_rect = pygame.Rect(self.panel_rect.right - 40, self.panel_rect.top + 10, 25, 25)
+        visible_area = pygame.Rect(self.panel_rect.left + 20, self.panel_rect.top + 50, self.panel_rect.width - 40, self.panel_rect.height - 70)
+        self.list = ScrollList(visible_area, ROW_HEIGHT, self.render_row, spacing=10)
+        self.panel = self.render_panel()
+        self.empty_text = self.font.render("No notifications", True, (180, 180, 180))
         self.load_notifications()
+        self.layout_chips()
 
     def load_notifications(self):
-        """Load notifications from log, filtering out app launch and system lines."""
-        if os.path.exists(self.log_path):
-            with open(self.log_path, "r") as f:
-                lines = [line.strip() for line in f if line.strip()]
-            self.notifications = [
-                l for l in lines
-                if "Launching" not in l and "Notification Log Cleared" not in l
-            ]
-        else:
-            self.notifications = []
+        """Picks up journal records added since the last call, leaving out
+        app launches. Records the journal has dropped are dropped here too.
+        Records still waiting for the writer are included, so a notification
+        pushed just now is there; they are skipped when read back later.
+        Returns True if the records changed."""
+        new = []
+        for record in sorted(self.reader.read_new() + self.journal.pending(), key=lambda r: r["id"]):
+            if record["id"] > self.last_id:
+                self.last_id = record["id"]
+                if record.get("category") not in HIDDEN_CATEGORIES:
+                    new.append(record)
+        first_id = self.journal.first_id()
+        expired = 0
+        while expired < len(self.records) and self.records[expired]["id"] < first_id:
+            expired += 1
+        if not new and not expired:
+            return False
+        del self.records[:expired]
+        self.records.extend(new)
+        # The rows on top when the panel opens are ready before it does
+        for record in self.records[-(self.list.rect.height // ROW_HEIGHT + 1):]:
+            self.row_for(record)
+        if self.view is None:
+            self.list.reset(len(self.records))  # newest first, so every row moved
+        return True
+
+    def refresh(self):
+        """Shows records that arrived while the panel is open"""
+        self.refreshed_at = pygame.time.get_ticks()
+        if not self.load_notifications():
+            return
+        if self.records:
+            self.store.mark_read(self.records[-1]["id"])
+        self.store.query_groups(self.on_groups)
+        if self.filter is not None:
+            self.set_filter(self.filter)  # their store adds were queued before this query
 
     def open(self):
         self.is_open = True
+        self.refreshed_at = pygame.time.get_ticks()
         self.load_notifications()
+        if self.records:
+            self.store.mark_read(self.records[-1]["id"])
+        self.store.query_groups(self.on_groups)
+        self.set_filter(self.filter)  # refresh a filtered view
+
+    # ------------------------
+    # FILTERS
+    # ------------------------
+    def shown(self):
+        return self.records if self.view is None else self.view
+
+    def set_filter(self, view_filter):
+        self.filter = view_filter
+        self.query_token += 1
+        if view_filter is None:
+            self.view = None
+            self.list.reset(len(self.records))
+        else:
+            token = self.query_token
+            kind, value = view_filter
+            self.store.query(lambda rows: self.on_results(token, rows), exclude=tuple(HIDDEN_CATEGORIES), limit=1000,
+                             **{"app" if kind == "app" else "search": value})
+        self.layout_chips()
+
+    def on_results(self, token, rows):
+        if token == self.query_token and self.filter is not None:
+            self.view = rows[::-1]
+            self.list.reset(len(self.view))
+            self.list.scroll_to(0)
+
+    def on_groups(self, groups):
+        apps = []
+        for group in groups:
+            if group["category"] not in HIDDEN_CATEGORIES and group["app"] not in apps:
+                apps.append(group["app"])
+        self.apps = apps
+        self.layout_chips()
+
+    def layout_chips(self):
+        """All, one chip per app while they fit, then Search"""
+        search = self.filter[1] if self.filter and self.filter[0] == "search" else None
+        entries = [("All", None)] + [(app, ("app", app)) for app in self.apps]
+        last = (f'"{search}"' if search else "Search", ("search", search))
+        self.chips = []  # (label, filter, rect, rendered label)
+        x, y = self.panel_rect.left + 20, self.panel_rect.top + 12
+        right = self.close_button_rect.left - 10
+        last_w = self.chip_font.size(last[0])[0] + 16
+        for label, chip_filter in entries:
+            w = self.chip_font.size(label)[0] + 16
+            if x + w > right - last_w - 6:
+                break
+            self.chips.append((label, chip_filter, pygame.Rect(x, y, w, 22), self.chip_font.render(label, True, (255, 255, 255))))
+            x += w + 6
+        self.chips.append((*last, pygame.Rect(x, y, last_w, 22), self.chip_font.render(last[0], True, (255, 255, 255))))
+
+    def tap_chip(self, chip_filter):
+        if chip_filter and chip_filter[0] == "search":
+            self.filter_before_search = self.filter
+            self.search_text = chip_filter[1] or ""  # after this frame's events, which are not for it
+        else:
+            self.set_filter(chip_filter)
+
+    def search(self, text):
+        self.set_filter(("search", text.strip()) if text.strip() else None)
 
     def close(self):
+        self.keyboard.close()
         self.is_open = False
-        self.scroll_y = 0
+        self.list.scroll_to(0)
 
-    def handle_event(self, event):
-        if not self.is_open:
-            return
+    # ------------------------
+    # RENDERING
+    # ------------------------
+    def row_for(self, record):
+        """The record's row, rendered the first time it is asked for"""
+        row = self.rows.get(record["id"])
+        if row is None:
+            row = pygame.Surface((self.list.rect.width, ROW_HEIGHT))
+            row.fill(KEY)
+            row.set_colorkey(KEY, pygame.RLEACCEL)
+            pygame.draw.rect(row, (60, 60, 60), row.get_rect(), border_radius=6)
+            row.blit(self.font.render(record["text"], True, (255, 255, 255)), (10, 5))
+            self.rows[record["id"]] = row
+            if len(self.rows) > ROW_CACHE:
+                del self.rows[next(iter(self.rows))]  # the longest kept
+        return row
 
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            if event.button == 4:
-                self.scroll_y = min(self.scroll_y + self.scroll_speed, 0)
-            elif event.button == 5:
-                max_scroll = min(0, self.height - self.get_content_height() - 40)
-                self.scroll_y = max(self.scroll_y - self.scroll_speed, max_scroll)
-            else:
-                if self.close_button_rect and self.close_button_rect.collidepoint(event.pos):
-                    self.close()
-                    return
+    def render_row(self, index, width, height):
+        """Newest first"""
+        return self.row_for(self.shown()[-1 - index])
 
-                panel_rect = pygame.Rect(30, 30, self.width - 60, min(self.height * 0.8, self.height - 40))
-                if not panel_rect.collidepoint(event.pos):
-                    self.close()
+    def render_panel(self):
+        """Panel background, border and close button, drawn once"""
+        panel = pygame.Surface(self.panel_rect.size)
+        panel.fill(KEY)
+        panel.set_colorkey(KEY, pygame.RLEACCEL)
+        pygame.draw.rect(panel, (30, 30, 30), panel.get_rect(), border_radius=12)
+        pygame.draw.rect(panel, (200, 200, 200), panel.get_rect(), 2, border_radius=12)
+        close_rect = self.close_button_rect.move(-self.panel_rect.x, -self.panel_rect.y)
+        pygame.draw.rect(panel, (80, 80, 80), close_rect, border_radius=4)
+        panel.blit(self.font.render("X", True, (255, 255, 255)), (close_rect.x + 6, close_rect.y))
+        return panel
 
-        elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+    def handle_gesture(self, g):
+        """While open every gesture is ours: drag or wheel scrolls, a tap on a
+        chip changes the view, a tap on X or outside the panel closes"""
+        if not self.is_open:
+            return False
+        if self.keyboard.visible or self.keyboard_press:
+            # The keyboard takes the raw events in update(); a press ends with its "up"
+            self.keyboard_press = g.kind != "up"
+            return True
+
+        if self.list.handle_gesture(g):
+            return True
+        if g.kind == "tap":
+            chip = next((chip for chip in self.chips if chip[2].collidepoint(g.pos)), None)
+            if chip:
+                self.tap_chip(chip[1])
+            elif self.close_button_rect.collidepoint(g.pos) or not self.panel_rect.collidepoint(g.pos):
+                self.close()
+        return True
+
+    def handle_event(self, event):
+        if self.keyboard.handle_event(event):
+            return
+        if event.type == TEXT_EDIT_EVENT and self.is_open:
+            self.search(event.text)  # results follow the typing
+        elif event.type == TEXT_DONE_EVENT and self.is_open:
+            if event.submitted:
+                self.search(event.text)
+            else:
+                self.set_filter(self.filter_before_search)
+        elif self.is_open and event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
             self.close()
 
     def update(self, events=None):
         if events:
             for e in events:
                 self.handle_event(e)
-
-        if os.path.exists(self.notify_path):
-            with open(self.notify_path, "r") as f:
-                message = f.read().strip()
-            if message:
-                self.notifications.append(message)
-                with open(self.log_path, "a") as log:
-                    log.write(message + "\n")
-                open(self.notify_path, "w").close()
-
-    def get_content_height(self):
-        return 20 + len(self.notifications) * 40
+        if self.search_text is not None:
+            self.keyboard.open(self.search_text)
+            self.search_text = None
+        self.store.poll()
+        if self.is_open:
+            if pygame.time.get_ticks() - self.refreshed_at >= REFRESH_MS:
+                self.refresh()
+            self.list.update()
 
     def draw(self):
         if not self.is_open:
             return
 
         # 1️⃣ Draw dim background first
-        overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 120))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(dim_layer((self.width, self.height), 120), (0, 0))
 
-        # 2️⃣ Draw the main panel
-        panel_height = min(self.height * 0.8, self.height - 40)
-        panel_rect = pygame.Rect(30, 30, self.width - 60, panel_height)
-        pygame.draw.rect(self.screen, (30, 30, 30), panel_rect, border_radius=12)
-        pygame.draw.rect(self.screen, (200, 200, 200), panel_rect, 2, border_radius=12)
-
-        # 3️⃣ Draw close button
-        self.close_button_rect = pygame.Rect(panel_rect.right - 40, panel_rect.top + 10, 25, 25)
-        pygame.draw.rect(self.screen, (80, 80, 80), self.close_button_rect, border_radius=4)
-        x_text = self.font.render("X", True, (255, 255, 255))
-        self.screen.blit(x_text, (self.close_button_rect.x + 6, self.close_button_rect.y))
-
-        # 4️⃣ Draw notifications
-        y = panel_rect.top + 50 + self.scroll_y
-        visible_area = pygame.Rect(panel_rect.left + 20, panel_rect.top + 50, panel_rect.width - 40, panel_rect.height - 70)
-
-        if not self.notifications:
-            no_notif = self.font.render("No notifications", True, (180, 180, 180))
-            self.screen.blit(no_notif, (visible_area.x + 10, visible_area.y + 10))
-            return
+        # 2️⃣ Draw the main panel with its close button
+        self.screen.blit(self.panel, self.panel_rect)
+
+        # 3️⃣ Draw filter chips
+        for label, chip_filter, rect, text in self.chips:
+            selected = chip_filter == self.filter or (chip_filter and self.filter and chip_filter[0] == self.filter[0] == "search")
+            pygame.draw.rect(self.screen, (70, 130, 180) if selected else (60, 60, 60), rect, border_radius=11)
+            self.screen.blit(text, text.get_rect(center=rect.center))
+
+        # 4️⃣ Draw notifications (only the rows in view)
+        if self.shown():
+            self.list.draw(self.screen)
+        else:
+            self.screen.blit(self.empty_text, (self.list.rect.x + 10, self.list.rect.y + 10))
 
-        for text in reversed(self.notifications[-50:]):  # last 50 only
-            bg_rect = pygame.Rect(panel_rect.left + 20, y, panel_rect.width - 40, 30)
-            if bg_rect.bottom > visible_area.bottom or bg_rect.top < visible_area.top:
-                y += 40
-                continue  # skip drawing if outside visible area
-            pygame.draw.rect(self.screen, (60, 60, 60), bg_rect, border_radius=6)
-            text_surface = self.font.render(text, True, (255, 255, 255))
-            self.screen.blit(text_surface, (bg_rect.x + 10, bg_rect.y + 5))
-            y += 40
+        # 5️⃣ Search keyboard on top, also while nothing matches
+        self.keyboard.draw(self.screen)
@@ -0,0 +1,283 @@
+import os
+import json
+import time
+import queue
+import atexit
+import threading
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# One JSON record per line, in numbered segment files: 00000001.jsonl, 00000002.jsonl...
+JOURNAL_DIR = os.path.join(ROOT_DIR, "config", "notifications")
+# The plain-text log used before the journal; imported once, then removed
+LEGACY_LOG_PATH = os.path.join(ROOT_DIR, "config", "notifications_log.txt")
+
+SEGMENT_BYTES = 64 * 1024  # a segment is closed once it reaches this size
+MAX_SEGMENTS = 16  # older segments are deleted whole (about 1 MB of history)
+FLUSH_MS = 250  # how long the writer gathers records before writing them out
+
+# Every record has a category, set when it is written, so readers filter without looking at the text
+DEFAULT_CATEGORY = "general"
+DEFAULT_APP = "system"  # the source of notifications raised by the shell itself
+LAUNCH_CATEGORY = "launch"  # "Launching <app>..." banners, not kept in the notification center
+
+
+class NotificationJournal:
+    """Notification history that survives reboots.
+
+    append() gives the record an id and hands it to a writer thread, which
+    writes whatever has piled up in one go. Records go to the newest segment
+    until it is full, then a new one is started; past MAX_SEGMENTS the
+    oldest file is deleted, so nothing is ever read back or rewritten to
+    trim the history. index.json lists the segments with the id and time of
+    their first record, and is only written when a segment is added or
+    dropped. Logging costs the same however long the history is.
+
+    Only the shell writes; anyone can read the segment files."""
+    def __init__(self, path=JOURNAL_DIR, segment_bytes=SEGMENT_BYTES, max_segments=MAX_SEGMENTS):
+        self.path = path
+        self.index_path = os.path.join(path, "index.json")
+        self.segment_bytes = segment_bytes
+        self.max_segments = max_segments
+        self.lock = threading.Lock()
+        self.queue = queue.Queue()
+        self.unwritten = []  # appended records the writer has not written yet
+        self.thread = None
+
+        os.makedirs(path, exist_ok=True)
+        self.index = self.load_index()  # [{"segment", "first_id", "first_time"}], oldest first
+        self.active_bytes = 0
+        self.next_id = 1
+        if self.index:
+            last = self.index[-1]
+            active = self.segment_path(last["segment"])
+            self.active_bytes = os.path.getsize(active) if os.path.exists(active) else 0
+            records = list(self.read_segment(last["segment"]))
+            self.next_id = records[-1]["id"] + 1 if records else last["first_id"]
+        self.import_legacy_log()
+
+    # ------------------------
+    # INDEX
+    # ------------------------
+    def segment_path(self, segment):
+        return os.path.join(self.path, f"{segment:08d}.jsonl")
+
+    def load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            return [entry for entry in index if os.path.exists(self.segment_path(entry["segment"]))]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        # Missing or damaged: rebuild it from the segment files
+        index = []
+        for name in sorted(os.listdir(self.path)):
+            if name.endswith(".jsonl") and name[:-6].isdigit():
+                first = next(self.read_segment(int(name[:-6])), None)
+                if first:
+                    index.append({"segment": int(name[:-6]), "first_id": first["id"], "first_time": first["time"]})
+        return index
+
+    def save_index(self):
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.index, f)
+        os.replace(tmp, self.index_path)
+
+    def segments(self):
+        """Segment numbers, oldest first"""
+        with self.lock:
+            return [entry["segment"] for entry in self.index]
+
+    # ------------------------
+    # WRITING
+    # ------------------------
+    def append(self, text, category=DEFAULT_CATEGORY, app=DEFAULT_APP, **fields):
+        """Queues a record for writing and returns it"""
+        with self.lock:
+            record = {"id": self.next_id, "time": round(time.time(), 3), "text": text, "category": category, "app": app}
+            record.update(fields)
+            self.next_id += 1
+            self.unwritten.append(record)
+        if self.thread is None:
+            self.start()
+        self.queue.put(record)
+        return record
+
+    def start(self):
+        self.thread = threading.Thread(target=self.writer, name="notification-journal", daemon=True)
+        self.thread.start()
+        atexit.register(self.flush)
+
+    def writer(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + FLUSH_MS / 1000
+            while True:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            try:
+                self.write_batch(batch)
+            except Exception as e:
+                print(f"❌ [Journal] Failed to write {len(batch)} notification(s): {e}")
+            written = {record["id"] for record in batch}
+            with self.lock:
+                self.unwritten = [record for record in self.unwritten if record["id"] not in written]
+            for _ in batch:
+                self.queue.task_done()
+
+    def write_batch(self, records):
+        lines = []
+        for record in records:
+            line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+            if not self.index or (self.active_bytes and self.active_bytes + len(line) > self.segment_bytes):
+                self.write_lines(lines)
+                lines = []
+                self.roll(record)
+            lines.append(line)
+            self.active_bytes += len(line)
+        self.write_lines(lines)
+
+    def write_lines(self, lines):
+        if lines:
+            with open(self.segment_path(self.index[-1]["segment"]), "ab") as f:
+                f.write(b"".join(lines))
+
+    def roll(self, first):
+        """Starts a new segment for first and drops the oldest ones past the limit"""
+        with self.lock:
+            segment = self.index[-1]["segment"] + 1 if self.index else 1
+            self.index.append({"segment": segment, "first_id": first["id"], "first_time": first["time"]})
+            dropped = self.index[:-self.max_segments]
+            del self.index[:-self.max_segments]
+            self.active_bytes = 0
+        for entry in dropped:
+            try:
+                os.remove(self.segment_path(entry["segment"]))
+            except OSError:
+                pass
+        self.save_index()
+
+    def flush(self):
+        """Blocks until everything appended so far is on disk"""
+        if self.thread is not None:
+            self.queue.join()
+
+    # ------------------------
+    # READING
+    # ------------------------
+    def read_segment(self, segment):
+        """Records in one segment. A line still being written is skipped."""
+        try:
+            with open(self.segment_path(segment), "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        except OSError:
+            return
+
+    def read_all(self):
+        """Every record still kept, oldest first"""
+        for segment in self.segments():
+            yield from self.read_segment(segment)
+
+    def pending(self):
+        """Records appended but not on disk yet (the writer's current batch)"""
+        with self.lock:
+            return list(self.unwritten)
+
+    def first_id(self):
+        """Id of the oldest record still kept (older ones were dropped)"""
+        with self.lock:
+            return self.index[0]["first_id"] if self.index else self.next_id
+
+    def import_legacy_log(self):
+        """Moves notifications_log.txt lines ("[date time] text") into the journal"""
+        if not os.path.exists(LEGACY_LOG_PATH):
+            return
+        try:
+            with open(LEGACY_LOG_PATH, "r", encoding="utf-8") as f:
+                lines = [line.strip() for line in f if line.strip() and not line.startswith("===")]
+            records = []
+            for line in lines:
+                stamp, _, text = line.partition("] ")
+                try:
+                    when = time.mktime(time.strptime(stamp, "[%Y-%m-%d %H:%M:%S"))
+                except ValueError:
+                    when, text = time.time(), line
+                category = LAUNCH_CATEGORY if text.startswith("Launching") else DEFAULT_CATEGORY
+                records.append({"id": self.next_id + len(records), "time": when, "text": text,
+                                "category": category, "app": DEFAULT_APP})
+            self.next_id += len(records)
+            self.write_batch(records)
+            os.remove(LEGACY_LOG_PATH)
+            if records:
+                print(f"📦 [Journal] Imported {len(records)} notification(s) from {LEGACY_LOG_PATH}")
+        except Exception as e:
+            print(f"⚠️ [Journal] Failed to import {LEGACY_LOG_PATH}: {e}")
+
+
+class JournalReader:
+    """Follows the journal: each read_new() returns only the records written
+    since the previous call. It remembers the segment and byte offset it
+    stopped at, so a read costs what was added, not the whole history. A
+    record still being written is left for the next call."""
+    def __init__(self, journal):
+        self.journal = journal
+        self.segment = None
+        self.offset = 0
+
+    def read_new(self):
+        records = []
+        segments = self.journal.segments()
+        if not segments:
+            return records
+        if self.segment not in segments:
+            # First read, or retention dropped the segment we were in (always the oldest)
+            self.segment, self.offset = segments[0], 0
+
+        while True:
+            try:
+                with open(self.journal.segment_path(self.segment), "rb") as f:
+                    f.seek(self.offset)
+                    data = f.read()
+            except OSError:
+                data = b""
+            end = data.rfind(b"\n") + 1
+            for line in data[:end].splitlines():
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+            self.offset += end
+
+            later = [s for s in segments if s > self.segment]
+            if not later:
+                return records
+            self.segment, self.offset = later[0], 0
+
+
+_journal = None
+
+
+def get_journal():
+    """The process-wide journal"""
+    global _journal
+    if _journal is None:
+        _journal = NotificationJournal()
+    return _journal
+
+
+def flush_journal():
+    """Writes out the process-wide journal's pending records, if it was ever
+    opened. atexit does not run across os.execv, so call this before one."""
+    if _journal is not None:
+        _journal.flush()
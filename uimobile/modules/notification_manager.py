@@ -3,6 +3,14 @@ import time
 import os
 import subprocess
 import sys
+from modules.assets import get_loader
+from modules import fonts
+from modules.notification_journal import get_journal, DEFAULT_CATEGORY, DEFAULT_APP
+from modules.notification_store import get_store
+from modules.app_host import subprocess_env
+from modules.tween import get_animator, ease_out_quad, ease_in_quad
+
+FADE_MS = 400  # banners, dialogues and messages fade in (and banners out) over this
 
 class Notification:
     def __init__(self, text, duration=3):
@@ -10,7 +18,6 @@ class Notification:
         self.start_time = time.time()
         self.duration = duration
         self.alpha = 0
-        self.state = "fade_in"
 
 
 class Dialogue:
@@ -18,14 +25,12 @@ class Dialogue:
         self.text = text
         self.action = action
         self.alpha = 0
-        self.state = "fade_in"
 
 
 class Message:
     def __init__(self, text):
         self.text = text
         self.alpha = 0
-        self.state = "fade_in"
 
 
 class Button:
@@ -60,8 +65,8 @@ class NotificationManager:
         self.dialogue_queue = []
         self.active_dialogue = None
         self.active_message = None
-        self.font = font or pygame.font.Font(None, 22)
-        self.fade_speed = 10
+        self.font = font or fonts.get_font(22, family=None)
+        self.animator = get_animator()
         self.padding = 10
         self.max_notifications = 4
         self.buttons = []
@@ -70,65 +75,29 @@ class NotificationManager:
         # Initialize sound
         print("🔧 Initializing NotificationManager...")
         if os.path.exists(sound_path):
-            try:
-                pygame.mixer.init()
-                self.sound_effect = pygame.mixer.Sound(sound_path)
-                print(f"🔊 Sound loaded: {sound_path}")
-            except Exception as e:
-                print(f"❌ Failed to load sound: {e}")
+            # Mixer start-up and decoding happen on a loader thread;
+            # play() is a no-op until the sound is ready
+            self.sound_effect = get_loader().sound(sound_path)
         else:
             print(f"⚠️ Sound file not found: {sound_path}")
 
-        # ✅ Initialize log file path
-        self.log_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "notifications_log.txt")
-        os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
-        if not os.path.exists(self.log_file):
-            with open(self.log_file, "w") as f:
-                f.write("=== Notification Log ===\n")
-
-        # Set trim limits
-        self.max_log_size = 1024 * 1024  # 1 MB
-        self.max_log_lines = 200  # keep last 200 lines
+        # ✅ Notification history (kept across reboots) and its queryable copy
+        self.journal = get_journal()
+        self.store = get_store()
+        self.store.sync(self.journal)
 
     # ------------------------
     # LOGGING
     # ------------------------
-    def log_notification(self, text):
-        """Logs non-dialogue, non-message notifications to config/notifications_log.txt"""
-        timestamp = time.strftime("[%Y-%m-%d %H:%M:%S]", time.localtime())
-        try:
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(f"{timestamp} {text}\n")
-            print(f"📝 Logged notification: {text}")
-
-            # Check file size and trim if necessary
-            if os.path.getsize(self.log_file) > self.max_log_size:
-                print("⚠️ Log file too large, trimming...")
-                self.trim_log_file()
-        except Exception as e:
-            print(f"❌ Failed to log notification: {e}")
-
-    def trim_log_file(self):
-        """Keeps only the last N lines when log exceeds size limit"""
-        try:
-            with open(self.log_file, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-
-            # Keep header + last N lines
-            header = [lines[0]] if lines and lines[0].startswith("===") else []
-            lines_to_keep = header + lines[-self.max_log_lines:]
-
-            with open(self.log_file, "w", encoding="utf-8") as f:
-                f.writelines(lines_to_keep)
-
-            print(f"✂️ Trimmed log file to last {len(lines_to_keep)} lines.")
-        except Exception as e:
-            print(f"❌ Failed to trim log file: {e}")
+    def log_notification(self, text, category=DEFAULT_CATEGORY, app=DEFAULT_APP):
+        """Records non-dialogue, non-message notifications in the journal and the store"""
+        self.store.add(self.journal.append(text, category, app))
+        print(f"📝 Logged notification: {text}")
 
     # ------------------------
     # PUSH: Handles new inputs
     # ------------------------
-    def push(self, text, duration=3):
+    def push(self, text, duration=3, category=DEFAULT_CATEGORY, app=DEFAULT_APP):
         print(f"📨 Push called with text: {text}")
 
         # Dialogue mode
@@ -157,6 +126,7 @@ class NotificationManager:
             try:
                 message_text = text.split('message="')[1].split('"')[0]
                 self.active_message = Message(message_text)
+                self.animator.animate(self.active_message, "alpha", 255, FADE_MS, ease=ease_out_quad)
                 self.create_message_button()
                 if self.sound_effect:
                     self.sound_effect.play()
@@ -169,11 +139,23 @@ class NotificationManager:
         if self.sound_effect:
             self.sound_effect.play()
         self.notifications.append(notif)
+        self.show_banner(notif)
         if len(self.notifications) > self.max_notifications:
-            self.notifications.pop(0)
+            self.animator.cancel(self.notifications.pop(0))
 
         # ✅ Log this notification
-        self.log_notification(text)
+        self.log_notification(text, category, app)
+
+    def show_banner(self, notif):
+        """Fades in, stays for its duration, then fades out and goes"""
+        def fade_out():
+            self.animator.animate(notif, "alpha", 0, FADE_MS, ease=ease_in_quad, delay_ms=notif.duration * 1000,
+                                  on_done=lambda: self.remove_banner(notif))
+        self.animator.animate(notif, "alpha", 255, FADE_MS, ease=ease_out_quad, on_done=fade_out)
+
+    def remove_banner(self, notif):
+        if notif in self.notifications:
+            self.notifications.remove(notif)
 
     # ------------------------
     # DIALOGUE HANDLING
@@ -183,6 +165,7 @@ class NotificationManager:
         if self.dialogue_queue:
             self.active_dialogue = self.dialogue_queue.pop(0)
             print(f"🗨️ Active dialogue: {self.active_dialogue.text}")
+            self.animator.animate(self.active_dialogue, "alpha", 255, FADE_MS, ease=ease_out_quad)
             self.create_dialogue_buttons()
         else:
             print("✅ No more dialogues.")
@@ -203,7 +186,7 @@ class NotificationManager:
                 try:
                     script_path = os.path.abspath(self.active_dialogue.action)
                     print(f"🚀 Launching script: {script_path}")
-                    subprocess.Popen([sys.executable, script_path])
+                    subprocess.Popen([sys.executable, script_path], env=subprocess_env())
                 except Exception as e:
                     print(f"❌ Failed to run script: {e}")
             else:
@@ -245,25 +228,10 @@ class NotificationManager:
     # UPDATE
     # ------------------------
     def update(self):
-        now = time.time()
-
+        """Fades run on the animator; this starts queued dialogues"""
         if not self.active_dialogue and self.dialogue_queue:
             self.next_dialogue()
 
-        for notif in list(self.notifications):
-            elapsed = now - notif.start_time
-            if notif.state == "fade_in":
-                notif.alpha += self.fade_speed
-                if notif.alpha >= 255:
-                    notif.alpha = 255
-                    notif.state = "visible"
-            elif notif.state == "visible" and elapsed > notif.duration:
-                notif.state = "fade_out"
-            elif notif.state == "fade_out":
-                notif.alpha -= self.fade_speed
-                if notif.alpha <= 0:
-                    self.notifications.remove(notif)
-
         # Clear buttons when nothing active
         if not self.active_dialogue and not self.active_message:
             self.buttons.clear()
@@ -279,6 +247,21 @@ class NotificationManager:
         else:
             self.draw_notifications(screen)
 
+    def banner_rects(self):
+        """Screen rects the banner notifications occupy, in draw order"""
+        rects = []
+        y_offset = self.padding
+        for notif in self.notifications:
+            text_width, text_height = self.font.size(notif.text)
+            bg_width = text_width + 20
+            bg_height = text_height + 10
+            rects.append(pygame.Rect(self.screen_width - bg_width - 20, y_offset, bg_width, bg_height))
+            y_offset += bg_height + self.padding
+        return rects
+
+    def is_modal(self):
+        return bool(self.active_dialogue or self.active_message)
+
     def draw_notifications(self, screen):
         y_offset = self.padding
         for notif in self.notifications:
@@ -322,7 +305,6 @@ class NotificationManager:
         overlay.fill((0, 0, 0, 100))
         screen.blit(overlay, (0, 0))
 
-        dialogue.alpha = min(255, dialogue.alpha + self.fade_speed)
         width = 400
         margin_bottom = 100
         line_height = self.font.get_height() + 5
@@ -361,7 +343,6 @@ class NotificationManager:
         overlay.fill((0, 0, 0, 100))
         screen.blit(overlay, (0, 0))
 
-        message.alpha = min(255, message.alpha + self.fade_speed)
         width = 400
         margin_bottom = 100
         line_height = self.font.get_height() + 5
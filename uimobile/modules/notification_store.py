@@ -0,0 +1,250 @@
+import os
+import queue
+import sqlite3
+import threading
+import pygame
+from contextlib import closing
+from modules.notification_journal import DEFAULT_APP, DEFAULT_CATEGORY
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_PATH = os.path.join(ROOT_DIR, "config", "notifications.db")
+MAX_ROWS = 10000  # older notifications are deleted as new ones arrive
+
+# Posted (without payload) when a query finishes, so sleeping loops wake up and call poll()
+STORE_EVENT = pygame.event.custom_type()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notifications (
+    id INTEGER PRIMARY KEY,  -- the journal record id
+    time REAL NOT NULL,
+    app TEXT NOT NULL,
+    category TEXT NOT NULL,
+    text TEXT NOT NULL,
+    read INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS notifications_app ON notifications(app, time);
+CREATE INDEX IF NOT EXISTS notifications_category ON notifications(category, time);
+CREATE INDEX IF NOT EXISTS notifications_time ON notifications(time);
+CREATE INDEX IF NOT EXISTS notifications_unread ON notifications(read, id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS notifications_fts
+    USING fts5(text, content='notifications', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS notifications_added AFTER INSERT ON notifications BEGIN
+    INSERT INTO notifications_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS notifications_removed AFTER DELETE ON notifications BEGIN
+    INSERT INTO notifications_fts(notifications_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+
+def match_query(search):
+    """FTS5 query matching every word of search as a prefix, with no operators"""
+    words = search.split()
+    return " ".join('"' + word.replace('"', '""') + '"*' for word in words)
+
+
+def select(db, app=None, category=None, since=None, until=None, search=None, unread=None, exclude=(), limit=100):
+    """Notifications matching every given filter, newest first, as dicts.
+    exclude lists categories to leave out."""
+    if search and search.strip():
+        sql = "SELECT n.* FROM notifications_fts JOIN notifications n ON n.id = notifications_fts.rowid WHERE notifications_fts MATCH ?"
+        args = [match_query(search)]
+    else:
+        sql = "SELECT n.* FROM notifications n WHERE 1"
+        args = []
+    for column, op, value in (("app", "=", app), ("category", "=", category),
+                              ("time", ">=", since), ("time", "<", until)):
+        if value is not None:
+            sql += f" AND n.{column} {op} ?"
+            args.append(value)
+    if unread is not None:
+        sql += " AND n.read = ?"
+        args.append(0 if unread else 1)
+    if exclude:
+        sql += f" AND n.category NOT IN ({', '.join('?' * len(exclude))})"
+        args.extend(exclude)
+    sql += " ORDER BY n.id DESC LIMIT ?"
+    args.append(limit)
+    return [dict(row) for row in db.execute(sql, args)]
+
+
+def groups(db):
+    """(app, category) groups with their size, unread count and latest time, most recent first"""
+    rows = db.execute("SELECT app, category, COUNT(*) AS count, SUM(read = 0) AS unread, MAX(time) AS latest "
+                      "FROM notifications GROUP BY app, category ORDER BY latest DESC")
+    return [dict(row) for row in rows]
+
+
+class NotificationStore:
+    """Queryable notification history in SQLite (WAL mode), with per-app,
+    per-category, time and full-text (FTS5) lookups.
+
+    The shell owns the writable store: every journal record is added to it,
+    and on start it catches up with anything the journal has that it lacks.
+    All database work happens on one worker thread. Queries take a callback
+    and return at once; poll() runs the callbacks of finished queries on the
+    calling (main) thread, so the render loop never waits on the disk.
+
+    Apps can open it read-only and call fetch() for their own history:
+    NotificationStore(readonly=True).fetch(app="Kit")."""
+    def __init__(self, path=DB_PATH, readonly=False):
+        self.path = path
+        self.readonly = readonly
+        self.jobs = queue.Queue()
+        self.done = queue.Queue()
+        self.thread = None
+
+    def connect(self):
+        if self.readonly:
+            db = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        else:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            db = sqlite3.connect(self.path)
+            db.execute("PRAGMA journal_mode=WAL")  # readers (other processes too) never wait on the writer
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(SCHEMA)
+        db.row_factory = sqlite3.Row
+        return db
+
+    # ------------------------
+    # WORKER
+    # ------------------------
+    def submit(self, kind, payload=None, callback=None):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.worker, name="notification-store", daemon=True)
+            self.thread.start()
+        self.jobs.put((kind, payload, callback))
+
+    def worker(self):
+        try:
+            db = self.connect()
+        except sqlite3.Error as e:
+            print(f"❌ [Store] Cannot open {self.path}: {e}")
+            db = None  # jobs still get answered, with nothing
+        job = None
+        while True:
+            kind, payload, callback = job or self.jobs.get()
+            job = None
+            result = []
+            try:
+                if db is None:
+                    raise sqlite3.Error("no database")
+                if kind == "add":
+                    records = [payload]
+                    # Whatever else is waiting to be added goes in the same transaction
+                    while True:
+                        try:
+                            job = self.jobs.get_nowait()
+                        except queue.Empty:
+                            break
+                        if job[0] != "add":
+                            break  # runs next
+                        records.append(job[1])
+                        job = None
+                    self.insert(db, records)
+                elif kind == "catch_up":
+                    self.catch_up(db, payload)
+                elif kind == "mark_read":
+                    with db:
+                        db.execute("UPDATE notifications SET read = 1 WHERE read = 0 AND id <= ?", (payload,))
+                else:
+                    result = payload(db)
+            except Exception as e:  # one bad job must not stop the worker
+                print(f"❌ [Store] {kind} failed: {e}")
+            if callback:
+                # Failed queries answer [] so nobody waits for them forever
+                self.done.put((callback, result))
+                try:
+                    pygame.event.post(pygame.event.Event(STORE_EVENT))
+                except pygame.error:
+                    pass  # no display; picked up by the next poll()
+
+    def insert(self, db, records):
+        with db:
+            db.executemany(
+                "INSERT OR IGNORE INTO notifications (id, time, app, category, text) VALUES (?, ?, ?, ?, ?)",
+                [(r["id"], r["time"], r.get("app", DEFAULT_APP), r.get("category", DEFAULT_CATEGORY), r["text"])
+                 for r in records])
+            db.execute("DELETE FROM notifications WHERE id <= ?", (records[-1]["id"] - MAX_ROWS,))
+
+    def catch_up(self, db, journal):
+        records = list(journal.read_all())
+        if self.journal_was_reset(db, records):
+            # Ids started over; keeping the old rows would hide the new ones behind them
+            with db:
+                db.execute("DELETE FROM notifications")
+            print("⚠️ [Store] The journal was reset; rebuilding from it")
+        newest = db.execute("SELECT MAX(id) FROM notifications").fetchone()[0] or 0
+        missing = [record for record in records if record["id"] > newest]
+        if missing:
+            self.insert(db, missing)
+            print(f"[Store] Added {len(missing)} notification(s) from the journal")
+
+    def journal_was_reset(self, db, records):
+        """True when the database holds rows the journal never wrote: ids
+        past the journal's newest, or a kept id with a different time"""
+        newest = db.execute("SELECT MAX(id) FROM notifications").fetchone()[0]
+        if newest is None:
+            return False
+        if not records or newest > records[-1]["id"]:
+            return True
+        for record in (records[0], records[-1]):
+            row = db.execute("SELECT time FROM notifications WHERE id = ?", (record["id"],)).fetchone()
+            if row and abs(row["time"] - record["time"]) > 0.001:
+                return True
+        return False
+
+    # ------------------------
+    # SHELL SIDE
+    # ------------------------
+    def add(self, record):
+        """Stores a journal record (in the background)"""
+        self.submit("add", record)
+
+    def sync(self, journal):
+        """Adds journal records the database does not have yet (in the background)"""
+        self.submit("catch_up", journal)
+
+    def mark_read(self, up_to_id):
+        self.submit("mark_read", up_to_id)
+
+    def query(self, callback, **filters):
+        """Runs select() in the background; callback(rows) runs in poll()"""
+        self.submit("query", lambda db: select(db, **filters), callback)
+
+    def query_groups(self, callback):
+        self.submit("query", groups, callback)
+
+    def poll(self):
+        """Delivers finished queries. Call once per frame."""
+        while True:
+            try:
+                callback, result = self.done.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                callback(result)
+            except Exception as e:
+                print(f"❌ [Store] Query callback failed: {e}")
+
+    # ------------------------
+    # APP SIDE
+    # ------------------------
+    def fetch(self, **filters):
+        """Runs select() right away on the calling thread (not from a render loop)"""
+        if self.readonly and not os.path.exists(self.path):
+            return []
+        with closing(self.connect()) as db:
+            return select(db, **filters)
+
+
+_store = None
+
+
+def get_store():
+    """The shell's writable store"""
+    global _store
+    if _store is None:
+        _store = NotificationStore()
+    return _store
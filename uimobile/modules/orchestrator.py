@@ -0,0 +1,229 @@
+import pygame
+import os
+import sys
+import time
+import threading
+import subprocess
+from modules import fonts
+from modules.notification_journal import flush_journal
+
+# Set for app processes started by the owner: their top bar then just exits
+# instead of relaunching the UI, because the owner brings it back itself
+OWNER_ENV = "OPENMOBILE_OWNER_PID"
+
+_active = None
+
+
+class HandOff(BaseException):
+    """Raised by a foreground unit to give the display to another process.
+    The orchestrator releases the display, calls start() (which returns a
+    pid or Popen), waits for that process and then restarts the unit.
+    Like SystemExit it is not an Exception, so app error handlers let it by."""
+    def __init__(self, start):
+        super().__init__("display hand-off")
+        self.start = start
+
+
+def is_managed():
+    """True when running under the boot orchestrator (single owner process)"""
+    return _active is not None
+
+
+def get_service(name):
+    """Result of a finished unit, e.g. the running NotificationBus, or None"""
+    if _active is None:
+        return None
+    unit = _active.units.get(name)
+    return unit.result if unit and unit.done.is_set() else None
+
+
+def is_owned():
+    """True in the owner process and in the app processes it started"""
+    return is_managed() or bool(os.environ.get(OWNER_ENV))
+
+
+def owner_env():
+    """Extra environment for app processes started while managed"""
+    return {OWNER_ENV: str(os.getpid())} if _active is not None else {}
+
+
+def hand_off(start):
+    raise HandOff(start)
+
+
+def restart_unit():
+    """Runs the current foreground unit again from scratch, e.g. after a
+    resolution change. Hands the display to nobody and takes it back."""
+    raise HandOff(lambda: None)
+
+
+def request_reboot():
+    """Makes the owner re-run the whole boot once the current unit exits"""
+    if _active is not None:
+        _active.reboot_requested = True
+
+
+def wait_for_exit(child):
+    """Blocks until a Popen or a pid (not necessarily our child) is gone"""
+    if isinstance(child, subprocess.Popen):
+        child.wait()
+        return
+    while True:
+        try:
+            os.kill(child, 0)
+        except ProcessLookupError:
+            return
+        except PermissionError:
+            pass
+        time.sleep(0.2)
+
+
+class Unit:
+    def __init__(self, name, start, requires=(), foreground=False, restart=False, stop=None):
+        self.name = name
+        self.start = start
+        self.requires = list(requires)
+        self.foreground = foreground  # needs the main thread (owns the display)
+        self.restart = restart  # supervise: run again after a crash
+        self.stop = stop
+        self.result = None
+        self.started = False
+        self.failed = False
+        self.done = threading.Event()
+
+
+class Orchestrator:
+    """Boot as a dependency graph inside one owner process.
+
+    Background units run on their own thread as soon as their requirements
+    are done, so independent work (notification bus, zygote, bytecode...)
+    overlaps. Foreground units (splash, lock screen, launcher) run one after
+    another on the main thread. Boot-to-launcher time is then the critical
+    path through the graph rather than the sum of every step."""
+    MAX_RESTARTS = 3
+
+    def __init__(self, timeline=None):
+        self.timeline = timeline
+        self.units = {}
+        self.order = []
+        self.lock = threading.Lock()
+        self.reboot_requested = False
+
+    def add(self, name, start, requires=(), foreground=False, restart=False, stop=None):
+        if name in self.units:
+            raise ValueError(f"Duplicate unit: {name}")
+        unit = Unit(name, start, requires, foreground, restart, stop)
+        self.units[name] = unit
+        self.order.append(unit)
+        return unit
+
+    def is_done(self, *names):
+        return all(self.units[name].done.is_set() for name in names if name in self.units)
+
+    # ------------------------
+    # GRAPH
+    # ------------------------
+    def check_graph(self):
+        """Rejects unknown requirements and cycles before anything starts"""
+        state = {}
+
+        def visit(unit, path):
+            if state.get(unit.name) == "done":
+                return
+            if state.get(unit.name) == "visiting":
+                raise ValueError(f"Dependency cycle: {' -> '.join(path + [unit.name])}")
+            state[unit.name] = "visiting"
+            for dep in unit.requires:
+                if dep not in self.units:
+                    raise ValueError(f"Unit '{unit.name}' requires unknown unit '{dep}'")
+                visit(self.units[dep], path + [unit.name])
+            state[unit.name] = "done"
+
+        for unit in self.order:
+            visit(unit, [])
+
+    def start_ready_units(self):
+        """Starts every background unit whose requirements are done"""
+        with self.lock:
+            for unit in self.order:
+                if unit.foreground or unit.started:
+                    continue
+                if self.is_done(*unit.requires):
+                    unit.started = True
+                    threading.Thread(target=self.run_background, args=(unit,),
+                                     name=f"unit-{unit.name}", daemon=True).start()
+
+    def run_background(self, unit):
+        start_ms = self.timeline.now_ms() if self.timeline else 0
+        try:
+            unit.result = unit.start()
+        except Exception as e:
+            unit.failed = True
+            print(f"⚠️ [Boot] Unit '{unit.name}' failed: {e}")
+        self.finish(unit, start_ms)
+
+    def finish(self, unit, start_ms):
+        if self.timeline:
+            self.timeline.record(unit.name, start_ms)
+        unit.done.set()
+        self.start_ready_units()
+
+    # ------------------------
+    # RUN
+    # ------------------------
+    def run(self):
+        """Runs the boot graph. Returns when the last foreground unit ends."""
+        global _active
+        self.check_graph()
+        self.argv = list(sys.argv)  # stages replace sys.argv; a reboot needs ours
+        _active = self
+        try:
+            self.start_ready_units()
+            for unit in self.order:
+                if unit.foreground:
+                    for dep in unit.requires:
+                        self.units[dep].done.wait()
+                    self.run_foreground(unit)
+        finally:
+            self.shutdown()
+
+    def run_foreground(self, unit):
+        start_ms = self.timeline.now_ms() if self.timeline else 0
+        restarts = 0
+        while True:
+            try:
+                unit.result = unit.start()
+                break
+            except HandOff as e:
+                # Release the display, let the other process use it, come back
+                pygame.quit()
+                fonts.clear()  # Font objects die with pygame.font
+                child = e.start()
+                if child:
+                    wait_for_exit(child)
+                print(f"[Boot] Display handed back, restarting '{unit.name}'")
+            except SystemExit:
+                raise  # the user or a unit asked to power off (or reboot)
+            except Exception as e:
+                if not unit.restart or restarts >= self.MAX_RESTARTS:
+                    raise
+                restarts += 1
+                print(f"⚠️ [Boot] Unit '{unit.name}' crashed ({e}), restart {restarts}/{self.MAX_RESTARTS}")
+        self.finish(unit, start_ms)
+
+    def shutdown(self):
+        global _active
+        for unit in reversed(self.order):
+            if unit.stop and unit.done.is_set() and not unit.failed:
+                try:
+                    unit.stop(unit.result)
+                except Exception as e:
+                    print(f"⚠️ [Boot] Stopping '{unit.name}' failed: {e}")
+        _active = None
+
+        if self.reboot_requested:
+            print("[Boot] Rebooting...")
+            pygame.quit()
+            flush_journal()
+            sys.stdout.flush()
+            os.execv(sys.executable, [sys.executable] + self.argv)
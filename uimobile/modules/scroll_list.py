@@ -0,0 +1,212 @@
+import math
+import pygame
+from bisect import bisect_right
+
+FRICTION_MS = 325  # time constant of a fling slowing down
+BOUNCE_MS = 60  # how quickly an overscroll springs back
+MIN_VELOCITY = 15  # px/s, a fling below this stops
+OVERSCROLL_DRAG = 0.5  # finger movement applied while pulled past an end
+
+
+class ScrollList:
+    """A vertical list that only touches the rows on screen.
+
+    Rows are rendered once by render_row(index, width, height) -> Surface
+    and kept until refresh(); drawing blits the visible ones. Finding them
+    is a division for fixed-height rows and a bisect over cumulative heights
+    when row_height is a function of the index, so a frame costs the same
+    for 20 rows or 20,000.
+
+    Dragging moves the list with the finger, releasing flings it with the
+    release velocity, and it can be pulled past either end and springs
+    back. All of it runs on elapsed time, not frames: call update() every
+    frame while is_animating() and the motion looks the same at any fps."""
+    def __init__(self, rect, row_height, render_row, count=0, spacing=0, padding=(0, 0)):
+        self.rect = pygame.Rect(rect)
+        self.row_height = row_height
+        self.render_row = render_row
+        self.spacing = spacing
+        self.padding = padding  # space above the first row and below the last
+        self.count = 0
+        self.tops = [] if callable(row_height) else None  # y of each row, variable heights only
+        self.cache = {}  # index -> rendered row
+        self.offset = 0.0  # content y at the top of rect
+        self.velocity = 0.0  # px/s, positive scrolls towards the end
+        self.tracking = False  # a press that began on the list
+        self.last_ms = None
+        self.set_count(count)
+
+    # ------------------------
+    # ROWS
+    # ------------------------
+    def height_of(self, index):
+        return self.row_height(index) if self.tops is not None else self.row_height
+
+    def set_count(self, count):
+        """Rows were added (or removed) at the end; only new rows are measured"""
+        if self.tops is not None:
+            del self.tops[count:]
+            y = self.tops[-1] + self.height_of(len(self.tops) - 1) + self.spacing if self.tops else self.padding[0]
+            for index in range(len(self.tops), count):
+                self.tops.append(y)
+                y += self.height_of(index) + self.spacing
+        for index in [i for i in self.cache if i >= count]:
+            del self.cache[index]
+        self.count = count
+
+    def reset(self, count):
+        """Every row changed"""
+        if self.tops is not None:
+            self.tops = []
+        self.cache.clear()
+        self.count = 0
+        self.set_count(count)
+        self.offset = min(self.offset, self.max_offset())
+
+    def refresh(self, index=None):
+        """Renders a row again (all rows if index is None) the next time it shows"""
+        if index is None:
+            self.cache.clear()
+        else:
+            self.cache.pop(index, None)
+
+    def top_of(self, index):
+        if self.tops is not None:
+            return self.tops[index]
+        return self.padding[0] + index * (self.row_height + self.spacing)
+
+    def content_height(self):
+        if not self.count:
+            return 0
+        last = self.count - 1
+        return self.top_of(last) + self.height_of(last) + self.padding[1]
+
+    def max_offset(self):
+        return max(0, self.content_height() - self.rect.height)
+
+    def index_at_y(self, y):
+        """Row containing content y, or the row just above it"""
+        if self.tops is not None:
+            return bisect_right(self.tops, y) - 1
+        return int((y - self.padding[0]) // (self.row_height + self.spacing))
+
+    def index_at(self, pos):
+        """Row under a screen position, or None"""
+        if not self.rect.collidepoint(pos):
+            return None
+        y = pos[1] - self.rect.y + self.offset
+        index = self.index_at_y(y)
+        if 0 <= index < self.count and y < self.top_of(index) + self.height_of(index):
+            return index
+        return None
+
+    def row_rect(self, index):
+        """Where a row is on screen now"""
+        y = self.rect.y + self.top_of(index) - round(self.offset)
+        return pygame.Rect(self.rect.x, y, self.rect.width, self.height_of(index))
+
+    def visible_range(self):
+        if not self.count:
+            return range(0)
+        first = max(0, self.index_at_y(self.offset))
+        last = min(self.count - 1, self.index_at_y(self.offset + self.rect.height))
+        return range(first, last + 1)
+
+    # ------------------------
+    # SCROLLING
+    # ------------------------
+    def scroll_to(self, offset):
+        self.offset = float(max(0, min(offset, self.max_offset())))
+        self.velocity = 0.0
+
+    def scroll_to_end(self):
+        self.scroll_to(self.max_offset())
+
+    def scroll_by(self, dy):
+        """Moves the content by dy px (positive shows earlier rows), within the ends"""
+        self.scroll_to(self.offset - dy)
+
+    def handle_gesture(self, g):
+        """Drag, fling and wheel; taps are left to the owner (see index_at)"""
+        if g.kind == "down":
+            self.tracking = self.rect.collidepoint(g.pos)
+            if self.tracking:
+                self.velocity = 0.0  # a touch catches a fling
+            return False
+        if g.kind == "scroll":
+            if not self.rect.collidepoint(g.pos):
+                return False
+            self.scroll_by(g.rel[1])
+            return True
+        if not self.tracking:
+            return False
+
+        if g.kind in ("drag", "pull"):
+            dy = g.rel[1]
+            if self.offset < 0 or self.offset > self.max_offset():
+                dy *= OVERSCROLL_DRAG
+            limit = self.rect.height / 3
+            self.offset = max(-limit, min(self.offset - dy, self.max_offset() + limit))
+            return True
+        if g.kind in ("drag_end", "pull_end"):
+            self.velocity = -g.velocity[1]
+            self.last_ms = pygame.time.get_ticks()
+            return True
+        if g.kind == "up":
+            self.tracking = False
+            self.last_ms = pygame.time.get_ticks()  # spring back from here
+        return False
+
+    def is_animating(self):
+        return self.tracking or self.velocity != 0 or self.offset < 0 or self.offset > self.max_offset()
+
+    def update(self):
+        """Advances a fling or spring-back by the time since the last call"""
+        now = pygame.time.get_ticks()
+        dt = now - self.last_ms if self.last_ms is not None else 0
+        self.last_ms = now
+        if self.tracking or dt <= 0:
+            return
+
+        if self.velocity:
+            decay = math.exp(-dt / FRICTION_MS)
+            self.offset += self.velocity * FRICTION_MS / 1000 * (1 - decay)
+            self.velocity *= decay
+            if abs(self.velocity) < MIN_VELOCITY:
+                self.velocity = 0.0
+            limit = self.rect.height / 6  # a fling overshoots less than a drag can
+            self.offset = max(-limit, min(self.offset, self.max_offset() + limit))
+
+        end = max(0, min(self.offset, self.max_offset()))
+        if self.offset != end:
+            self.velocity = 0.0  # the end absorbs what is left of a fling
+            self.offset = end + (self.offset - end) * math.exp(-dt / BOUNCE_MS)
+            if abs(self.offset - end) < 0.5:
+                self.offset = float(end)
+
+    # ------------------------
+    # DRAW
+    # ------------------------
+    def row_surface(self, index):
+        surface = self.cache.get(index)
+        if surface is None:
+            surface = self.render_row(index, self.rect.width, self.height_of(index))
+            self.cache[index] = surface
+        return surface
+
+    def draw(self, surface):
+        """Blits the visible rows, clipped to rect. Returns rect."""
+        clip = surface.get_clip()
+        surface.set_clip(self.rect.clip(clip))
+        visible = self.visible_range()
+        offset = round(self.offset)
+        for index in visible:
+            surface.blit(self.row_surface(index), (self.rect.x, self.rect.y + self.top_of(index) - offset))
+        surface.set_clip(clip)
+
+        # Rows scrolled well away are dropped; the ones either side stay for the next frames
+        if len(self.cache) > 3 * len(visible) + 8:
+            keep = range(visible.start - len(visible), visible.stop + len(visible))
+            for index in [i for i in self.cache if i not in keep]:
+                del self.cache[index]
+        return self.rect
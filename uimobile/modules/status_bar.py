@@ -0,0 +1,93 @@
+import pygame
+from datetime import datetime
+
+
+class GlyphAtlas:
+    """Renders each character once and builds strings by blitting the
+    cached glyphs, so clocks never go through full text layout per frame."""
+    def __init__(self, font, color, antialias=True):
+        self.font = font
+        self.color = color
+        self.antialias = antialias
+        self.glyphs = {}
+        self.height = font.get_height()
+
+    def glyph(self, ch):
+        surf = self.glyphs.get(ch)
+        if surf is None:
+            surf = self.font.render(ch, self.antialias, self.color).convert_alpha()
+            self.glyphs[ch] = surf
+        return surf
+
+    def size(self, text):
+        return sum(self.glyph(ch).get_width() for ch in text), self.height
+
+    def render(self, text):
+        surf = pygame.Surface(self.size(text), pygame.SRCALPHA)
+        x = 0
+        for ch in text:
+            glyph = self.glyph(ch)
+            surf.blit(glyph, (x, 0))
+            x += glyph.get_width()
+        return surf
+
+
+class ClockText:
+    """A formatted time string that is recomposed from a GlyphAtlas only
+    when the displayed text changes (once a minute for %H:%M)."""
+    def __init__(self, font, color, time_format="%H:%M"):
+        self.atlas = GlyphAtlas(font, color)
+        self.time_format = time_format
+        self.text = None
+        self.surface = None
+
+    def update(self, now=None):
+        """Returns True if the displayed text changed."""
+        text = (now or datetime.now()).strftime(self.time_format)
+        if text == self.text:
+            return False
+        self.text = text
+        self.surface = self.atlas.render(text)
+        return True
+
+    def get_rect(self, **kwargs):
+        if self.surface is None:
+            self.update()
+        return self.surface.get_rect(**kwargs)
+
+    def draw(self, surface, pos):
+        if self.surface is None:
+            self.update()
+        surface.blit(self.surface, pos)
+
+
+class StatusBar:
+    """Home screen status bar: the grey gradient is baked once per
+    resolution and only the clock changes over time."""
+    _gradients = {}  # (width, height) -> Surface
+
+    def __init__(self, width, height, font, time_format, battery_text, text_color=(0, 0, 0)):
+        self.rect = pygame.Rect(0, 0, width, height)
+        self.background = self.bake_gradient(width, height)
+        self.clock = ClockText(font, text_color, time_format)
+        self.battery = font.render(battery_text, True, text_color).convert_alpha()
+
+    @classmethod
+    def bake_gradient(cls, width, height):
+        key = (width, height)
+        if key not in cls._gradients:
+            surf = pygame.Surface(key).convert()
+            for y in range(height):
+                grey_value = 100 + int((100 * y) / height)
+                pygame.draw.line(surf, (grey_value, grey_value, grey_value), (0, y), (width, y))
+            cls._gradients[key] = surf
+        return cls._gradients[key]
+
+    def update(self):
+        """Returns True when the bar needs repainting."""
+        return self.clock.update()
+
+    def draw(self, surface):
+        surface.blit(self.background, self.rect)
+        self.clock.draw(surface, (10, 7))
+        surface.blit(self.battery, (self.rect.width - 70, 7))
@@ -0,0 +1,190 @@
+import re
+from bisect import bisect_right
+
+GAP_SIZE = 64
+# Words with their trailing spaces, long words cut every 32 characters
+RUN_PATTERN = re.compile(r"\S{1,32}\s*|\s+")
+
+
+class TextBuffer:
+    """Editable text as a gap buffer. The free space (the gap) sits at the
+    cursor, so typing and deleting there only touch the gap instead of
+    rebuilding the string. Moving the cursor moves the gap, which costs the
+    distance moved. version changes on every edit, so views can tell when to
+    redo their layout.
+
+    A selection runs from anchor to the cursor; typing replaces it."""
+    def __init__(self, text=""):
+        self.buffer = list(text) + [""] * GAP_SIZE
+        self.gap_start = len(text)
+        self.gap_end = len(self.buffer)
+        self.anchor = None
+        self.version = 0
+        self._text = text
+
+    def __len__(self):
+        return len(self.buffer) - (self.gap_end - self.gap_start)
+
+    @property
+    def cursor(self):
+        return self.gap_start
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = "".join(self.buffer[:self.gap_start]) + "".join(self.buffer[self.gap_end:])
+        return self._text
+
+    def changed(self):
+        self.version += 1
+        self._text = None
+
+    # --- Gap ---
+    def move_gap(self, index):
+        if index < self.gap_start:
+            count = self.gap_start - index
+            self.buffer[self.gap_end - count:self.gap_end] = self.buffer[index:self.gap_start]
+            self.gap_start -= count
+            self.gap_end -= count
+        elif index > self.gap_start:
+            count = index - self.gap_start
+            self.buffer[self.gap_start:self.gap_start + count] = self.buffer[self.gap_end:self.gap_end + count]
+            self.gap_start += count
+            self.gap_end += count
+
+    def grow_gap(self, needed):
+        if self.gap_end - self.gap_start >= needed:
+            return
+        size = max(needed, len(self)) + GAP_SIZE
+        self.buffer[self.gap_start:self.gap_end] = [""] * size
+        self.gap_end = self.gap_start + size
+
+    # --- Cursor & selection ---
+    def move_to(self, index, select=False):
+        index = max(0, min(len(self), index))
+        if select:
+            if self.anchor is None:
+                self.anchor = self.gap_start
+        else:
+            self.anchor = None
+        self.move_gap(index)
+
+    def move(self, delta, select=False):
+        self.move_to(self.cursor + delta, select)
+
+    def selection(self):
+        """(start, end) of the selection, or None"""
+        if self.anchor is None or self.anchor == self.cursor:
+            return None
+        return min(self.anchor, self.cursor), max(self.anchor, self.cursor)
+
+    def select_all(self):
+        self.move_to(len(self))
+        self.anchor = 0
+
+    def selected_text(self):
+        span = self.selection()
+        return self.text[span[0]:span[1]] if span else ""
+
+    # --- Editing ---
+    def delete_selection(self):
+        span = self.selection()
+        self.anchor = None
+        if not span:
+            return False
+        start, end = span
+        self.move_gap(end)
+        self.gap_start = start
+        self.changed()
+        return True
+
+    def insert(self, text):
+        self.delete_selection()
+        if not text:
+            return
+        self.grow_gap(len(text))
+        self.buffer[self.gap_start:self.gap_start + len(text)] = text
+        self.gap_start += len(text)
+        self.changed()
+
+    def backspace(self):
+        if self.delete_selection():
+            return
+        if self.gap_start > 0:
+            self.gap_start -= 1
+            self.changed()
+
+    def delete(self):
+        if self.delete_selection():
+            return
+        if self.gap_end < len(self.buffer):
+            self.gap_end += 1
+            self.changed()
+
+    def set_text(self, text):
+        version = self.version
+        self.__init__(text)
+        self.version = version + 1
+
+
+class TextLine:
+    """One line of text drawn as cached runs (words with their spaces).
+    After an edit only runs whose text changed are rendered again, the x
+    of each run is kept as a prefix sum, and draw() blits only the runs
+    inside the visible span. Cursor positions cost one bisect plus the
+    width of part of a single run."""
+    def __init__(self, font, color):
+        self.font = font
+        self.color = color
+        self.text = None
+        self.runs = []
+        self.starts = []  # character index where each run starts
+        self.offsets = []  # x where each run starts
+        self.width = 0
+        self.cache = {}  # run text -> (surface, width), only runs in use
+
+    def set_text(self, text):
+        """Lays out text; returns False if it did not change"""
+        if text == self.text:
+            return False
+        self.text = text
+        self.runs = RUN_PATTERN.findall(text)
+        self.starts = []
+        self.offsets = []
+        cache = {}
+        x = char = 0
+        for run in self.runs:
+            entry = cache.get(run) or self.cache.get(run)
+            if entry is None:
+                surface = self.font.render(run, True, self.color)
+                entry = (surface, surface.get_width())
+            cache[run] = entry
+            self.starts.append(char)
+            self.offsets.append(x)
+            x += entry[1]
+            char += len(run)
+        self.cache = cache
+        self.width = x
+        return True
+
+    def x_of(self, index):
+        """x of the gap before character index"""
+        if not self.runs or index <= 0:
+            return 0
+        i = bisect_right(self.starts, index) - 1
+        run = self.runs[i]
+        within = index - self.starts[i]
+        if within >= len(run):
+            return self.offsets[i] + self.cache[run][1]
+        return self.offsets[i] + self.font.size(run[:within])[0]
+
+    def draw(self, surface, x, y, left=None, right=None):
+        """Blits the runs that fall between left and right (surface x)"""
+        left = surface.get_clip().left if left is None else left
+        right = surface.get_clip().right if right is None else right
+        first = max(0, bisect_right(self.offsets, left - x) - 1)
+        for i in range(first, len(self.runs)):
+            run_x = x + self.offsets[i]
+            if run_x >= right:
+                break
+            surface.blit(self.cache[self.runs[i]][0], (run_x, y))
@@ -0,0 +1,145 @@
+import math
+import pygame
+
+
+# ------------------------
+# EASING (t from 0 to 1)
+# ------------------------
+def linear(t):
+    return t
+
+
+def ease_in_quad(t):
+    return t * t
+
+
+def ease_out_quad(t):
+    return t * (2 - t)
+
+
+def ease_in_out_quad(t):
+    return 2 * t * t if t < 0.5 else 1 - 2 * (1 - t) * (1 - t)
+
+
+def ease_out_cubic(t):
+    return 1 - (1 - t) ** 3
+
+
+def ease_in_out_sine(t):
+    return (1 - math.cos(math.pi * t)) / 2
+
+
+class Tween:
+    """A value going from start to end over duration_ms, on the clock, not
+    per frame: it is wherever the elapsed time puts it, however often it is
+    updated. With a target it writes value to target.attr; a start of None
+    is read from there when the tween begins. Values stay integers when
+    start and end are. repeat runs it forever, yoyo swaps direction each
+    time. on_done() runs when it ends, not when it is cancelled."""
+    def __init__(self, start, end, duration_ms, ease=ease_in_out_quad, delay_ms=0,
+                 repeat=False, yoyo=False, target=None, attr=None, on_done=None):
+        self.start = start
+        self.end = end
+        self.duration = max(1, duration_ms)
+        self.ease = ease
+        self.delay = delay_ms
+        self.repeat = repeat
+        self.yoyo = yoyo
+        self.target = target
+        self.attr = attr
+        self.on_done = on_done
+        self.begin_ms = None  # set by the animator
+        self.value = start
+        self.done = False
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def step(self, now):
+        """Moves to where the tween is at now. Returns True once it is over."""
+        if self.cancelled:
+            return True
+        if now < self.begin_ms:
+            return False
+        if self.start is None:
+            self.start = getattr(self.target, self.attr)
+
+        t = (now - self.begin_ms) / self.duration
+        if self.repeat:
+            cycle, t = divmod(t, 1)
+            if self.yoyo and cycle % 2:
+                t = 1 - t
+        elif t >= 1:
+            t = 1
+            self.done = True
+
+        value = self.end if t == 1 else self.start + (self.end - self.start) * self.ease(t)
+        if isinstance(self.start, int) and isinstance(self.end, int):
+            value = int(round(value))
+        self.value = value
+        if self.target is not None:
+            setattr(self.target, self.attr, value)
+        return self.done
+
+
+class Animator:
+    """Runs every tween in the process. FrameScheduler updates it at the
+    start of each frame and keeps frames at full rate only while a tween is
+    running; a loop waiting on a delayed tween sleeps until it begins."""
+    def __init__(self):
+        self.tweens = []
+
+    def add(self, tween):
+        tween.begin_ms = pygame.time.get_ticks() + tween.delay
+        self.tweens.append(tween)
+        return tween
+
+    def tween(self, start, end, duration_ms, **kwargs):
+        """A free-standing tween; read its value"""
+        return self.add(Tween(start, end, duration_ms, **kwargs))
+
+    def animate(self, target, attr, end, duration_ms, **kwargs):
+        """Tweens target.attr from where it is to end, replacing any tween of that attribute"""
+        self.cancel(target, attr)
+        return self.add(Tween(None, end, duration_ms, target=target, attr=attr, **kwargs))
+
+    def cancel(self, target, attr=None):
+        """Stops the tweens of target (only attr's if given) where they are"""
+        for tween in self.tweens:
+            if tween.target is target and (attr is None or tween.attr == attr):
+                tween.cancel()
+
+    def update(self):
+        """Advances every tween to now and runs the callbacks of those that ended"""
+        if not self.tweens:
+            return
+        now = pygame.time.get_ticks()
+        finished = [tween for tween in self.tweens if tween.step(now)]
+        if finished:
+            self.tweens = [tween for tween in self.tweens if tween not in finished]
+            for tween in finished:
+                if tween.done and tween.on_done:
+                    tween.on_done()  # may start new tweens
+
+    def is_active(self):
+        """True while a tween is moving (not just waiting out its delay)"""
+        now = pygame.time.get_ticks()
+        return any(tween.begin_ms <= now and not tween.cancelled for tween in self.tweens)
+
+    def ms_until_next(self):
+        """How long until the next delayed tween begins, or None"""
+        now = pygame.time.get_ticks()
+        waits = [tween.begin_ms - now for tween in self.tweens if tween.begin_ms > now and not tween.cancelled]
+        return min(waits) if waits else None
+
+
+_animator = None
+
+
+def get_animator():
+    """The process-wide animator"""
+    global _animator
+    if _animator is None:
+        _animator = Animator()
+    return _animator
@@ -0,0 +1,109 @@
+import pygame
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+CELL_SIZE = 8  # pixels per contrast map cell
+
+
+def get_brightness(color):
+    r, g, b = color[:3]
+    return 0.299 * r + 0.587 * g + 0.114 * b
+
+
+def choose_text_color(brightness):
+    """Label colour that stays readable over a background of this brightness"""
+    if brightness > 200:
+        return (60, 60, 60)
+    elif brightness > 150:
+        return (30, 30, 120)
+    elif brightness > 100:
+        return (255, 255, 255)
+    elif brightness > 50:
+        return (255, 220, 180)
+    else:
+        return (255, 180, 220)
+
+
+class ContrastMap:
+    """Low-resolution luminance map of a wallpaper, built once when the
+    wallpaper is loaded. Each cell holds the mean brightness of a
+    CELL_SIZE x CELL_SIZE block, so label colours can be picked for a whole
+    area without touching the wallpaper pixels again."""
+    def __init__(self, image, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.width, self.height = image.get_size()
+        self.cols = max(1, -(-self.width // cell_size))
+        self.rows = max(1, -(-self.height // cell_size))
+        self.version = 0
+        self.cells = None
+        self.analyse(image)
+
+    def analyse(self, image):
+        """(Re)builds the map, e.g. after the wallpaper changes."""
+        if numpy is not None:
+            self.cells = self._analyse_numpy(image)
+        else:
+            self.cells = self._analyse_scaled(image)
+        self.version += 1
+
+    def _analyse_numpy(self, image):
+        rgb = pygame.surfarray.pixels3d(image) if image.get_bytesize() >= 3 else pygame.surfarray.array3d(image)
+        luma = rgb[..., 0] * 0.299 + rgb[..., 1] * 0.587 + rgb[..., 2] * 0.114
+        del rgb  # releases the surface lock taken by pixels3d
+
+        # Pad to whole cells by repeating the edge, then average each block
+        pad_w = self.cols * self.cell_size - self.width
+        pad_h = self.rows * self.cell_size - self.height
+        if pad_w or pad_h:
+            luma = numpy.pad(luma, ((0, pad_w), (0, pad_h)), mode="edge")
+        blocks = luma.reshape(self.cols, self.cell_size, self.rows, self.cell_size)
+        return blocks.mean(axis=(1, 3)).tolist()  # cells[col][row]
+
+    def _analyse_scaled(self, image):
+        # Without NumPy: smoothscale averages the blocks for us in C
+        small = pygame.transform.smoothscale(image.convert(), (self.cols, self.rows))
+        return [[get_brightness(small.get_at((col, row))) for row in range(self.rows)]
+                for col in range(self.cols)]
+
+    def brightness(self, rect):
+        """Mean brightness of the cells under rect (clamped to the map)."""
+        rect = pygame.Rect(rect)
+        c0 = min(self.cols - 1, max(0, rect.left // self.cell_size))
+        c1 = min(self.cols - 1, max(0, (rect.right - 1) // self.cell_size))
+        r0 = min(self.rows - 1, max(0, rect.top // self.cell_size))
+        r1 = min(self.rows - 1, max(0, (rect.bottom - 1) // self.cell_size))
+        total = 0
+        for col in range(c0, c1 + 1):
+            column = self.cells[col]
+            for row in range(r0, r1 + 1):
+                total += column[row]
+        return total / ((c1 - c0 + 1) * (r1 - r0 + 1))
+
+    def text_color(self, rect):
+        return choose_text_color(self.brightness(rect))
+
+
+class LabelCache:
+    """Renders an icon label once in the colour picked from the contrast map.
+    Rebuilt only when the text, its position or the wallpaper changes."""
+    def __init__(self, font, contrast_map):
+        self.font = font
+        self.contrast_map = contrast_map
+        self.key = None
+        self.surface = None
+        self.rect = None
+
+    def get(self, text, center):
+        key = (text, center, self.contrast_map.version)
+        if key != self.key:
+            size = self.font.size(text)
+            rect = pygame.Rect((0, 0), size)
+            rect.center = center
+            color = self.contrast_map.text_color(rect)
+            self.surface = self.font.render(text, True, color).convert_alpha()
+            self.rect = self.surface.get_rect(center=center)
+            self.key = key
+        return self.surface, self.rect
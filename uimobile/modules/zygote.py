@@ -0,0 +1,209 @@
+import os
+import sys
+import json
+import time
+import socket
+import signal
+import struct
+import runpy
+import subprocess
+import importlib
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOCKET_PATH = os.path.join(ROOT_DIR, "config", "zygote.sock")
+REQUEST_TIMEOUT = 1.0  # seconds a client gets to send its request line
+MAX_REQUEST = 64 * 1024
+
+# Imported once in the zygote and inherited by every forked app. Nothing here
+# may open the display or audio device: those must be created after the fork.
+PRELOAD = [
+    "pygame",
+    "modules.top_bar",
+    "modules.keyboard",
+    "modules.notification_manager",
+    "modules.launch_log",
+    "modules.fonts",
+    "sympy",
+    "requests",
+]
+
+
+# ------------------------
+# CLIENT
+# ------------------------
+def is_supported():
+    return hasattr(os, "fork") and hasattr(socket, "AF_UNIX")
+
+
+def spawn(script_path, app_name=None, tap_time=None, env=None):
+    """Asks the zygote to fork and run script_path, with env added to the
+    child's environment. Returns the child pid, or None when no zygote is
+    listening (callers then fall back to Popen)."""
+    if not is_supported() or not os.path.exists(SOCKET_PATH):
+        return None
+    request = {
+        "script": os.path.abspath(script_path),
+        "name": app_name or os.path.basename(script_path),
+        "tap_time": tap_time or time.time(),
+        "env": env or {},
+    }
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(2)
+            s.connect(SOCKET_PATH)
+            s.sendall((json.dumps(request) + "\n").encode("utf-8"))
+            reply = s.makefile("r", encoding="utf-8").readline()
+        return json.loads(reply).get("pid")
+    except (OSError, ValueError) as e:
+        print(f"[Zygote] Spawn failed, falling back: {e}")
+        return None
+
+
+_launched = False
+
+def ensure_running():
+    """Starts the zygote in the background if nothing is listening yet."""
+    global _launched
+    if not is_supported() or _launched:
+        return
+    if os.path.exists(SOCKET_PATH):
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+                s.connect(SOCKET_PATH)
+            return
+        except OSError:
+            pass
+    _launched = True  # it takes a moment to listen; don't start a second one
+    print("[Zygote] Starting app zygote...")
+    subprocess.Popen([sys.executable, os.path.abspath(__file__)], cwd=ROOT_DIR, start_new_session=True)
+
+
+# ------------------------
+# SERVER
+# ------------------------
+def preload():
+    # Run as a script, sys.path[0] is modules/ itself; apps expect the OS root
+    sys.path[0] = ROOT_DIR
+    start = time.time()
+    for name in PRELOAD:
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            print(f"[Zygote] Skipping preload of {name}: {e}")
+    import pygame
+    pygame.font.init()
+    # Font files resolved here are known to every app without a lookup
+    from modules import fonts
+    fonts.warm()
+    print(f"[Zygote] Preloaded {len(PRELOAD)} modules in {time.time() - start:.2f}s")
+
+
+def peer_uid(conn):
+    """uid of the process at the other end, or None where the OS can't tell"""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    return struct.unpack("3i", creds)[1]
+
+
+def check_request(request):
+    """Returns why a spawn request is refused, or None if it may run"""
+    from modules.orchestrator import OWNER_ENV
+    script = request.get("script")
+    if not isinstance(script, str) or not script.endswith(".py"):
+        return "not a Python script"
+    root = os.path.realpath(ROOT_DIR)
+    script = os.path.realpath(script)
+    if os.path.commonpath([root, script]) != root or not os.path.isfile(script):
+        return f"{script} is not a script of this OS"
+    env = request.get("env", {})
+    if not isinstance(env, dict) or any(key not in (OWNER_ENV,) or not isinstance(value, str) for key, value in env.items()):
+        return "environment not allowed"
+    return None
+
+
+def run_child(request):
+    """Runs inside the forked child: becomes the app process."""
+    from modules.launch_log import watch_first_frame
+
+    script_path = request["script"]
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    os.setsid()
+    os.chdir(ROOT_DIR)
+    os.environ.update(request.get("env", {}))
+    sys.path.insert(0, os.path.dirname(script_path))
+    sys.argv = [script_path]
+    watch_first_frame(request["name"], "zygote", request["tap_time"])
+
+    code = 0
+    try:
+        runpy.run_path(script_path, run_name="__main__")
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else 0
+    except Exception as e:
+        print(f"[Zygote] {request['name']} crashed: {e}")
+        code = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    os._exit(code)
+
+
+def reply(conn, message):
+    try:
+        conn.sendall((json.dumps(message) + "\n").encode("utf-8"))
+    except OSError:
+        pass  # the client gave up waiting; nothing to tell it
+
+
+def serve():
+    preload()
+    os.makedirs(os.path.dirname(SOCKET_PATH), exist_ok=True)
+    if os.path.exists(SOCKET_PATH):
+        os.remove(SOCKET_PATH)
+
+    # Children are never waited on; let the kernel reap them
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+
+    # Only this user may ask us to run code: the socket is 0600 from the start
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    umask = os.umask(0o177)
+    try:
+        server.bind(SOCKET_PATH)
+    finally:
+        os.umask(umask)
+    os.chmod(SOCKET_PATH, 0o600)
+    server.listen(4)
+    print(f"[Zygote] Listening on {SOCKET_PATH}")
+
+    while True:
+        conn, _ = server.accept()
+        with conn:
+            uid = peer_uid(conn)
+            if uid is not None and uid != os.getuid():
+                print(f"[Zygote] Refused a connection from uid {uid}")
+                continue
+            # A client that never finishes its line must not hold up later launches
+            conn.settimeout(REQUEST_TIMEOUT)
+            try:
+                request = json.loads(conn.makefile("r", encoding="utf-8").readline(MAX_REQUEST))
+            except (OSError, ValueError) as e:
+                print(f"[Zygote] Dropped a request: {e or type(e).__name__}")
+                continue
+            refused = check_request(request) if isinstance(request, dict) else "malformed request"
+            if refused:
+                print(f"[Zygote] Refused to spawn: {refused}")
+                reply(conn, {"pid": None, "error": refused})
+                continue
+            request["script"] = os.path.realpath(request["script"])
+            pid = os.fork()
+            if pid == 0:
+                conn.close()
+                server.close()
+                run_child(request)
+            print(f"[Zygote] Forked {request.get('name')} as pid {pid}")
+            reply(conn, {"pid": pid})
+
+
+if __name__ == "__main__":
+    serve()
@@ -1,31 +1,35 @@
 # setup.py
 import os
 import sys
-import json
 import pygame
 import subprocess
-from modules import pass_keyboard
+from modules.keyboard_overlay import KeyboardOverlay, TEXT_DONE_EVENT
+from modules.frame_scheduler import FrameScheduler
 from modules.encryption import encrypt_string
+from modules import orchestrator
+from modules import app_host
+from modules import config_service
+from modules import fonts
 
 # --- Constants ---
 AUTOLOGIN_FLAG = "no_password_created_by_user_autologin"
-CONFIG_FILE = os.path.join("config", "config.json")
 CONFIG_PATH = os.path.join("config", "user.enc")
-default_resolution = (480, 320)
+
+def restart_boot():
+    """Boot again with the new user: in place under the boot owner process,
+    otherwise as a fresh main.py"""
+    if orchestrator.is_managed():
+        orchestrator.request_reboot()
+    else:
+        subprocess.Popen(["python3", "main.py"], env=app_host.subprocess_env())
 
 # --- Load resolution ---
-try:
-    with open(CONFIG_FILE, 'r') as f:
-        config_data = json.load(f)
-        resolution = tuple(config_data.get("resolution", default_resolution))
-except Exception as e:
-    print(f"Error loading config.json: {e}")
-    resolution = default_resolution
+resolution = config_service.load_config()["resolution"]
 
 # --- Skip if already configured ---
 if os.path.exists(CONFIG_PATH):
     print("OOBE skipped: password already set.")
-    subprocess.Popen(["python3", "main.py"])
+    restart_boot()
     sys.exit(0)
 
 # --- Initialize Pygame ---
@@ -35,9 +39,9 @@ pygame.display.set_caption("Device Setup")
 SCREEN_WIDTH, SCREEN_HEIGHT = resolution
 
 # --- Fonts ---
-font_title = pygame.font.SysFont("Arial", int(SCREEN_HEIGHT * 0.09), bold=True)
-font = pygame.font.SysFont("Arial", int(SCREEN_HEIGHT * 0.07))
-font_hint = pygame.font.SysFont("Arial", int(SCREEN_HEIGHT * 0.05), italic=True)
+font_title = fonts.get_font(int(SCREEN_HEIGHT * 0.09), bold=True)
+font = fonts.get_font(int(SCREEN_HEIGHT * 0.07))
+font_hint = fonts.get_font(int(SCREEN_HEIGHT * 0.05), italic=True)
 
 # --- Colors ---
 WHITE = (255, 255, 255)
@@ -48,9 +52,9 @@ DARK_GRAY = (60, 60, 60)
 # --- Helpers ---
 def wait_for_touch():
     while True:
-        for event in pygame.event.get():
-            if event.type in (pygame.QUIT, pygame.FINGERDOWN, pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN):
-                return
+        event = pygame.event.wait()
+        if event.type in (pygame.QUIT, pygame.FINGERDOWN, pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN):
+            return
 
 def draw_boxed_text(title, lines, bottom_hint=True):
     screen.fill(WHITE)
@@ -82,11 +86,25 @@ def draw_boxed_text(title, lines, bottom_hint=True):
     pygame.display.flip()
 
 def get_password(prompt_text):
-    screen.fill(WHITE)
+    """Password entry under a prompt; "" if the keyboard is dismissed"""
     prompt = font_title.render(prompt_text, True, BLACK)
-    screen.blit(prompt, prompt.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3)))
-    pygame.display.flip()
-    return pass_keyboard.run_keyboard()
+    keyboard = KeyboardOverlay(masked=True)
+    keyboard.open()
+
+    for events in FrameScheduler().frames():
+        for event in events:
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            elif keyboard.handle_event(event):
+                continue
+            elif event.type == TEXT_DONE_EVENT:
+                return event.text if event.submitted else ""
+
+        screen.fill(WHITE)
+        screen.blit(prompt, prompt.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3)))
+        keyboard.draw(screen)
+        pygame.display.flip()
 
 def show_yes_no_choice(title, question):
     screen.fill(WHITE)
@@ -111,15 +129,15 @@ def show_yes_no_choice(title, question):
     pygame.display.flip()
 
     while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                if yes_button.collidepoint(event.pos):
-                    return True
-                elif no_button.collidepoint(event.pos):
-                    return False
+        event = pygame.event.wait()
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            sys.exit()
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            if yes_button.collidepoint(event.pos):
+                return True
+            elif no_button.collidepoint(event.pos):
+                return False
 
 # --- UI Steps ---
 def show_welcome():
@@ -165,7 +183,7 @@ if not use_password:
     with open(CONFIG_PATH, "wb") as f:
         f.write(encrypt_string(AUTOLOGIN_FLAG))
     show_success()
-    subprocess.Popen(["python3", "main.py"])
+    restart_boot()
     pygame.quit()
     sys.exit(0)
 
@@ -194,6 +212,6 @@ while True:
         f.write(encrypt_string(pwd1))
 
     show_success()
-    subprocess.Popen(["python3", "main.py"])
+    restart_boot()
     pygame.quit()
     sys.exit(0)
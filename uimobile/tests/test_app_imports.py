@@ -0,0 +1,42 @@
+import os
+import sys
+import json
+import subprocess
+import pytest
+
+from modules import app_host
+
+ROOT_DIR = app_host.ROOT_DIR
+
+with open(os.path.join(ROOT_DIR, "config", "apps.json"), "r", encoding="utf-8") as f:
+    APP_SCRIPTS = [part for app in json.load(f) for part in app["command"].split() if part.endswith(".py")]
+
+# Imports the script the way the OS launches `python3 apps/<app>/<script>.py`:
+# the app's folder first on sys.path, then the root from subprocess_env().
+# Third-party packages missing here exit 77 so the test is skipped, not failed.
+CHECK = """
+import os, runpy, sys
+script = sys.argv[1]
+sys.path[0] = os.path.dirname(script)  # what `python3 script.py` puts there
+try:
+    runpy.run_path(script, run_name="import_check")
+except ModuleNotFoundError as e:
+    if e.name and e.name.split(".")[0] not in ("modules", "kit_module"):
+        print(e)
+        sys.exit(77)
+    raise
+"""
+
+
+@pytest.mark.parametrize("script", APP_SCRIPTS)
+def test_app_imports_standalone(script, tmp_path):
+    path = os.path.join(ROOT_DIR, script)
+    env = app_host.subprocess_env()
+    env.update(SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    result = subprocess.run(
+        [sys.executable, "-c", CHECK, path],
+        cwd=tmp_path, env=env, capture_output=True, text=True, timeout=60,
+    )
+    if result.returncode == 77:
+        pytest.skip(f"missing dependency: {result.stdout.strip()}")
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,49 @@
+import pygame
+
+from modules.key_layer import KeyLayer
+
+LAYER = pygame.Rect(10, 100, 200, 60)
+
+
+def layout():
+    """Two rows of keys with gaps between them, in screen coordinates"""
+    return [
+        [(ch, pygame.Rect(12 + i * 40, 102, 36, 26)) for i, ch in enumerate("abcde")],
+        [("SPACE", pygame.Rect(30, 132, 120, 26)), ("ENTER", pygame.Rect(160, 132, 48, 26))],
+    ]
+
+
+def test_renders_each_key_once_in_layer_coordinates():
+    drawn = []
+    KeyLayer(LAYER, layout(), lambda surface, key, rect: drawn.append((key, tuple(rect))))
+    assert drawn[0] == ("a", (2, 2, 36, 26))
+    assert [key for key, _ in drawn] == list("abcde") + ["SPACE", "ENTER"]
+
+
+def test_key_at_matches_the_key_rects_everywhere():
+    rows = layout()
+    layer = KeyLayer(LAYER, rows, lambda *args: None)
+    keys = [key for row in rows for key in row]
+    for x in range(LAYER.left - 2, LAYER.right + 2):
+        for y in range(LAYER.top - 2, LAYER.bottom + 2):
+            expected = next((key for key in keys if key[1].collidepoint(x, y)), None)
+            assert layer.key_at((x, y)) == expected, (x, y)
+
+
+def test_keys_overhanging_the_layer_are_clipped():
+    rows = [[("wide", pygame.Rect(0, 100, 300, 20))]]
+    layer = KeyLayer(LAYER, rows, lambda *args: None)
+    assert layer.key_at((LAYER.left, 110))[0] == "wide"
+    assert layer.key_at((LAYER.right - 1, 110))[0] == "wide"
+    assert layer.key_at((LAYER.right, 110)) is None
+
+
+def test_draw_highlights_the_pressed_key():
+    layer = KeyLayer(LAYER, layout(), lambda surface, key, rect: surface.fill((200, 0, 0), rect), background=None)
+    screen = pygame.Surface((240, 200))
+    assert layer.draw(screen) == LAYER
+    plain = screen.get_at((20, 110))
+    pressed = layer.key_at((20, 110))
+    layer.draw(screen, pressed)
+    assert screen.get_at((20, 110)) != plain
+    assert len(layer.highlights) == 1
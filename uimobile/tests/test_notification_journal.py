@@ -0,0 +1,130 @@
+import os
+
+import pytest
+
+from modules import notification_journal
+from modules.notification_journal import NotificationJournal, JournalReader, LAUNCH_CATEGORY
+
+
+@pytest.fixture
+def journal_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(notification_journal, "LEGACY_LOG_PATH", str(tmp_path / "notifications_log.txt"))
+    return str(tmp_path / "notifications")
+
+
+def small_journal(path, max_segments=3):
+    """Segments of about three records each"""
+    return NotificationJournal(path, segment_bytes=300, max_segments=max_segments)
+
+
+def fill(journal, count, start=0):
+    for i in range(start, start + count):
+        journal.append(f"note {i:03d}")
+    journal.flush()
+
+
+def test_records_come_back_in_order_with_their_fields(journal_dir):
+    journal = NotificationJournal(journal_dir)
+    journal.append("hello", app="Kit")
+    journal.append("Launching Kit...", category=LAUNCH_CATEGORY)
+    journal.flush()
+    records = list(journal.read_all())
+    assert [(r["id"], r["text"], r["app"], r["category"]) for r in records] == [
+        (1, "hello", "Kit", "general"), (2, "Launching Kit...", "system", LAUNCH_CATEGORY)]
+    assert journal.pending() == []
+
+
+def test_full_segments_roll_and_the_oldest_are_dropped(journal_dir):
+    journal = small_journal(journal_dir)
+    fill(journal, 40)
+    segments = journal.segments()
+    assert len(segments) == 3
+    assert sorted(int(name[:-6]) for name in os.listdir(journal_dir) if name.endswith(".jsonl")) == segments
+    for segment in segments[:-1]:
+        assert os.path.getsize(journal.segment_path(segment)) <= 300
+
+    kept = [r["id"] for r in journal.read_all()]
+    assert kept == list(range(kept[0], 41))
+    assert journal.first_id() == kept[0] > 1
+
+
+def test_a_reopened_journal_carries_on(journal_dir):
+    fill(small_journal(journal_dir), 10)
+    journal = small_journal(journal_dir)
+    assert journal.append("after reboot")["id"] == 11
+    journal.flush()
+    assert list(journal.read_all())[-1]["text"] == "after reboot"
+
+
+def test_a_damaged_index_is_rebuilt_from_the_segments(journal_dir):
+    journal = small_journal(journal_dir)
+    fill(journal, 12)
+    expected = journal.index
+    with open(os.path.join(journal_dir, "index.json"), "w") as f:
+        f.write("{broken")
+    assert small_journal(journal_dir).index == expected
+
+
+def test_a_line_still_being_written_is_skipped(journal_dir):
+    journal = NotificationJournal(journal_dir)
+    fill(journal, 2)
+    with open(journal.segment_path(journal.segments()[-1]), "ab") as f:
+        f.write(b'{"id": 3, "te')
+    assert [r["id"] for r in journal.read_all()] == [1, 2]
+
+
+def test_the_legacy_log_is_imported_once(journal_dir):
+    with open(notification_journal.LEGACY_LOG_PATH, "w", encoding="utf-8") as f:
+        f.write("=== log ===\n[2024-05-01 10:00:00] old note\nLaunching Kit...\n")
+    journal = NotificationJournal(journal_dir)
+    records = list(journal.read_all())
+    assert [r["text"] for r in records] == ["old note", "Launching Kit..."]
+    assert records[1]["category"] == LAUNCH_CATEGORY
+    assert not os.path.exists(notification_journal.LEGACY_LOG_PATH)
+    assert journal.append("new")["id"] == 3
+
+
+def test_reader_returns_only_what_was_added(journal_dir):
+    journal = NotificationJournal(journal_dir)
+    reader = JournalReader(journal)
+    assert reader.read_new() == []
+    fill(journal, 3)
+    assert [r["id"] for r in reader.read_new()] == [1, 2, 3]
+    assert reader.read_new() == []
+    fill(journal, 2, start=3)
+    assert [r["id"] for r in reader.read_new()] == [4, 5]
+
+
+def test_reader_waits_for_a_line_to_be_finished(journal_dir):
+    journal = NotificationJournal(journal_dir)
+    reader = JournalReader(journal)
+    fill(journal, 1)
+    path = journal.segment_path(journal.segments()[-1])
+    with open(path, "ab") as f:
+        f.write(b'{"id": 2, "text": "ha')
+    assert [r["id"] for r in reader.read_new()] == [1]
+    with open(path, "ab") as f:
+        f.write(b'lf"}\n')
+    assert reader.read_new() == [{"id": 2, "text": "half"}]
+
+
+def test_reader_follows_the_journal_across_segments(journal_dir):
+    journal = small_journal(journal_dir, max_segments=10)
+    reader = JournalReader(journal)
+    seen = []
+    for start in range(0, 20, 4):
+        fill(journal, 4, start)
+        seen += reader.read_new()
+    assert len(journal.segments()) > 3
+    assert [r["id"] for r in seen] == list(range(1, 21))
+
+
+def test_reader_restarts_from_the_oldest_kept_segment_after_retention(journal_dir):
+    journal = small_journal(journal_dir)
+    reader = JournalReader(journal)
+    fill(journal, 2)
+    reader.read_new()
+    fill(journal, 30, start=2)  # its segment is long gone
+    ids = [r["id"] for r in reader.read_new()]
+    assert ids == [r["id"] for r in journal.read_all()]
+    assert ids[0] == journal.first_id() and ids[-1] == 32
@@ -0,0 +1,122 @@
+import time
+from contextlib import closing
+
+import pytest
+
+from modules import notification_journal, notification_store
+from modules.notification_journal import NotificationJournal
+from modules.notification_store import NotificationStore, select, groups, match_query
+
+
+def record(id, text, app="system", category="general", when=None):
+    return {"id": id, "time": 1000.0 + id if when is None else when, "text": text, "app": app, "category": category}
+
+
+RECORDS = [
+    record(1, "Kit says hello", app="Kit"),
+    record(2, "Launching Kit...", category="launch"),
+    record(3, "Battery low", category="power"),
+    record(4, "Kit finished the download", app="Kit"),
+    record(5, "Hello again, world"),
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return NotificationStore(str(tmp_path / "notifications.db"))
+
+
+@pytest.fixture
+def db(store):
+    with closing(store.connect()) as db:
+        store.insert(db, RECORDS)
+        yield db
+
+
+def ids(rows):
+    return [row["id"] for row in rows]
+
+
+def test_match_query_treats_every_word_as_a_plain_prefix():
+    assert match_query("kit hel") == '"kit"* "hel"*'
+    assert match_query('say "hi') == '"say"* """hi"*'
+    assert match_query("   ") == ""
+
+
+def test_filters_combine_and_come_newest_first(db):
+    assert ids(select(db)) == [5, 4, 3, 2, 1]
+    assert ids(select(db, app="Kit")) == [4, 1]
+    assert ids(select(db, category="power")) == [3]
+    assert ids(select(db, since=1002, until=1004)) == [3, 2]
+    assert ids(select(db, exclude=("launch", "power"))) == [5, 4, 1]
+    assert ids(select(db, limit=2)) == [5, 4]
+
+
+def test_search_matches_word_prefixes(db):
+    assert ids(select(db, search="hel")) == [5, 1]
+    assert ids(select(db, search="kit hel")) == [1]
+    assert ids(select(db, search="KIT", app="Kit")) == [4, 1]
+    assert ids(select(db, search="  ")) == [5, 4, 3, 2, 1]
+
+
+@pytest.mark.parametrize("search", ['"', "AND", "NOT kit", "kit OR", "*", "a:b", "(x", "NEAR(kit"])
+def test_search_text_is_never_parsed_as_fts_syntax(db, search):
+    select(db, search=search)  # no sqlite3.OperationalError
+
+
+def test_unread_and_groups(db):
+    db.execute("UPDATE notifications SET read = 1 WHERE id <= 3")
+    assert ids(select(db, unread=True)) == [5, 4]
+    assert ids(select(db, unread=False)) == [3, 2, 1]
+    kit = next(group for group in groups(db) if group["app"] == "Kit")
+    assert (kit["count"], kit["unread"], kit["latest"]) == (2, 1, 1004.0)
+    assert groups(db)[0]["latest"] == 1005.0
+
+
+def test_old_rows_leave_the_table_and_the_index(store, monkeypatch):
+    monkeypatch.setattr(notification_store, "MAX_ROWS", 3)
+    with closing(store.connect()) as db:
+        store.insert(db, RECORDS)
+        assert ids(select(db)) == [5, 4, 3]
+        assert ids(select(db, search="hello")) == [5]
+
+
+def test_queries_answer_on_poll_and_failures_answer_empty(store):
+    for r in RECORDS:
+        store.add(r)
+    answers = []
+    store.query(answers.append, app="Kit")
+    store.submit("query", lambda db: 1 / 0, answers.append)
+    store.query(answers.append, search="battery")
+    deadline = time.time() + 5
+    while len(answers) < 3 and time.time() < deadline:
+        store.poll()
+        time.sleep(0.01)
+    assert [ids(rows) for rows in answers] == [[4, 1], [], [3]]
+
+
+@pytest.fixture
+def journal(tmp_path, monkeypatch):
+    monkeypatch.setattr(notification_journal, "LEGACY_LOG_PATH", str(tmp_path / "notifications_log.txt"))
+    return NotificationJournal(str(tmp_path / "journal"))
+
+
+def test_catch_up_adds_only_what_the_store_lacks(store, journal):
+    for i in range(5):
+        journal.append(f"note {i}")
+    journal.flush()
+    with closing(store.connect()) as db:
+        store.insert(db, list(journal.read_all())[:2])
+        store.catch_up(db, journal)
+        assert ids(select(db)) == [5, 4, 3, 2, 1]
+
+
+def test_catch_up_rebuilds_after_the_journal_was_reset(store, journal):
+    with closing(store.connect()) as db:
+        store.insert(db, [record(i, f"old {i}", when=10.0 + i) for i in range(1, 9)])
+        journal.append("fresh start")
+        journal.flush()
+        assert store.journal_was_reset(db, list(journal.read_all()))
+        store.catch_up(db, journal)
+        assert [row["text"] for row in select(db)] == ["fresh start"]
+        assert not store.journal_was_reset(db, list(journal.read_all()))
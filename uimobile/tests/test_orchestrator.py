@@ -0,0 +1,95 @@
+import pytest
+
+from modules import orchestrator
+from modules.orchestrator import Orchestrator
+
+
+def crashing(times, calls):
+    """A unit start() that crashes the first `times` calls"""
+    def start():
+        calls.append(1)
+        if len(calls) <= times:
+            raise RuntimeError("crash")
+        return "up"
+    return start
+
+
+def test_supervised_unit_restarts_after_crashes():
+    calls = []
+    boot = Orchestrator()
+    boot.add("launcher", crashing(Orchestrator.MAX_RESTARTS, calls), foreground=True, restart=True)
+    boot.run()
+    assert boot.units["launcher"].result == "up"
+    assert len(calls) == Orchestrator.MAX_RESTARTS + 1
+
+
+def test_supervised_unit_gives_up_after_max_restarts():
+    calls = []
+    boot = Orchestrator()
+    boot.add("launcher", crashing(Orchestrator.MAX_RESTARTS + 1, calls), foreground=True, restart=True)
+    with pytest.raises(RuntimeError):
+        boot.run()
+    assert len(calls) == Orchestrator.MAX_RESTARTS + 1
+    assert not orchestrator.is_managed()
+
+
+def test_unsupervised_unit_is_not_restarted():
+    calls = []
+    boot = Orchestrator()
+    boot.add("splash", crashing(1, calls), foreground=True)
+    with pytest.raises(RuntimeError):
+        boot.run()
+    assert len(calls) == 1
+
+
+def test_hand_offs_do_not_count_as_restarts():
+    calls, started = [], []
+
+    def start():
+        calls.append(1)
+        if len(calls) <= Orchestrator.MAX_RESTARTS + 2:
+            orchestrator.hand_off(lambda: started.append(1))
+        return "back"
+
+    boot = Orchestrator()
+    boot.add("launcher", start, foreground=True)
+    boot.run()
+    assert boot.units["launcher"].result == "back"
+    assert len(started) == Orchestrator.MAX_RESTARTS + 2
+
+
+def test_units_wait_for_their_requirements():
+    order = []
+    boot = Orchestrator()
+    boot.add("bus", lambda: order.append("bus") or "the bus")
+    boot.add("launcher", lambda: order.append(("launcher", orchestrator.get_service("bus"))),
+             requires=["bus"], foreground=True)
+    boot.run()
+    assert order == ["bus", ("launcher", "the bus")]
+
+
+def test_failed_background_unit_still_releases_dependents():
+    boot = Orchestrator()
+    boot.add("zygote", lambda: 1 / 0)
+    boot.add("launcher", lambda: "up", requires=["zygote"], foreground=True)
+    boot.run()
+    assert boot.units["zygote"].failed
+    assert boot.units["launcher"].result == "up"
+
+
+def test_graph_errors_are_found_before_anything_runs():
+    ran = []
+    boot = Orchestrator()
+    boot.add("a", lambda: ran.append("a"), requires=["b"])
+    boot.add("b", lambda: ran.append("b"), requires=["a"])
+    with pytest.raises(ValueError, match="cycle"):
+        boot.run()
+
+    boot = Orchestrator()
+    boot.add("a", lambda: ran.append("a"), requires=["missing"])
+    with pytest.raises(ValueError, match="unknown"):
+        boot.run()
+    assert ran == []
+
+    with pytest.raises(ValueError):
+        boot.add("a", lambda: None)
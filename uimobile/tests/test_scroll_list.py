@@ -0,0 +1,118 @@
+from types import SimpleNamespace
+
+import pygame
+import pytest
+
+from modules import scroll_list
+from modules.scroll_list import ScrollList, FRICTION_MS, OVERSCROLL_DRAG
+
+RECT = (0, 0, 100, 200)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """pygame ticks the test moves by hand"""
+    clock = SimpleNamespace(now=1000)
+    monkeypatch.setattr(scroll_list.pygame.time, "get_ticks", lambda: clock.now)
+    return clock
+
+
+def gesture(kind, pos=(50, 100), rel=(0, 0), velocity=(0, 0)):
+    return SimpleNamespace(kind=kind, pos=pos, rel=rel, velocity=velocity)
+
+
+def blank_row(index, width, height):
+    return pygame.Surface((width, height))
+
+
+def fling(items, velocity, clock, frame_ms):
+    """Releases a fling and runs frames of frame_ms until it settles"""
+    rows = ScrollList(RECT, 20, blank_row, count=items)
+    rows.scroll_to(rows.max_offset() / 2)
+    start = rows.offset
+    rows.handle_gesture(gesture("down"))
+    rows.handle_gesture(gesture("drag_end", velocity=(0, -velocity)))
+    rows.handle_gesture(gesture("up"))
+    for _ in range(10000):
+        if not rows.is_animating():
+            break
+        clock.now += frame_ms
+        rows.update()
+    return rows, rows.offset - start
+
+
+@pytest.mark.parametrize("row_height", [24, lambda index: 10 + index % 7 * 5])
+def test_rows_are_found_without_scanning(row_height):
+    rows = ScrollList(RECT, row_height, blank_row, count=500, spacing=3, padding=(8, 8))
+    heights = [rows.height_of(i) for i in range(500)]
+    tops, y = [], 8
+    for height in heights:
+        tops.append(y)
+        y += height + 3
+    assert [rows.top_of(i) for i in range(500)] == tops
+    assert rows.content_height() == tops[-1] + heights[-1] + 8
+
+    for offset in (0, 137.5, rows.max_offset()):
+        rows.scroll_to(offset)
+        shown = [i for i in range(500) if tops[i] < rows.offset + 200 and tops[i] + heights[i] > rows.offset]
+        assert set(shown) <= set(rows.visible_range())
+        assert len(rows.visible_range()) <= len(shown) + 2
+        for y in range(0, 200, 7):
+            content_y = y + rows.offset
+            expected = next((i for i in range(500) if tops[i] <= content_y < tops[i] + heights[i]), None)
+            assert rows.index_at((50, y)) == expected
+
+
+def test_new_rows_are_measured_once():
+    measured = []
+    rows = ScrollList(RECT, lambda index: measured.append(index) or 20, blank_row, count=100)
+    first = len(measured)
+    rows.set_count(150)
+    assert len(measured) - first == 51  # the 50 new rows, plus the last old one for its bottom
+    assert rows.top_of(149) == 149 * 20
+
+
+def test_fling_travels_velocity_times_friction(clock):
+    rows, travelled = fling(10000, 1000, clock, 16)
+    assert rows.velocity == 0
+    assert travelled == pytest.approx(1000 * FRICTION_MS / 1000, rel=0.03)
+
+
+def test_fling_is_the_same_at_any_frame_rate(clock):
+    _, at_60fps = fling(10000, 1500, clock, 16)
+    _, at_10fps = fling(10000, 1500, clock, 100)
+    assert at_10fps == pytest.approx(at_60fps, rel=0.02)
+
+
+def test_fling_into_the_end_springs_back(clock):
+    rows, _ = fling(20, 5000, clock, 16)
+    assert rows.offset == rows.max_offset()
+    assert not rows.is_animating()
+
+
+def test_drag_past_the_end_is_damped_and_limited(clock):
+    rows = ScrollList(RECT, 20, blank_row, count=50)
+    rows.handle_gesture(gesture("down"))
+    rows.handle_gesture(gesture("drag", rel=(0, 10)))  # pull down at the top
+    assert rows.offset == -10
+    rows.handle_gesture(gesture("drag", rel=(0, 10)))
+    assert rows.offset == -10 - 10 * OVERSCROLL_DRAG
+    for _ in range(100):
+        rows.handle_gesture(gesture("drag", rel=(0, 50)))
+    assert rows.offset == -200 / 3
+
+    rows.handle_gesture(gesture("up"))
+    for _ in range(100):
+        clock.now += 16
+        rows.update()
+    assert rows.offset == 0
+
+
+def test_gestures_outside_the_list_are_left_alone():
+    rows = ScrollList(RECT, 20, blank_row, count=50)
+    assert not rows.handle_gesture(gesture("down", pos=(150, 100)))
+    assert not rows.handle_gesture(gesture("drag", pos=(150, 100), rel=(0, -30)))
+    assert not rows.handle_gesture(gesture("scroll", pos=(150, 100), rel=(0, -30)))
+    assert rows.offset == 0
+    assert rows.handle_gesture(gesture("scroll", rel=(0, -30)))
+    assert rows.offset == 30
@@ -0,0 +1,148 @@
+import random
+
+import pygame
+import pytest
+
+from modules.text_buffer import TextBuffer, TextLine, GAP_SIZE
+
+
+class Model:
+    """The same edits on a plain string, to check the gap buffer against"""
+    def __init__(self, text=""):
+        self.text, self.cursor, self.anchor = text, len(text), None
+
+    def span(self):
+        if self.anchor is None or self.anchor == self.cursor:
+            return None
+        return min(self.anchor, self.cursor), max(self.anchor, self.cursor)
+
+    def cut(self):
+        span, self.anchor = self.span(), None
+        if span:
+            self.text = self.text[:span[0]] + self.text[span[1]:]
+            self.cursor = span[0]
+        return bool(span)
+
+    def move_to(self, index, select):
+        index = max(0, min(len(self.text), index))
+        if select:
+            self.anchor = self.cursor if self.anchor is None else self.anchor
+        else:
+            self.anchor = None
+        self.cursor = index
+
+    def insert(self, s):
+        self.cut()
+        self.text = self.text[:self.cursor] + s + self.text[self.cursor:]
+        self.cursor += len(s)
+
+    def backspace(self):
+        if not self.cut() and self.cursor:
+            self.text = self.text[:self.cursor - 1] + self.text[self.cursor:]
+            self.cursor -= 1
+
+    def delete(self):
+        if not self.cut():
+            self.text = self.text[:self.cursor] + self.text[self.cursor + 1:]
+
+
+def test_random_edits_match_a_plain_string():
+    rng = random.Random(7)
+    buffer, model = TextBuffer("hello"), Model("hello")
+    for _ in range(3000):
+        op = rng.random()
+        if op < 0.35:
+            s = "".join(rng.choice("ab c") for _ in range(rng.choice((1, 1, 3, GAP_SIZE + 5))))
+            buffer.insert(s)
+            model.insert(s)
+        elif op < 0.5:
+            buffer.backspace()
+            model.backspace()
+        elif op < 0.6:
+            buffer.delete()
+            model.delete()
+        else:
+            index, select = rng.randint(-3, len(model.text) + 3), rng.random() < 0.3
+            buffer.move_to(index, select)
+            model.move_to(index, select)
+        assert buffer.text == model.text
+        assert (buffer.cursor, len(buffer)) == (model.cursor, len(model.text))
+        assert buffer.selection() == model.span()
+
+
+def test_typing_replaces_the_selection():
+    buffer = TextBuffer("hello world")
+    buffer.move_to(0)
+    buffer.move(5, select=True)
+    assert buffer.selected_text() == "hello"
+    buffer.insert("bye")
+    assert (buffer.text, buffer.cursor, buffer.selection()) == ("bye world", 3, None)
+
+    buffer.select_all()
+    buffer.backspace()
+    assert (buffer.text, buffer.cursor) == ("", 0)
+
+
+def test_version_changes_only_on_edits():
+    buffer = TextBuffer("abc")
+    version = buffer.version
+    buffer.move(-1)
+    buffer.move(-1, select=True)
+    buffer.move_to(0)
+    buffer.backspace()  # nothing before the cursor
+    assert buffer.version == version
+    buffer.insert("x")
+    assert buffer.version == version + 1
+    buffer.set_text("new")
+    assert (buffer.text, buffer.cursor, buffer.version) == ("new", 3, version + 2)
+
+
+@pytest.fixture(scope="module")
+def font():
+    pygame.font.init()
+    return pygame.font.Font(None, 24)
+
+
+class Recorder:
+    """Stands in for a surface and records what draw() blits"""
+    def __init__(self, width):
+        self.clip = pygame.Rect(0, 0, width, 30)
+        self.blits = []
+
+    def get_clip(self):
+        return self.clip
+
+    def blit(self, surface, pos):
+        self.blits.append(pos[0])
+
+
+def test_cursor_x_follows_the_text_width(font):
+    line = TextLine(font, (255, 255, 255))
+    text = "the quick  brown fox " + "x" * 40
+    line.set_text(text)
+    # Runs are measured apart, so each may round or kern a pixel differently
+    for index in range(len(text) + 1):
+        assert abs(line.x_of(index) - font.size(text[:index])[0]) <= len(line.runs), index
+    assert line.x_of(-1) == 0
+    assert line.width == line.x_of(len(text))
+
+
+def test_only_changed_runs_are_rendered_again(font):
+    line = TextLine(font, (255, 255, 255))
+    line.set_text("one two three")
+    two = line.cache["two "][0]
+    assert not line.set_text("one two three")
+    line.set_text("one two threes")
+    assert line.cache["two "][0] is two
+    assert "three" not in line.cache
+
+
+def test_draw_blits_only_the_visible_runs(font):
+    line = TextLine(font, (255, 255, 255))
+    line.set_text(" ".join(f"word{i}" for i in range(100)))
+    surface = Recorder(200)
+    line.draw(surface, -1000, 0)
+    assert surface.blits
+    assert len(surface.blits) < len(line.runs) // 4
+    assert all(x < 200 for x in surface.blits)
+    assert surface.blits[0] <= 0 < surface.blits[1]
@@ -0,0 +1,62 @@
+import os
+import socket
+
+import pytest
+
+from modules import zygote
+from modules.orchestrator import OWNER_ENV
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    """An OS root with one app, and a script outside it"""
+    os_root = tmp_path / "os"
+    (os_root / "apps" / "demo").mkdir(parents=True)
+    (os_root / "apps" / "demo" / "demo.py").write_text("print('demo')")
+    (os_root / "config").mkdir()
+    (os_root / "config" / "apps.json").write_text("[]")
+    (tmp_path / "evil.py").write_text("print('evil')")
+    monkeypatch.setattr(zygote, "ROOT_DIR", str(os_root))
+    return os_root
+
+
+def request(script, env=None):
+    return {"script": str(script), "name": "demo", "tap_time": 0, "env": {} if env is None else env}
+
+
+def test_accepts_an_app_of_this_os(root):
+    app = root / "apps" / "demo" / "demo.py"
+    assert zygote.check_request(request(app)) is None
+    assert zygote.check_request(request(app, {OWNER_ENV: "123"})) is None
+
+
+def test_refuses_files_that_are_not_python_scripts(root):
+    assert zygote.check_request(request(root / "config" / "apps.json"))
+    assert zygote.check_request({"script": None})
+    assert zygote.check_request(request(root / "apps" / "demo" / "missing.py"))
+
+
+def test_refuses_scripts_outside_the_root(root):
+    assert zygote.check_request(request(root.parent / "evil.py"))
+    assert zygote.check_request(request(os.path.join(root, "apps", "..", "..", "evil.py")))
+
+
+def test_refuses_symlinks_out_of_the_root(root):
+    link = root / "apps" / "demo" / "link.py"
+    try:
+        os.symlink(root.parent / "evil.py", link)
+    except OSError:
+        pytest.skip("symlinks not available")
+    assert zygote.check_request(request(link))
+
+
+@pytest.mark.parametrize("env", [{"LD_PRELOAD": "/tmp/x.so"}, {"PYTHONPATH": "/tmp"}, {OWNER_ENV: 1}, ["x"]])
+def test_refuses_any_other_environment(root, env):
+    assert zygote.check_request(request(root / "apps" / "demo" / "demo.py", env))
+
+
+@pytest.mark.skipif(not hasattr(socket, "SO_PEERCRED"), reason="no SO_PEERCRED here")
+def test_peer_uid_is_the_connecting_user():
+    left, right = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+    with left, right:
+        assert zygote.peer_uid(left) == os.getuid()
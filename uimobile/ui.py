@@ -1,22 +1,32 @@
 import pygame
 import sys
-from datetime import datetime
 import os
-import json
-import subprocess
 import time
 
 from modules.notification_manager import NotificationManager
-from modules.notification_center import NotificationCenter  # ✅ New import
+from modules.notification_center import NotificationCenter, dim_layer  # ✅ New import
+from modules.notification_journal import LAUNCH_CATEGORY, DEFAULT_APP, flush_journal
+from modules.app_host import AppHost
+from modules import zygote
+from modules.notification_bus import NotificationBus
+from modules.compositor import Compositor
+from modules.frame_scheduler import FrameScheduler
+from modules.gestures import GestureInput, dispatch
+from modules.status_bar import StatusBar
+from modules.wallpaper import ContrastMap, LabelCache
+from modules.icon_cache import IconCache, find_icon
+from modules.assets import get_loader
+from modules import orchestrator
+from modules import config_service
+from modules import fonts
 
 pygame.init()
 
 # --- Load configuration --- 
-with open("config/config.json") as f:
-    config = json.load(f)
+config = config_service.load_config()
 
 # Load resolution
-SCREEN_WIDTH, SCREEN_HEIGHT = config.get("resolution", [480, 320])
+SCREEN_WIDTH, SCREEN_HEIGHT = config["resolution"]
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Mobile Phone UI")
 
@@ -31,14 +41,14 @@ ICONS_PER_PAGE = config["icons_per_page"]
 COLUMNS = config["columns"]
 
 # Fonts
-font_small = pygame.font.SysFont("Arial", max(12, SCREEN_HEIGHT // 25))
-font_medium = pygame.font.SysFont("Arial", max(16, SCREEN_HEIGHT // 20))
+font_small = fonts.get_font(max(12, SCREEN_HEIGHT // 25))
+font_medium = fonts.get_font(max(16, SCREEN_HEIGHT // 20))
 
-# Background
-background_img = pygame.image.load(BACKGROUND_PATH)
-background_img = pygame.transform.scale(background_img, (SCREEN_WIDTH, SCREEN_HEIGHT))
+# Background: decoded off the UI thread, plain grey until it arrives
+assets = get_loader()
+background = assets.image(BACKGROUND_PATH, (SCREEN_WIDTH, SCREEN_HEIGHT), (90, 90, 90))
+contrast_map = ContrastMap(background.surface)  # label colours, analysed per wallpaper
 
-clock = pygame.time.Clock()
 MARGIN_TOP = SCREEN_HEIGHT // 5
 
 # Colors
@@ -59,105 +69,82 @@ next_apps = []
 # ✅ Managers
 notification_manager = NotificationManager(SCREEN_WIDTH, SCREEN_HEIGHT, font_small)
 notification_center = NotificationCenter(screen, notification_manager.notifications)
+app_host = AppHost(screen)
+icon_cache = IconCache()
+# Under the boot orchestrator the bus is already up (and outlives the shell)
+notification_bus = orchestrator.get_service("notification_bus")
+owns_bus = notification_bus is None
+if owns_bus:
+    notification_bus = NotificationBus()
+    notification_bus.start()
+zygote.ensure_running()  # warm process for apps that can't run in-process
 
 
 # --- Utils ---
-def get_brightness(color):
-    r, g, b = color
-    return 0.299 * r + 0.587 * g + 0.114 * b
-
-def choose_text_color(bg_color):
-    brightness = get_brightness(bg_color)
-    if brightness > 200:
-        return (60, 60, 60)
-    elif brightness > 150:
-        return (30, 30, 120)
-    elif brightness > 100:
-        return (255, 255, 255)
-    elif brightness > 50:
-        return (255, 220, 180)
-    else:
-        return (255, 180, 220)
-
-def get_background_color_at(x, y):
-    x = max(0, min(SCREEN_WIDTH - 1, x))
-    y = max(0, min(SCREEN_HEIGHT - 1, y))
-    return background_img.get_at((x, y))[:3]
-
 def draw_dim_background(surface, alpha):
-    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-    overlay.set_alpha(alpha)
-    overlay.fill((0, 0, 0))
-    surface.blit(overlay, (0, 0))
+    surface.blit(dim_layer((SCREEN_WIDTH, SCREEN_HEIGHT), alpha), (0, 0))
 
 # --- App Icon Class ---
 class AppIcon:
-    def __init__(self, name, command, x, y):
+    def __init__(self, name, command, x, y, trusted=False):
         self.name = name
         self.command = command
+        self.trusted = trusted
         self.rect = pygame.Rect(x, y, ICON_WIDTH, ICON_HEIGHT)
         self.icon_img = self.load_icon()
+        self.label = LabelCache(font_small, contrast_map)
 
     def load_icon(self):
-        try:
-            command_parts = self.command.split()
-            script_path = None
-            for part in command_parts:
-                if part.endswith(".py") and os.path.exists(part):
-                    script_path = part
-                    break
-            if script_path:
-                app_dir = os.path.dirname(script_path)
-                for ext in ["icon.jpg", "icon.png"]:
-                    icon_path = os.path.join(app_dir, ext)
-                    if os.path.exists(icon_path):
-                        icon_img = pygame.image.load(icon_path)
-                        return pygame.transform.smoothscale(icon_img, (ICON_WIDTH, ICON_HEIGHT))
-        except Exception as e:
-            print(f"Failed to load icon for {self.name}: {e}")
+        icon_path = find_icon(self.command)
+        if icon_path:
+            return icon_cache.get(icon_path, (ICON_WIDTH, ICON_HEIGHT))
         return None
 
-    def draw(self, mouse_pos):
-        self._draw_with_offset(mouse_pos, 0)
-
-    def _draw_with_offset(self, mouse_pos, x_offset):
-        rect = self.rect.move(x_offset, 0)
+    def draw(self, mouse_pos, surface=None, offset=(0, 0)):
+        surface = surface or screen
+        rect = self.rect.move(offset)
         shadow_rect = rect.move(3, 3)
-        pygame.draw.rect(screen, SHADOW, shadow_rect, border_radius=12)
+        pygame.draw.rect(surface, SHADOW, shadow_rect, border_radius=12)
 
-        hover = rect.collidepoint(mouse_pos)
-        pygame.draw.rect(screen, LIGHT_BLUE if not hover else BLUE, rect, border_radius=12)
+        hover = mouse_pos is not None and self.rect.collidepoint(mouse_pos)
+        pygame.draw.rect(surface, LIGHT_BLUE if not hover else BLUE, rect, border_radius=12)
 
         if self.icon_img:
-            screen.blit(self.icon_img, rect)
+            surface.blit(self.icon_img, rect)
         else:
-            pygame.draw.rect(screen, (180, 180, 250), rect.inflate(-10, -10), border_radius=8)
+            pygame.draw.rect(surface, (180, 180, 250), rect.inflate(-10, -10), border_radius=8)
 
-        label_x = rect.centerx
-        label_y = rect.bottom + SCREEN_HEIGHT // 40
-        bg_color = get_background_color_at(label_x, label_y)
-        text_color = choose_text_color(bg_color)
-        label = font_small.render(self.name, True, text_color)
-        label_rect = label.get_rect(center=(label_x, label_y))
-        screen.blit(label, label_rect)
+        # Colour comes from the wallpaper under the resting position, so the
+        # label keeps its colour while it slides with the page
+        label, label_rect = self.label.get(self.name, self.label_center())
+        surface.blit(label, label_rect.move(offset))
 
-    def handle_click(self, mouse_pos):
+    def label_center(self):
+        return (self.rect.centerx, self.rect.bottom + SCREEN_HEIGHT // 40)
+
+    def bounds(self):
+        """Everything draw() touches: icon, drop shadow and label"""
+        _, label_rect = self.label.get(self.name, self.label_center())
+        return self.rect.union(self.rect.move(3, 3)).union(label_rect)
+
+    def handle_click(self, mouse_pos, tap_time=None):
         if self.rect.collidepoint(mouse_pos):
             print(f"Launching: {self.command}")
             try:
-                notification_manager.push(f"Launching {self.name}...")
-                subprocess.Popen(self.command.split())
-                pygame.quit()
+                notification_manager.push(f"Launching {self.name}...", category=LAUNCH_CATEGORY)
+                app_host.launch(self.name, self.command, trusted=self.trusted, tap_time=tap_time)
             except Exception as e:
                 notification_manager.push(f"Failed to launch {self.name}")
                 print(f"Failed to launch '{self.command}': {e}")
+            return True
+        return False
 
 # --- Load apps ---
-def load_apps():
-    with open("config/apps.json") as f:
-        return json.load(f)
+page_icons = {}  # page -> [AppIcon], built on first visit
 
 def create_page_icons(app_data, page):
+    if page in page_icons:
+        return page_icons[page]
     apps = []
     start_index = page * ICONS_PER_PAGE
     page_items = app_data[start_index:start_index + ICONS_PER_PAGE]
@@ -168,17 +155,43 @@ def create_page_icons(app_data, page):
         col = i % COLUMNS
         x = start_x + col * (ICON_WIDTH + PADDING)
         y = MARGIN_TOP + row * (ICON_HEIGHT + SCREEN_HEIGHT // 20)
-        apps.append(AppIcon(app["name"], app["command"], x, y))
+        apps.append(AppIcon(app["name"], app["command"], x, y, app.get("trusted", False)))
+    page_icons[page] = apps
     return apps
 
-def draw_status_bar():
-    bar_height = SCREEN_HEIGHT // 10
-    for y in range(bar_height):
-        grey_value = 100 + int((100 * y) / bar_height)
-        pygame.draw.line(screen, (grey_value, grey_value, grey_value), (0, y), (SCREEN_WIDTH, y))
-    now = datetime.now()
-    screen.blit(font_small.render(now.strftime(TIME_FORMAT), True, BLACK), (10, 7))
-    screen.blit(font_small.render(BATTERY_DISPLAY, True, BLACK), (SCREEN_WIDTH - 70, 7))
+# --- Page surfaces ---
+page_surfaces = {}  # page -> (Surface, Rect) of its icons, without hover
+
+def on_wallpaper_ready(asset):
+    global background
+    background = asset
+    contrast_map.analyse(asset.surface)
+    page_surfaces.clear()  # labels may have changed colour
+    compositor.damage_all()
+
+def render_page(page):
+    """Draws a page's icons once into an off-screen surface covering just
+    the icon area, so a swipe animates as two blits."""
+    if page not in page_surfaces:
+        page_apps = create_page_icons(app_data, page)
+        if page_apps:
+            area = page_apps[0].bounds().unionall([app.bounds() for app in page_apps[1:]])
+        else:
+            area = pygame.Rect(0, MARGIN_TOP, SCREEN_WIDTH, 1)
+        area = pygame.Rect(0, area.top, SCREEN_WIDTH, area.height)
+        surf = pygame.Surface(area.size, pygame.SRCALPHA)
+        for app in page_apps:
+            app.draw(None, surf, (0, -area.top))
+        page_surfaces[page] = (surf, area)
+    return page_surfaces[page]
+
+def prerender_pages():
+    """Renders at most one missing page near the current one per call, so
+    a swipe in either direction can start without drawing anything."""
+    for page in (current_page, current_page + 1, current_page - 1):
+        if 0 <= page < total_pages and page not in page_surfaces:
+            render_page(page)
+            return
 
 def draw_page_dots(current_page, total_pages):
     dot_radius = max(3, SCREEN_WIDTH // 160)
@@ -191,62 +204,131 @@ def draw_page_dots(current_page, total_pages):
         pygame.draw.circle(screen, color, (start_x + i * spacing, y), dot_radius)
 
 # --- Main loop ---
-app_data = load_apps()
+app_data = config_service.load_apps()
 total_pages = max(1, (len(app_data) + ICONS_PER_PAGE - 1) // ICONS_PER_PAGE)
 current_page = 0
 apps = create_page_icons(app_data, current_page)
 
-swipe_start_x = None
-pull_start_y = None
+gesture_input = GestureInput()
 is_pulling = False
 overlay_alpha = 0
 
-running = True
-while running:
-    mouse_pos = pygame.mouse.get_pos()
-    screen.blit(background_img, (0, 0))
-    draw_status_bar()
+status_bar = StatusBar(SCREEN_WIDTH, SCREEN_HEIGHT // 10, font_small, TIME_FORMAT, BATTERY_DISPLAY, BLACK)
+
+# --- Damage tracking ---
+compositor = Compositor(screen)
+background.on_ready(on_wallpaper_ready)
+hovered_app = None
+banner_rects = []
+overlay_active = False
+
+# --- Live config ---
+# Keys the whole layout is computed from; changing them restarts the shell
+LAYOUT_KEYS = ["resolution", "icon_width", "icon_height", "icon_padding", "icons_per_page", "columns"]
+
+def restart_shell():
+    for unsubscribe in config_subscriptions:
+        unsubscribe()
+    if orchestrator.is_managed():
+        orchestrator.restart_unit()
+    if owns_bus:
+        notification_bus.stop()
+    pygame.quit()
+    flush_journal()
+    os.execv(sys.executable, [sys.executable] + sys.argv)
+
+def on_config_change(new, old):
+    global status_bar
+    if any(new[key] != old[key] for key in LAYOUT_KEYS):
+        print("🔄 Layout changed, restarting the shell")
+        restart_shell()
+    if new["background"] != old["background"]:
+        # The old wallpaper stays up until the new one has been decoded
+        assets.image(new["background"], (SCREEN_WIDTH, SCREEN_HEIGHT), (90, 90, 90)).on_ready(on_wallpaper_ready)
+    if new["time_format"] != old["time_format"] or new["battery_display"] != old["battery_display"]:
+        status_bar = StatusBar(SCREEN_WIDTH, SCREEN_HEIGHT // 10, font_small, new["time_format"], new["battery_display"], BLACK)
+        compositor.damage(status_bar.rect)
+
+def on_apps_change(new, old):
+    global app_data, total_pages, current_page, apps, animation_start_time
+    app_data = new
+    total_pages = max(1, (len(app_data) + ICONS_PER_PAGE - 1) // ICONS_PER_PAGE)
+    current_page = min(current_page, total_pages - 1)
+    animation_start_time = None
+    page_icons.clear()
+    page_surfaces.clear()
+    apps = create_page_icons(app_data, current_page)
+    compositor.damage_all()
+
+config_subscriptions = [
+    config_service.config_file.subscribe(on_config_change),
+    config_service.apps_file.subscribe(on_apps_change),
+]
+
+def resume_shell():
+    """Back from an in-process app, which may have changed the display mode:
+    take the display surface again at the shell resolution and repaint all"""
+    global screen, compositor
+    screen = pygame.display.get_surface()
+    if screen is None or screen.get_size() != (SCREEN_WIDTH, SCREEN_HEIGHT):
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    app_host.screen = screen
+    notification_center.screen = screen
+    compositor = Compositor(screen)  # fresh bounds, first frame paints everything
+
+def icon_damage_rect(app):
+    """Icon plus its drop shadow"""
+    return app.rect.union(app.rect.move(3, 3))
+
+def draw_frame(clip):
+    screen.blit(background.surface, clip, clip)
+    if clip.colliderect(status_bar.rect):
+        status_bar.draw(screen)
     draw_page_dots(current_page, total_pages)
-    current_time = pygame.time.get_ticks()
 
-    # --- Animation ---
     if animation_start_time:
-        elapsed = current_time - animation_start_time
-        progress = min(1, elapsed / ANIMATION_DURATION)
+        progress = min(1, (pygame.time.get_ticks() - animation_start_time) / ANIMATION_DURATION)
         offset = int(progress * SCREEN_WIDTH) * animation_direction
-        for app in apps:
-            app._draw_with_offset(mouse_pos, offset)
-        for app in next_apps:
-            app._draw_with_offset(mouse_pos, offset - SCREEN_WIDTH * animation_direction)
-        if progress >= 1:
-            apps = next_apps
-            animation_start_time = None
-            animation_direction = 0
+        for page, x in ((previous_page, offset), (current_page, offset - SCREEN_WIDTH * animation_direction)):
+            surf, area = render_page(page)
+            screen.blit(surf, area.move(x, 0))
     else:
         for app in apps:
             app.draw(mouse_pos)
 
-    # --- Events ---
-    events = pygame.event.get()
-    for event in events:
-        if event.type == pygame.QUIT:
-            running = False
-
-        # Handle notification events
-        notification_manager.handle_event(event)
-        if notification_manager.active_dialogue:
-            continue
-
-        # Pull-down gesture for Notification Center
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            x, y = event.pos
-            if y < 20:  # top edge
-                pull_start_y = y
-                is_pulling = True
-            swipe_start_x = x
+    if notification_center.is_open or is_pulling:
+        draw_dim_background(screen, overlay_alpha)
+    notification_center.draw()
+    notification_manager.draw(screen)
 
-        elif event.type == pygame.MOUSEBUTTONUP:
-            if is_pulling:
+def is_animating():
+    return bool(animation_start_time or notification_manager.is_modal()
+                or notification_center.is_open or is_pulling or gesture_input.is_active())
+
+scheduler = FrameScheduler()
+running = True
+# Subscriptions are dropped however the shell ends (quit, hand-off, crash)
+try:
+    for events in scheduler.frames(lambda: running, is_animating):
+        mouse_pos = pygame.mouse.get_pos()
+
+        # --- Events ---
+        for event in events:
+            if event.type == pygame.QUIT:
+                running = False
+
+            # Handle notification events
+            notification_manager.handle_event(event)
+
+        gestures = [] if notification_manager.active_dialogue else gesture_input.process(events)
+        for g in gestures:
+            # Pull-down gesture for Notification Center
+            if g.kind == "pull":
+                is_pulling = True
+                notification_center.offset_y = max(0, min(g.dy, SCREEN_HEIGHT))
+                overlay_alpha = max(0, min(180, g.dy))
+                continue
+            if g.kind == "pull_end":
                 if notification_center.is_open:
                     if notification_center.offset_y < SCREEN_HEIGHT * 0.7:
                         notification_center.close()
@@ -254,51 +336,85 @@ while running:
                     if notification_center.offset_y > 100:
                         notification_center.open()
                 is_pulling = False
-                pull_start_y = None
                 overlay_alpha = 0
-
-            delta = event.pos[0] - (swipe_start_x or 0)
-            if abs(delta) > 30 and animation_start_time is None and not notification_center.is_open:
-                if delta < 0 and current_page < total_pages - 1:
-                    animation_direction = -1
-                    current_page += 1
-                    animation_start_time = pygame.time.get_ticks()
-                    next_apps = create_page_icons(app_data, current_page)
-                elif delta > 0 and current_page > 0:
-                    animation_direction = 1
-                    current_page -= 1
-                    animation_start_time = pygame.time.get_ticks()
-                    next_apps = create_page_icons(app_data, current_page)
-            else:
+                continue
+            if dispatch(g, notification_center):
+                continue
+
+            if g.kind == "swipe" and g.direction in ("left", "right"):
+                if animation_start_time is None:
+                    previous_page = current_page
+                    if g.direction == "left" and current_page < total_pages - 1:
+                        animation_direction = -1
+                        current_page += 1
+                        animation_start_time = pygame.time.get_ticks()
+                        next_apps = create_page_icons(app_data, current_page)
+                    elif g.direction == "right" and current_page > 0:
+                        animation_direction = 1
+                        current_page -= 1
+                        animation_start_time = pygame.time.get_ticks()
+                        next_apps = create_page_icons(app_data, current_page)
+                    if animation_start_time:
+                        compositor.damage_all()  # page dots
+
+            elif g.kind == "tap":
+                tap_time = time.time()
                 for app in apps:
-                    app.handle_click(event.pos)
-
-        elif event.type == pygame.MOUSEMOTION and is_pulling:
-            _, y = event.pos
-            drag_distance = y - (pull_start_y or 0)
-            notification_center.offset_y = max(0, min(drag_distance, SCREEN_HEIGHT))
-            overlay_alpha = min(180, drag_distance)
-
-    # --- Notify.txt integration ---
-    if os.path.exists("config/notify.txt"):
-        with open("config/notify.txt") as f:
-            message = f.read().strip()
-        if message:
-            notification_manager.push(message)
-        open("config/notify.txt", "w").close()
-
-    # --- Update notifications and center ---
-    notification_manager.update()
-    notification_center.update(events)
-
-    # --- Draw overlay and notification center ---
-    if notification_center.is_open or is_pulling:
-        draw_dim_background(screen, overlay_alpha)
-    notification_center.draw()
-    notification_manager.draw(screen)
-
-    pygame.display.flip()
-    clock.tick(60)
-
+                    if app.handle_click(g.pos, tap_time):
+                        resume_shell()
+
+        assets.poll()
+        config_service.poll()
+
+        # --- Notification bus ---
+        for text, app in notification_bus.drain():
+            notification_manager.push(text, app=app or DEFAULT_APP)
+
+        # --- Update notifications and center ---
+        notification_manager.update()
+        notification_center.update(events)
+
+        # --- Damage ---
+        if animation_start_time:
+            if pygame.time.get_ticks() - animation_start_time >= ANIMATION_DURATION:
+                apps = next_apps
+                animation_start_time = None
+                animation_direction = 0
+                compositor.damage_all()  # back to live icons with hover
+            else:
+                compositor.damage(render_page(previous_page)[1].union(render_page(current_page)[1]))
+        else:
+            prerender_pages()
+            hovered = next((app for app in apps if app.rect.collidepoint(mouse_pos)), None)
+            if hovered is not hovered_app:
+                for app in (hovered_app, hovered):
+                    if app in apps:
+                        compositor.damage(icon_damage_rect(app))
+                hovered_app = hovered
+
+        if status_bar.update():
+            compositor.damage(status_bar.rect)
+
+        # Full-screen overlays repaint everything while shown and once after
+        overlays = notification_center.is_open or is_pulling or notification_manager.is_modal()
+        if overlays or overlay_active:
+            compositor.damage_all()
+        overlay_active = overlays
+
+        # Banners: clear where they were, paint where they are now
+        for rect in banner_rects:
+            compositor.damage(rect)
+        banner_rects = notification_manager.banner_rects()
+        for rect in banner_rects:
+            compositor.damage(rect)
+
+        compositor.render(draw_frame)
+        gesture_input.presented()
+finally:
+    for unsubscribe in config_subscriptions:
+        unsubscribe()
+
+if owns_bus:
+    notification_bus.stop()
 pygame.quit()
 sys.exit()